@@ -1,29 +1,31 @@
 import os
-import time
 from pathlib import Path
+from typing import Optional
 
 import typer
-from huggingface_hub import HfApi, create_repo
 
 from src.ds_preprocessing.cleaning_fn import cleaning_registry
 from src.models.config import Config
 from src.utils import (
-    add_to_main_dataset,
-    append_to_hf_file,
-    auth_check,
+    DEFAULT_MIRROR_PATH,
+    HUB_DATA_DIR,
+    MAX_FILES_PER_COMMIT,
+    collect_hf_sources,
     create_dataset_metadata,
     create_dataset_name,
     create_repo_name,
     dataset_results_path,
-    find_files_with_suffix,
-    generate_dataset_card_from_urls,
     load_configs,
-    populate_template,
+    mirror_source,
+    remove_hub_parquet,
+    save_dataset,
     save_json,
-    upload_dataset,
-    upload_hf_file,
+    write_hub_parquet,
 )
-from src.utils.logging import get_logger
+from src.utils.logging import get_logger, log_context
+
+# Heavy dependencies (datasets, huggingface_hub, langchain, openai...) are
+# imported inside the commands that use them to keep the CLI startup fast.
 
 _logger = get_logger(__name__)
 
@@ -35,6 +37,13 @@ app = typer.Typer(pretty_exceptions_enable=False)
 def normalizer_and_save(
     config_path: Path = "configs/to_hf/test/",
     root_path: Path = Path("results"),
+    max_shard_size: str = "500MB",
+    num_proc: int = 1,
+    compression: Optional[str] = None,
+    hub_parquet: bool = True,
+    row_group_size: int = 10_000,
+    parquet_compression: str = "zstd",
+    categorical: bool = False,
 ):
     """
     Normalizes and saves a dataset based on the provided configuration.
@@ -42,43 +51,75 @@ def normalizer_and_save(
     Args:
         config_path (Path): Path to the configuration file.
         results_path (Path): Path to save the cleaned dataset.
+        max_shard_size (str): Maximum size of the shards of each split.
+        num_proc (int): Number of processes writing the shards.
+        compression (Optional[str]): Arrow codec for the shards ("zstd" or "lz4").
+        hub_parquet (bool): Also write Hub-ready Parquet shards, uploaded as they are.
+        row_group_size (int): Number of rows of each Parquet row group.
+        parquet_compression (str): Compression codec of the Parquet shards.
+        categorical (bool): Encode label and language columns as ClassLabel.
 
     This function performs the following steps:
     1. Loads the configuration from the specified path.
     2. Cleans the dataset based on the configuration.
-    3. Saves the cleaned dataset to the specified results path.
+    3. Saves the cleaned dataset to the specified results path, and its
+    Hub-ready Parquet shards under `data/`.
     """
 
     for file in config_path.iterdir():
-        # load config
-        _logger.info(f"Loading config from {file}")
-        config: Config = load_configs(file)
+        with log_context(config=file.stem, stage="normalize"):
+            # load config
+            _logger.info(f"Loading config from {file}")
+            config: Config = load_configs(file)
 
-        try:
-            # normalize dataset
-            _logger.info("Cleaning dataset")
-            normalize_custom_fn = cleaning_registry[
-                config.normalizer.normalizer_fn
-            ]
-            normalized_ds = normalize_custom_fn(config.model_dump())
-        except KeyError as e:
-            _logger.error(f"Cleaning function not found in registry: {e}")
-            raise
-        for ds in normalized_ds:
-            # Save cleaned huggingface dataset in the results_path
-            results_path = dataset_results_path(
-                root_path,
-                task_config=config.task,
-                dataset=ds,
-            )
-            _logger.info(f"Saving normalized dataset to {results_path}")
-            ds.save_to_disk(results_path)
+            try:
+                # normalize dataset
+                _logger.info("Cleaning dataset")
+                normalize_custom_fn = cleaning_registry[
+                    config.normalizer.normalizer_fn
+                ]
+                normalized_ds = normalize_custom_fn(config.model_dump())
+            except KeyError as e:
+                _logger.error(f"Cleaning function not found in registry: {e}")
+                raise
+            for ds in normalized_ds:
+                if categorical:
+                    from src.utils import encode_categorical_columns
+
+                    ds = encode_categorical_columns(ds, config.mapping)
+
+                # Save cleaned huggingface dataset in the results_path
+                results_path = dataset_results_path(
+                    root_path,
+                    task_config=config.task,
+                    dataset=ds,
+                )
+                _logger.info(f"Saving normalized dataset to {results_path}")
+                save_dataset(
+                    ds,
+                    results_path,
+                    max_shard_size=max_shard_size,
+                    num_proc=num_proc,
+                    compression=compression,
+                )
+                if hub_parquet:
+                    write_hub_parquet(
+                        ds,
+                        results_path,
+                        max_shard_size=max_shard_size,
+                        row_group_size=row_group_size,
+                        compression=parquet_compression,
+                        num_proc=num_proc,
+                    )
+                else:
+                    # shards of a previous run no longer match the dataset
+                    remove_hub_parquet(results_path)
 
-            # Save task metadata in results_path
-            metadata = create_dataset_metadata(config, ds)
-            save_json(results_path / "task_metadata.json", metadata)
+                # Save task metadata in results_path
+                metadata = create_dataset_metadata(config, ds)
+                save_json(results_path / "task_metadata.json", metadata)
 
-            _logger.info("Dataset saved successfully")
+                _logger.info("Dataset saved successfully")
 
 
 @app.command()
@@ -87,6 +128,8 @@ def upload_ds_to_huggingface(
     main_hf_dataset: str = "iberbench/iberbench_all",
     root_path: Path = Path("results"),
     add_to_main_ds: bool = True,
+    batch_aggregation: bool = True,
+    max_files_per_commit: int = MAX_FILES_PER_COMMIT,
 ):
     """
     Upload datasets to Hugging Face Hub.
@@ -96,7 +139,23 @@ def upload_ds_to_huggingface(
         main_hf_dataset (str): Main Hugging Face dataset repository name.
         dataset_path (Path): Path to the dataset results directory.
         add_to_main_ds (bool): Flag to add the dataset to the main dataset repository.
+        batch_aggregation (bool): Add all the datasets to the main dataset
+            at the end, in as few commits as possible, instead of one commit
+            per dataset.
+        max_files_per_commit (int): Maximum number of Parquet shards per
+            commit to the main dataset when batching.
     """
+    from src.utils import (
+        add_many_to_main_dataset,
+        add_to_main_dataset,
+        auth_check,
+        create_dataset_repo,
+        find_files_with_suffix,
+        upload_dataset,
+        upload_hf_file,
+    )
+
+    pending_main_ds = []
     for file in config_path.iterdir():
         config: Config = load_configs(file)
         dataset_name = create_dataset_name(config.task)
@@ -109,16 +168,15 @@ def upload_ds_to_huggingface(
 
             # Create the repository for the dataset
             if not auth_check(repo_name):
-                create_repo(
-                    repo_name, repo_type="dataset", private=True, token=True
-                )
-                time.sleep(20)
+                create_dataset_repo(repo_name, private=True, wait=20)
 
             # Upload the dataset
             upload_dataset(config.model_dump(), repo_name, results_path)
 
             # Upload to the main dataset
-            if add_to_main_ds:
+            if add_to_main_ds and batch_aggregation:
+                pending_main_ds.append((repo_name, results_path))
+            elif add_to_main_ds:
                 add_to_main_dataset(repo_name, results_path, main_hf_dataset)
 
             # Upload metadata
@@ -129,36 +187,218 @@ def upload_ds_to_huggingface(
                 token=os.environ["HF_API_KEY"],
             )
 
+    if pending_main_ds:
+        add_many_to_main_dataset(
+            pending_main_ds,
+            main_hf_dataset,
+            max_files_per_commit=max_files_per_commit,
+        )
+
+
+def _publish_model_card(config: Config, source_card) -> None:
+    """
+    Fills the config-specific fields of a source card and appends the
+    result to the README.md and task_metadata.json of the config's Hub
+    repository.
+
+    Args:
+        config (Config): The configuration of the dataset.
+        source_card (DatasetCard): The card generated from its URLs.
+    """
+    from src.utils import (
+        append_to_hf_file,
+        extract_dataset_details,
+        populate_template,
+        specialize_dataset_card,
+    )
+
+    task_path = create_dataset_name(config.task)
+    repo_id = f"iberbench/{task_path}"
+
+    # Fill the fields specific to this config
+    try:
+        dataset_details = extract_dataset_details(repo_id, full_load=False)
+    except Exception as e:
+        _logger.warning(f"Could not read {repo_id} details: {e}")
+        dataset_details = None
+    combined_dataset_card = specialize_dataset_card(
+        source_card,
+        dataset_id=repo_id,
+        language=config.task.language,
+        dataset_details=dataset_details,
+    )
+    data_fields_json = combined_dataset_card.model_dump()
+    data_fields_json["task_type"] = config.task.task_type
+
+    # Create the markdown output using the template
+    markdown_output = populate_template(combined_dataset_card)
+
+    # update files in hf repo
+    files_to_update = {
+        "task_metadata.json": data_fields_json,
+        "README.md": markdown_output,
+    }
+
+    for file_name, content in files_to_update.items():
+        append_to_hf_file(
+            file_name=file_name,
+            repo_id=repo_id,
+            token=os.environ["HF_API_KEY"],
+            new_content=content,
+        )
+
 
 @app.command()
-def create_model_card(config_path: Path = Path("configs/to_hf/test/")):
+def create_model_card(
+    config_path: Path = Path("configs/to_hf/test/"),
+    mode: str = "sync",
+    batch_path: Optional[Path] = None,
+    max_concurrency: int = 8,
+    top_k: int = 8,
+    requests_per_minute: Optional[int] = None,
+    tokens_per_minute: Optional[int] = None,
+    llm_cache_mode: Optional[str] = None,
+    llm_cache_path: Optional[Path] = None,
+    telemetry_path: Optional[Path] = None,
+):
+    """
+    Generates the dataset card of each config from its URLs and appends it
+    to the README.md and task_metadata.json of its Hub repository. The
+    card generated from a set of URLs is shared by all the configs with
+    those URLs, which only fill their own id, language, splits and size.
+
+    In "batch" mode, the extraction requests of every card are written to
+    `batch_path` for the OpenAI Batch API instead, and the cards are
+    published from the results by `collect_model_cards`.
+
+    Args:
+        config_path (Path): Path to the configuration files.
+        mode (str): "sync" (chat calls) or "batch" (batch input file).
+        batch_path (Optional[Path]): Batch input file written in "batch" mode, `batch/model_cards.jsonl` if None.
+        max_concurrency (int): Chunks sent to the LLM at the same time.
+        top_k (int): Passages retrieved for each group of card fields, 0 sends every chunk to the LLM.
+        requests_per_minute (Optional[int]): LLM request rate limit, `IBERBENCH_LLM_REQUESTS_PER_MINUTE` or 500 if None.
+        tokens_per_minute (Optional[int]): LLM token rate limit, `IBERBENCH_LLM_TOKENS_PER_MINUTE` or 30000 if None.
+        llm_cache_mode (Optional[str]): "read_write", "replay" (offline, cached responses only) or "off", `IBERBENCH_LLM_CACHE_MODE` if None.
+        llm_cache_path (Optional[Path]): Directory of the LLM response cache, `IBERBENCH_LLM_CACHE_PATH` if None.
+        telemetry_path (Optional[Path]): JSON report of the LLM calls of the run and of each config, `llm_telemetry.json` in the log directory of the run if None.
+    """
+    from src.utils import (
+        DEFAULT_LLM_CACHE_MODE,
+        DEFAULT_LLM_CACHE_PATH,
+        DEFAULT_REQUESTS_PER_MINUTE,
+        DEFAULT_TOKENS_PER_MINUTE,
+        DEFAULT_BATCH_PATH,
+        LLMCache,
+        card_batch_id,
+        card_batch_requests,
+        generate_dataset_card_from_urls,
+        get_telemetry,
+        load_content_from_urls,
+        set_llm_cache,
+        source_card_key,
+        write_batch_requests,
+    )
+
+    if mode not in ("sync", "batch"):
+        raise typer.BadParameter(f"Unknown mode: {mode}", param_hint="--mode")
+
+    if mode == "batch":
+        # one set of requests per set of URLs, shared by its configs
+        batch_requests, card_ids = [], set()
+        for file in config_path.iterdir():
+            config: Config = load_configs(file)
+            card_id = card_batch_id(config.task.url)
+            if card_id in card_ids:
+                continue
+            card_ids.add(card_id)
+            _logger.info(f"Building the batch requests of {file}")
+            content = load_content_from_urls(config.task.url)
+            if not content:
+                _logger.warning(f"Failed to retrieve the URLs of {file}")
+                continue
+            batch_requests.extend(card_batch_requests(card_id, content, top_k))
+        batch_path = batch_path or DEFAULT_BATCH_PATH
+        write_batch_requests(batch_requests, batch_path)
+        _logger.info(
+            f"Wrote {len(batch_requests)} requests of {len(card_ids)} cards "
+            f"to {batch_path}"
+        )
+        return
+
+    llm_cache = LLMCache(
+        llm_cache_path or DEFAULT_LLM_CACHE_PATH,
+        mode=llm_cache_mode or DEFAULT_LLM_CACHE_MODE,
+    )
+    set_llm_cache(llm_cache)
+    telemetry = get_telemetry()
+
+    # configs with the same URLs share the LLM-generated source card
+    source_cards = {}
     for file in config_path.iterdir():
-        _logger.info(f"Processing configuration file: {file}")
-        config: Config = load_configs(file)
+        with log_context(config=file.stem, stage="model_card"):
+            _logger.info(f"Processing configuration file: {file}")
+            config: Config = load_configs(file)
 
-        # Generate dataset card from all URLs
-        combined_dataset_card = generate_dataset_card_from_urls(config.task.url)
-        data_fields_json = combined_dataset_card.model_dump()
+            # Generate the source card from all URLs, once per set of URLs
+            card_key = source_card_key(config.task.url)
+            if card_key not in source_cards:
+                # the LLM calls are accounted to the first config of the URLs
+                with telemetry.scope(file.stem):
+                    source_cards[card_key] = generate_dataset_card_from_urls(
+                        config.task.url,
+                        max_concurrency=max_concurrency,
+                        top_k=top_k,
+                        requests_per_minute=requests_per_minute
+                        or DEFAULT_REQUESTS_PER_MINUTE,
+                        tokens_per_minute=tokens_per_minute
+                        or DEFAULT_TOKENS_PER_MINUTE,
+                    )
+            else:
+                _logger.info("Reusing the source card of the same URLs")
 
-        # Create the markdown output using the template
-        markdown_output = populate_template(combined_dataset_card)
+            if source_cards[card_key] is None:
+                _logger.warning(f"Skipping {file}, its URLs were not fetched")
+                continue
+            _publish_model_card(config, source_cards[card_key])
 
-        # update files in hf repo
-        files_to_update = {
-            "task_metadata.json": data_fields_json,
-            "README.md": markdown_output,
-        }
+    _logger.info(f"LLM cache: {llm_cache.stats()}")
+    telemetry.write_report(telemetry_path)
 
-        task_path = create_dataset_name(config.task)
 
-        for file_name, content in files_to_update.items():
-            append_to_hf_file(
-                file_name=file_name,
-                repo_id=f"iberbench/{task_path}",
-                token=os.environ["HF_API_KEY"],
-                new_content=content,
-                save_path=f"results/{task_path}",
-            )
+@app.command()
+def collect_model_cards(
+    results_path: Path,
+    config_path: Path = Path("configs/to_hf/test/"),
+):
+    """
+    Publishes the dataset cards of a batch job started with
+    `create_model_card --mode batch`: merges the extractions of each source
+    card from the batch output file and appends the card of each config to
+    the README.md and task_metadata.json of its Hub repository.
+
+    Args:
+        results_path (Path): Output file of the batch job.
+        config_path (Path): Path to the configuration files of the batch.
+    """
+    from src.utils import (
+        card_batch_id,
+        dataset_card_from_batch,
+        read_batch_results,
+    )
+
+    results = read_batch_results(results_path)
+    source_cards = {}
+    for file in config_path.iterdir():
+        _logger.info(f"Processing configuration file: {file}")
+        config: Config = load_configs(file)
+        card_id = card_batch_id(config.task.url)
+        if card_id not in source_cards:
+            source_cards[card_id] = dataset_card_from_batch(card_id, results)
+        if source_cards[card_id] is None:
+            _logger.warning(f"Skipping {file}, its card has no results")
+            continue
+        _publish_model_card(config, source_cards[card_id])
 
 
 @app.command()
@@ -166,16 +406,23 @@ def upload_to_hf(path_to_upload: Path, repo_name: str):
     """
     Upload all the folders and files from `path_to_upload` to the `repo_name`
     repository in HuggingFace's hub, excluding those related with the dataset:
-    namely split folders and dataset_dict.json.
+    namely split folders, Parquet shards and dataset_dict.json.
 
     Args:
         path_to_upload (Path): Path to be uploaded to the hub.
         repo_name (str): name of the repository where to push the path content
     """
-    client = HfApi()
+    from src.utils import get_hf_api
+
+    client = get_hf_api()
     _logger.info("Starting the upload process to Hugging Face Hub.")
     for file in path_to_upload.glob("*"):
-        if file.is_dir() and file.name not in {"train", "validation", "test"}:
+        if file.is_dir() and file.name not in {
+            "train",
+            "validation",
+            "test",
+            HUB_DATA_DIR,
+        }:
             client.upload_folder(
                 folder_path=file,
                 path_in_repo=file.name,
@@ -194,5 +441,36 @@ def upload_to_hf(path_to_upload: Path, repo_name: str):
     _logger.info("Upload process completed.")
 
 
+@app.command()
+def mirror_sources(
+    config_path: Path = Path("configs"),
+    mirror_path: Path = DEFAULT_MIRROR_PATH,
+    refresh: bool = False,
+):
+    """
+    Snapshots every HuggingFace source referenced by the configs into a
+    local Parquet mirror, pinned by revision. `hf_repo_normalizer` reads
+    from the mirror when it is present, so later runs need no network.
+
+    Args:
+        config_path (Path): a config file or a directory of configs.
+        mirror_path (Path): root of the local mirror.
+        refresh (bool): snapshot again sources already mirrored.
+    """
+    sources = collect_hf_sources(config_path)
+    _logger.info(f"Mirroring {len(sources)} sources into {mirror_path}")
+    for repo_id, subset, revision in sources:
+        entry = mirror_source(
+            repo_id=repo_id,
+            subset=subset,
+            revision=revision,
+            mirror_path=mirror_path,
+            refresh=refresh,
+        )
+        _logger.info(
+            f"{repo_id} ({subset or 'default'}) mirrored at {entry['revision']}"
+        )
+
+
 if __name__ == "__main__":
     app()
@@ -23,8 +23,14 @@ def standard_classification_normalizer(configs: dict) -> DatasetDict:
     """
     _logger.info("Starting standard classification normalization process.")
     try:
-        train_file_handler = FileHandler(configs["dataset"]["train_files"])
-        test_file_handler = FileHandler(configs["dataset"]["test_files"])
+        train_file_handler = FileHandler(
+            configs["dataset"]["train_files"],
+            dtype_backend=configs["normalizer"].get("dtype_backend"),
+        )
+        test_file_handler = FileHandler(
+            configs["dataset"]["test_files"],
+            dtype_backend=configs["normalizer"].get("dtype_backend"),
+        )
 
         train_datasets = train_file_handler.process_files()
         test_datasets = test_file_handler.process_files()
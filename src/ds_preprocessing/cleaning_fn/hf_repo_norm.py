@@ -1,28 +1,60 @@
+from typing import Optional
+
+import pandas as pd
+
 from datasets import Dataset, DatasetDict, load_dataset
 from src.utils.dataset_normalizer import DatasetNormalizer
 from src.utils.logging import get_logger
+from src.utils.mirror import read_mirrored_split
 
 _logger = get_logger(__name__)
 
 
+def load_hf_split(
+    dataset_config: dict, split: str, dtype_backend: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Loads a split of the HuggingFace source of a config, reading it from
+    the local mirror when it has been mirrored (see `mirror-sources`).
+
+    Args:
+        dataset_config (dict): the `dataset` section of the config.
+        split (str): split name.
+        dtype_backend (Optional[str]): "pyarrow" for Arrow-backed columns.
+
+    Returns:
+        pd.DataFrame: the split as a DataFrame.
+    """
+    table = read_mirrored_split(
+        repo_id=dataset_config["hf_repo_id"],
+        subset=dataset_config["hf_subset"],
+        split=split,
+        revision=dataset_config.get("hf_revision", ""),
+    )
+    types_mapper = pd.ArrowDtype if dtype_backend == "pyarrow" else None
+    if table is not None:
+        return table.to_pandas(types_mapper=types_mapper)
+
+    dataset = load_dataset(
+        path=dataset_config["hf_repo_id"],
+        name=dataset_config["hf_subset"],
+        split=split,
+        revision=dataset_config.get("hf_revision") or None,
+        trust_remote_code=True,
+    )
+    if types_mapper is not None:
+        return dataset.with_format("arrow")[:].to_pandas(
+            types_mapper=types_mapper
+        )
+    return dataset.to_pandas()
+
+
 def hf_repo_normalizer(configs: dict):
     _logger.info("Starting hf repo normalization process.")
     try:
-        train_dataset = load_dataset(
-            path=configs["dataset"]["hf_repo_id"],
-            name=configs["dataset"]["hf_subset"],
-            split="train",
-            trust_remote_code=True,
-        )
-        train_df = train_dataset.to_pandas()
-
-        test_dataset = load_dataset(
-            path=configs["dataset"]["hf_repo_id"],
-            name=configs["dataset"]["hf_subset"],
-            split="test",
-            trust_remote_code=True,
-        )
-        test_df = test_dataset.to_pandas()
+        dtype_backend = configs["normalizer"].get("dtype_backend")
+        train_df = load_hf_split(configs["dataset"], "train", dtype_backend)
+        test_df = load_hf_split(configs["dataset"], "test", dtype_backend)
 
         normalizer = DatasetNormalizer(configs)
 
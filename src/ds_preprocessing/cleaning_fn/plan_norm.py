@@ -0,0 +1,35 @@
+from typing import List
+
+from datasets import DatasetDict
+from src.ds_preprocessing.plan import compile_plan
+from src.utils.logging import get_logger
+
+_logger = get_logger(__name__)
+
+
+def plan_normalizer(configs: dict) -> List[DatasetDict]:
+    """
+    Normalize a dataset by executing the declarative `plan` of the
+    normalizer config (read, group, merge, tag_variant, clean, map, filter,
+    split_by), compiled once into an optimized execution plan.
+
+    Args:
+        configs (dict): Dictionary containing dataset and normalization configurations.
+
+    Returns:
+        List[DatasetDict]: the normalized datasets, one per value of the
+            `split_by` column if the plan splits the dataset.
+
+    Raises:
+        Exception: If any error occurs during normalization.
+    """
+    _logger.info("Starting plan normalization process.")
+    try:
+        plan = compile_plan(configs)
+        dataset_dicts = plan.run()
+        _logger.info("Plan normalization process completed successfully.")
+        return dataset_dicts
+
+    except Exception as e:
+        _logger.error(f"Error in plan_normalizer: {e}")
+        raise
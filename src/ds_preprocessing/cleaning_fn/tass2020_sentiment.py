@@ -28,8 +28,14 @@ def normalize_tass2020_sentiment(configs: dict) -> DatasetDict:
     _logger.info("Starting TASS 2020 sentiment normalization process.")
     try:
         # Use the filehandler to process the input files
-        train_file_handler = FileHandler(configs["dataset"]["train_files"])
-        test_file_handler = FileHandler(configs["dataset"]["test_files"])
+        train_file_handler = FileHandler(
+            configs["dataset"]["train_files"],
+            dtype_backend=configs["normalizer"].get("dtype_backend"),
+        )
+        test_file_handler = FileHandler(
+            configs["dataset"]["test_files"],
+            dtype_backend=configs["normalizer"].get("dtype_backend"),
+        )
 
         train_datasets = train_file_handler.process_files()
         test_datasets = test_file_handler.process_files()
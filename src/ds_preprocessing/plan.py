@@ -0,0 +1,345 @@
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from datasets import Dataset, DatasetDict
+from src.utils.dataset_normalizer import ARROW_STRING, DatasetNormalizer
+from src.utils.filehandler import FileHandler
+from src.utils.logging import get_logger
+from src.utils.utils import get_file_suffix, group_datasets, merge_datasets
+
+_logger = get_logger(__name__)
+
+SPLITS = ("train", "test")
+
+# Steps must be declared in this order, each one at most once per split
+PLAN_OPS = (
+    "read",
+    "group",
+    "merge",
+    "tag_variant",
+    "clean",
+    "map",
+    "filter",
+    "split_by",
+)
+
+# A source frame tagged with the language variation suffix of the file (or
+# group of files) it comes from
+TaggedFrame = Tuple[str, pd.DataFrame]
+
+
+class SplitPlan:
+    """
+    Optimized execution plan of a single split, compiled from the
+    declarative steps of the config.
+
+    The row-wise steps (tag_variant, clean, map) are fused into a single
+    in-place pass over each source frame, and filtering and the projection
+    to `keep_columns` are fused into a single selection per source frame.
+    Hence, no intermediate concatenations are built: the only new frame is
+    the final concatenation of the already filtered and projected frames.
+
+    Attributes:
+        split (str): name of the split.
+        files (str): directory with the files of the split.
+        steps (List[str]): names of the compiled steps, for logging.
+        columns (List[str]): columns of the projection, `keep_columns` plus
+            the column the dataset is split by.
+    """
+
+    def __init__(
+        self,
+        split: str,
+        configs: dict,
+        normalizer: DatasetNormalizer,
+        steps: List[dict],
+        split_by: Optional[str] = None,
+    ):
+        """
+        Compiles the steps of a split.
+
+        Args:
+            split (str): name of the split.
+            configs (dict): dictionary containing dataset and normalization configurations.
+            normalizer (DatasetNormalizer): normalizer shared by all the splits.
+            steps (List[dict]): the plan steps that apply to this split.
+            split_by (Optional[str]): column the dataset is split by, kept
+                until the split even if it is not in `keep_columns`.
+
+        Raises:
+            ValueError: if the steps are not a valid plan.
+        """
+        self.split = split
+        self.files = configs["dataset"][f"{split}_files"]
+        self.configs = configs
+        self.normalizer = normalizer
+        self.steps = [step["op"] for step in steps]
+        _validate_ops(self.steps, split, normalizer.language_var)
+
+        args = {step["op"]: step.get("args", {}) for step in steps}
+        self.read_columns: Optional[List[str]] = args["read"].get("columns")
+        self.merge_on: Optional[str] = (
+            args["merge"].get("on", "ID") if "merge" in args else None
+        )
+        self.transforms: List[Callable[[str, pd.DataFrame], pd.DataFrame]] = []
+        for op in self.steps:
+            transform = self._compile_transform(op)
+            if transform is not None:
+                self.transforms.append(transform)
+        self.filter: Optional[dict] = args.get("filter")
+        self.columns = list(normalizer.keep_columns)
+        if split_by is not None and split_by not in self.columns:
+            self.columns.append(split_by)
+
+    def _compile_transform(
+        self, op: str
+    ) -> Optional[Callable[[str, pd.DataFrame], pd.DataFrame]]:
+        if op == "tag_variant":
+            if self.normalizer.dtype_backend == "pyarrow":
+                return _tag_arrow_variant
+            if self.normalizer.dtype_backend is None:
+                return _tag_variant
+
+            def tag_backend_variant(tag: str, df: pd.DataFrame):
+                df = _tag_variant(tag, df)
+                df["language_variation"] = self.normalizer.to_backend(
+                    df["language_variation"]
+                )
+                return df
+
+            return tag_backend_variant
+        if op == "clean":
+            return lambda _, df: self.normalizer.clean_frame(df)
+        if op == "map" and self.normalizer.mapping:
+            return lambda _, df: self.normalizer.normalize_column(df)
+        return None
+
+    def read(self) -> List[TaggedFrame]:
+        """
+        Runs the source steps: reads the files of the split and, if
+        planned, groups them by suffix and merges each group.
+
+        Returns:
+            List[TaggedFrame]: the source frames with their tags.
+        """
+        datasets = FileHandler(
+            self.files, dtype_backend=self.normalizer.dtype_backend
+        ).process_files()
+        if self.read_columns:
+            for dataset in datasets.values():
+                dataset.columns = self.read_columns
+
+        if self.merge_on is None:
+            return [
+                (get_file_suffix(file_name), dataset)
+                for file_name, dataset in datasets.items()
+            ]
+
+        grouped = group_datasets(datasets)
+        merged = merge_datasets(
+            config=self.configs, dfs=grouped, merge_col=self.merge_on
+        )
+        return list(zip(grouped.keys(), merged))
+
+    def select(self, frames: List[TaggedFrame]) -> pd.DataFrame:
+        """
+        Runs the fused filter and projection over each frame and builds the
+        final frame of the split with a single concatenation.
+
+        Args:
+            frames (List[TaggedFrame]): the transformed source frames.
+
+        Returns:
+            pd.DataFrame: the normalized split.
+        """
+        keep_columns = self.columns
+        where = {}
+        select_variation = False
+        if self.filter is not None:
+            where = self.filter.get("where", {})
+            # decided over all the frames, as if they were concatenated
+            if self.normalizer.language_var:
+                variations = set()
+                for _, df in frames:
+                    variations.update(df["language_variation"].unique())
+                select_variation = (
+                    self.normalizer.selects_language_variation(variations)
+                )
+
+        selected = []
+        for _, df in frames:
+            mask = None
+            if select_variation:
+                mask = df["language_variation"].str.contains(
+                    self.normalizer.language
+                )
+            for column, value in where.items():
+                column_mask = df[column] == value
+                mask = column_mask if mask is None else mask & column_mask
+            if mask is None:
+                selected.append(df[keep_columns])
+            else:
+                selected.append(df.loc[mask, keep_columns])
+
+        return pd.concat(selected, ignore_index=True)
+
+    def run(self) -> pd.DataFrame:
+        """
+        Executes the plan of the split.
+
+        Returns:
+            pd.DataFrame: the normalized split.
+        """
+        _logger.info(f"Running {self.split} plan: {' -> '.join(self.steps)}")
+        frames = []
+        for tag, df in self.read():
+            for transform in self.transforms:
+                df = transform(tag, df)
+            frames.append((tag, df))
+        return self.select(frames)
+
+
+class CompiledPlan:
+    """
+    Normalization plan of a config compiled into one `SplitPlan` per split,
+    plus an optional final split of the normalized dataset by the values of
+    a column (e.g. one dataset per language variation).
+
+    Attributes:
+        split_plans (Dict[str, SplitPlan]): execution plan of each split.
+        split_by (Optional[str]): column to split the dataset by.
+    """
+
+    def __init__(
+        self, split_plans: Dict[str, SplitPlan], split_by: Optional[str]
+    ):
+        self.split_plans = split_plans
+        self.split_by = split_by
+
+    def run(self) -> List[DatasetDict]:
+        """
+        Executes the plan.
+
+        Returns:
+            List[DatasetDict]: the normalized datasets.
+        """
+        frames = {
+            split: plan.run() for split, plan in self.split_plans.items()
+        }
+        if self.split_by is None:
+            return [_to_dataset_dict(frames)]
+
+        # a single groupby per split instead of a full scan per value
+        groups = {
+            split: dict(tuple(df.groupby(self.split_by, sort=True)))
+            for split, df in frames.items()
+        }
+        # the column was only kept to split the dataset by
+        normalizer = next(iter(self.split_plans.values())).normalizer
+        drop = (
+            [] if self.split_by in normalizer.keep_columns else [self.split_by]
+        )
+        values = sorted(set().union(*(group.keys() for group in groups.values())))
+        return [
+            _to_dataset_dict(
+                {
+                    split: groups[split]
+                    .get(value, df.iloc[0:0])
+                    .drop(columns=drop)
+                    for split, df in frames.items()
+                }
+            )
+            for value in values
+        ]
+
+
+def _validate_ops(ops: List[str], split: str, language_var: bool) -> None:
+    if not ops or ops[0] != "read":
+        raise ValueError(f"The {split} plan must start with a 'read' step")
+    positions = [PLAN_OPS.index(op) for op in ops]
+    if positions != sorted(set(positions)):
+        raise ValueError(
+            f"The {split} plan steps {ops} must appear at most once and in "
+            f"the order {list(PLAN_OPS)}"
+        )
+    if ("group" in ops) != ("merge" in ops):
+        raise ValueError(
+            f"The {split} plan must include both 'group' and 'merge' or none"
+        )
+    # the filter selects by the language variation column, which is added
+    # by 'tag_variant' or 'merge'
+    if language_var and "filter" in ops:
+        if "tag_variant" not in ops and "merge" not in ops:
+            raise ValueError(
+                f"The {split} plan must include 'tag_variant' or 'merge' "
+                "before 'filter' when `language_var` is set"
+            )
+
+
+def _tag_variant(tag: str, df: pd.DataFrame) -> pd.DataFrame:
+    df["language_variation"] = tag
+    return df
+
+
+def _tag_arrow_variant(tag: str, df: pd.DataFrame) -> pd.DataFrame:
+    df["language_variation"] = pd.Series(
+        tag, index=df.index, dtype=ARROW_STRING
+    )
+    return df
+
+
+def _to_dataset_dict(frames: Dict[str, pd.DataFrame]) -> DatasetDict:
+    return DatasetDict(
+        {
+            split: Dataset.from_pandas(df, preserve_index=False)
+            for split, df in frames.items()
+        }
+    )
+
+
+def compile_plan(configs: dict) -> CompiledPlan:
+    """
+    Compiles the declarative `plan` of the normalizer config into an
+    execution plan. Compile once per config and reuse it for all the
+    splits.
+
+    Args:
+        configs (dict): dictionary containing dataset and normalization configurations.
+
+    Returns:
+        CompiledPlan: the compiled plan.
+
+    Raises:
+        ValueError: if the plan is empty or invalid.
+    """
+    steps = configs["normalizer"].get("plan", [])
+    if not steps:
+        raise ValueError("The normalizer config has no plan")
+
+    split_by_steps = [step for step in steps if step["op"] == "split_by"]
+    if split_by_steps and steps[-1]["op"] != "split_by":
+        raise ValueError("'split_by' must be the last step of the plan")
+    split_by = (
+        split_by_steps[0].get("args", {}).get("column", "language_variation")
+        if split_by_steps
+        else None
+    )
+
+    normalizer = DatasetNormalizer(configs)
+    split_plans = {
+        split: SplitPlan(
+            split,
+            configs,
+            normalizer,
+            [
+                step
+                for step in steps
+                if step["op"] != "split_by"
+                and (not step.get("splits") or split in step["splits"])
+            ],
+            split_by,
+        )
+        for split in SPLITS
+    }
+    return CompiledPlan(split_plans, split_by)
@@ -1,4 +1,4 @@
-from typing import Dict, List
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel
 
@@ -17,6 +17,23 @@ class DatasetConfig(BaseModel):
     test_files: str
     hf_repo_id: str
     hf_subset: str
+    hf_revision: str = ""
+
+
+class PlanStep(BaseModel):
+    op: Literal[
+        "read",
+        "group",
+        "merge",
+        "tag_variant",
+        "clean",
+        "map",
+        "filter",
+        "split_by",
+    ]
+    args: Dict[str, Any] = {}
+    # splits the step applies to, all of them if empty
+    splits: List[str] = []
 
 
 class NormalizerConfig(BaseModel):
@@ -25,6 +42,9 @@ class NormalizerConfig(BaseModel):
     input_cols: List[str]
     output_col: str
     keep_columns: List[str]
+    plan: List[PlanStep] = []
+    # "pyarrow" keeps the columns Arrow-backed from reading to `Dataset`
+    dtype_backend: Optional[Literal["numpy_nullable", "pyarrow"]] = None
 
 
 class Config(BaseModel):
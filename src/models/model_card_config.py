@@ -1,4 +1,10 @@
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from typing import Dict, Tuple, Type
+
+from pydantic import BaseModel, Field, create_model
+
+# values of a card field that has not been filled yet
+DEFAULT_FIELD_VALUES = ("", "Dataset ID", "[More Information Needed]")
 
 
 class DatasetCard(BaseModel):
@@ -78,3 +84,106 @@ class DatasetCard(BaseModel):
         default="[More Information Needed]",
         description="Contact information for inquiries.",
     )
+
+
+# fields extracted together from the same passages, with the terms that
+# are usually found next to them
+FIELD_GROUPS: Dict[str, Tuple[str, ...]] = {
+    "overview": (
+        "dataset_id",
+        "dataset_summary",
+        "dataset_description",
+        "languages",
+    ),
+    "provenance": (
+        "creators",
+        "funded_by",
+        "shared_by",
+        "repo",
+        "dataset_card_authors",
+        "dataset_card_contact",
+    ),
+    "license": ("license",),
+    "data": ("data_fields", "data_splits", "data_size"),
+    "collection": ("data_collection_process",),
+    "uses": ("intended_uses", "out_of_scope_uses"),
+    "citation": ("paper", "citation_bibtex", "citation_apa"),
+}
+FIELD_GROUP_TERMS: Dict[str, str] = {
+    "overview": (
+        "abstract introduction we present introduce dataset corpus "
+        "benchmark task shared language spanish catalan basque galician "
+        "portuguese"
+    ),
+    "provenance": (
+        "authors university institute funded funding grant project "
+        "acknowledgments supported organizers available github huggingface "
+        "download url contact email"
+    ),
+    "license": (
+        "license licensed licence creative commons cc by sa nc nd mit "
+        "apache terms distribution"
+    ),
+    "data": (
+        "train training test validation development dev split splits "
+        "partition examples instances tweets documents size statistics "
+        "table fields columns label labels classes format"
+    ),
+    "collection": (
+        "collected collection compiled crawled sources annotation "
+        "annotators annotated guidelines agreement kappa process "
+        "methodology"
+    ),
+    "uses": (
+        "intended use uses applications evaluation limitations bias "
+        "ethical considerations risks misuse"
+    ),
+    "citation": (
+        "citation cite bibtex inproceedings article proceedings journal "
+        "arxiv doi references pages volume"
+    ),
+}
+
+
+def field_group_query(group: str, fields: Tuple[str, ...]) -> str:
+    """
+    Builds the retrieval query of some fields of a group: the terms of the
+    group, and the names and descriptions of the fields.
+
+    Args:
+        group (str): the name of the field group.
+        fields (Tuple[str, ...]): the fields to be extracted.
+
+    Returns:
+        str: the query.
+    """
+    return " ".join(
+        [FIELD_GROUP_TERMS[group]]
+        + [
+            f"{name.replace('_', ' ')} "
+            f"{DatasetCard.model_fields[name].description}"
+            for name in fields
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def dataset_card_subset(fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """
+    Builds a model with only some fields of `DatasetCard` (same name,
+    types and descriptions), to ask the LLM just for those fields.
+
+    Args:
+        fields (Tuple[str, ...]): names of the fields to keep.
+
+    Returns:
+        Type[BaseModel]: the model, named `DatasetCard` as the tool.
+    """
+    return create_model(
+        "DatasetCard",
+        **{
+            name: (DatasetCard.model_fields[name].annotation, field)
+            for name, field in DatasetCard.model_fields.items()
+            if name in fields
+        },
+    )
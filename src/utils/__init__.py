@@ -1,9 +1,212 @@
-from .dataset_normalizer import *
-from .filehandler import *
-from .gpt_generate import *
-from .hf_utils import *
-from .io import *
-from .model_card_utils import *
-from .preprocessing import *
-from .prompt_preprocess import *
-from .utils import *
+import importlib
+from typing import Any, Dict, List
+
+# Utilities are exported lazily: a module is only imported the first time
+# one of its names is accessed, so importing `src.utils` (and the CLI) does
+# not pull in heavy dependencies such as `datasets` or `langchain`.
+# Register here the public names of new utility modules.
+_EXPORTS: Dict[str, List[str]] = {
+    "batch": [
+        "BATCH_ENDPOINT",
+        "DEFAULT_BATCH_PATH",
+        "batch_request",
+        "card_batch_id",
+        "card_batch_requests",
+        "dataset_card_from_batch",
+        "read_batch_results",
+        "write_batch_requests",
+    ],
+    "categorical": [
+        "class_label_names",
+        "class_names",
+        "encode_categorical_columns",
+    ],
+    "dataset_normalizer": ["DatasetNormalizer"],
+    "extractors": [
+        "EXTRACTOR_NAME",
+        "declared_charset",
+        "extract_text",
+        "extract_unstructured_text",
+        "extractor_registry",
+        "sniff_mime_type",
+    ],
+    "filehandler": ["FileHandler"],
+    "gpt_generate": ["GPTClient", "extract_html_text"],
+    "hf_utils": [
+        "MAX_COMMIT_RETRIES",
+        "PARQUET_REVISION",
+        "RepoIndex",
+        "add_many_to_main_dataset",
+        "add_to_main_dataset",
+        "append_to_hf_file",
+        "auth_check",
+        "commit_to_main_dataset",
+        "create_dataset_repo",
+        "dataset_details_from_card",
+        "dataset_details_from_parquet",
+        "download_hf_file",
+        "extract_dataset_details",
+        "hub_parquet_files",
+        "load_dataset_card",
+        "main_dataset_operations",
+        "read_hf_file",
+        "repo_index",
+        "shard_split",
+        "update_card_configs",
+        "update_hf_file",
+        "upload_dataset",
+        "upload_hf_file",
+    ],
+    "http": [
+        "DEFAULT_POOL_SIZE",
+        "DEFAULT_TIMEOUT",
+        "configure_http",
+        "get_hf_api",
+        "get_http_session",
+        "set_hf_api",
+    ],
+    "io": [
+        "HUB_DATA_DIR",
+        "MAX_FILES_PER_COMMIT",
+        "compress_arrow_file",
+        "create_dataset_metadata",
+        "create_dataset_name",
+        "create_repo_name",
+        "dataset_results_path",
+        "get_language_variety",
+        "load_configs",
+        "read_json",
+        "remove_hub_parquet",
+        "save_dataset",
+        "save_json",
+        "write_hub_parquet",
+    ],
+    "mirror": [
+        "DEFAULT_MIRROR_PATH",
+        "MANIFEST_NAME",
+        "collect_hf_sources",
+        "load_manifest",
+        "mirror_source",
+        "read_mirrored_split",
+        "source_key",
+    ],
+    "llm_cache": [
+        "DEFAULT_LLM_CACHE_MODE",
+        "DEFAULT_LLM_CACHE_PATH",
+        "DEFAULT_LLM_CACHE_SIZE",
+        "CacheMissError",
+        "LLMCache",
+        "get_llm_cache",
+        "langchain_cache",
+        "set_llm_cache",
+    ],
+    "model_card_utils": [
+        "card_llm",
+        "extract_chunk",
+        "extract_chunks",
+        "extract_data_from_response",
+        "extract_fields_by_group",
+        "extract_missing_fields",
+        "format_splits",
+        "generate_dataset_card_from_urls",
+        "group_chunks",
+        "load_content_from_urls",
+        "merge_extractions",
+        "missing_fields",
+        "pack_passages",
+        "populate_template",
+        "process_chunk",
+        "source_card_key",
+        "specialize_dataset_card",
+        "split_content_into_chunks",
+        "update_dataset_card",
+    ],
+    "preprocessing": [
+        "clean_labels",
+        "clean_text",
+        "clean_text_batch",
+        "clean_url_text",
+        "clean_url_text_batch",
+        "config_parser",
+        "fix_encoding",
+    ],
+    "prompt_preprocess": ["PromptPreparation"],
+    "rate_limit": [
+        "DEFAULT_REQUESTS_PER_MINUTE",
+        "DEFAULT_TOKENS_PER_MINUTE",
+        "RateLimiter",
+        "TokenBucket",
+    ],
+    "registry": ["LazyRegistry"],
+    "retrieval": [
+        "BM25",
+        "DEFAULT_PASSAGE_TOKENS",
+        "DEFAULT_TOP_K",
+        "tokenize",
+    ],
+    "stats": [
+        "CATEGORICAL_COLUMNS",
+        "LENGTH_QUANTILES",
+        "arrow_table",
+        "dataset_statistics",
+        "length_statistics",
+        "split_statistics",
+        "value_distribution",
+    ],
+    "telemetry": [
+        "DEFAULT_TELEMETRY_FILE",
+        "LLMCall",
+        "MODEL_PRICES",
+        "Telemetry",
+        "get_telemetry",
+        "latency_histogram",
+        "openai_async_http_client",
+        "openai_http_client",
+        "set_telemetry",
+        "summarize_calls",
+    ],
+    "tokens": [
+        "DEFAULT_CHUNK_OVERLAP_TOKENS",
+        "DEFAULT_CHUNK_TOKENS",
+        "DEFAULT_MAX_PROMPT_TOKENS",
+        "count_tokens",
+        "get_encoder",
+        "token_length_function",
+        "truncate_to_tokens",
+    ],
+    "url_cache": [
+        "DEFAULT_URL_CACHE_PATH",
+        "FetchedURL",
+        "URLCache",
+        "get_url_cache",
+        "set_url_cache",
+    ],
+    "utils": [
+        "find_files_with_suffix",
+        "get_file_suffix",
+        "get_files_from_dir",
+        "group_datasets",
+        "load_url_content",
+        "merge_datasets",
+    ],
+}
+
+_MODULE_BY_NAME = {
+    name: module for module, names in _EXPORTS.items() for name in names
+}
+
+__all__ = sorted(_MODULE_BY_NAME)
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _MODULE_BY_NAME.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
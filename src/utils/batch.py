@@ -0,0 +1,200 @@
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from src.models.model_card_config import (
+    FIELD_GROUPS,
+    DatasetCard,
+    dataset_card_subset,
+)
+from src.utils.logging import get_logger
+from src.utils.model_card_utils import (
+    CARD_MODEL,
+    EXTRACTION_PROMPT,
+    group_chunks,
+    merge_extractions,
+    source_card_key,
+    split_content_into_chunks,
+)
+from src.utils.retrieval import DEFAULT_PASSAGE_TOKENS, DEFAULT_TOP_K
+
+_logger = get_logger(__name__)
+
+# endpoint of the OpenAI Batch API the requests are sent to
+BATCH_ENDPOINT = "/v1/chat/completions"
+DEFAULT_BATCH_PATH = Path("batch/model_cards.jsonl")
+
+# group of the requests asking for every field, without retrieval
+ALL_FIELDS_GROUP = "all"
+
+
+def card_batch_id(urls: Iterable[str]) -> str:
+    """
+    Id of the source card of a set of URLs in the batch, shared by all the
+    configs with those URLs.
+
+    Args:
+        urls (Iterable[str]): the URLs of the config.
+
+    Returns:
+        str: the id.
+    """
+    key = "\n".join(source_card_key(urls))
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def batch_request(custom_id: str, chunk_text: str, fields) -> dict:
+    """
+    Builds the batch request extracting some fields from a chunk: the same
+    chat completion the card agent sends synchronously.
+
+    Args:
+        custom_id (str): the id of the request, "<card id>/<group>/<chunk>".
+        chunk_text (str): the chunk.
+        fields (Tuple[str, ...]): the fields to be extracted.
+
+    Returns:
+        dict: the request, a line of the batch input file.
+    """
+    (message,) = EXTRACTION_PROMPT.format_messages(text=chunk_text)
+    return {
+        "custom_id": custom_id,
+        "method": "POST",
+        "url": BATCH_ENDPOINT,
+        "body": {
+            "model": CARD_MODEL,
+            "temperature": 0,
+            "messages": [{"role": "user", "content": message.content}],
+            "tools": [convert_to_openai_tool(dataset_card_subset(fields))],
+        },
+    }
+
+
+def card_batch_requests(
+    card_id: str, content: str, top_k: int = DEFAULT_TOP_K
+) -> List[dict]:
+    """
+    Builds the batch requests of a source card. With `top_k`, one request
+    per chunk of relevant passages of each field group; with 0, one
+    request per chunk of the content, asking for every field.
+
+    Args:
+        card_id (str): the id of the source card.
+        content (str): the content loaded from the URLs.
+        top_k (int): passages retrieved for each field group.
+
+    Returns:
+        List[dict]: the requests.
+    """
+    if top_k:
+        passages = split_content_into_chunks(
+            content, chunk_size=DEFAULT_PASSAGE_TOKENS
+        )
+        groups = group_chunks(DatasetCard(), passages, top_k)
+    else:
+        groups = {
+            ALL_FIELDS_GROUP: (
+                tuple(DatasetCard.model_fields),
+                split_content_into_chunks(content),
+            )
+        }
+    return [
+        batch_request(f"{card_id}/{group}/{i}", chunk_text, fields)
+        for group, (fields, chunks) in groups.items()
+        for i, chunk_text in enumerate(chunks)
+    ]
+
+
+def write_batch_requests(requests: List[dict], path: Union[str, Path]):
+    """
+    Writes the batch input file, one request per line.
+
+    Args:
+        requests (List[dict]): the requests.
+        path (Union[str, Path]): the JSONL file.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for request in requests:
+            f.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+def read_batch_results(path: Union[str, Path]) -> Dict[str, Optional[dict]]:
+    """
+    Reads the batch output file into the extraction of each request. Failed
+    requests and responses without tool calls extract nothing.
+
+    Args:
+        path (Union[str, Path]): the JSONL file.
+
+    Returns:
+        Dict[str, Optional[dict]]: the extracted fields by custom id.
+    """
+    results = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            result = json.loads(line)
+            custom_id = result["custom_id"]
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                _logger.warning(
+                    f"Batch request {custom_id} failed: {result.get('error')}"
+                )
+                results[custom_id] = None
+                continue
+            message = response["body"]["choices"][0]["message"]
+            tool_calls = message.get("tool_calls")
+            results[custom_id] = (
+                json.loads(tool_calls[0]["function"]["arguments"])
+                if tool_calls
+                else None
+            )
+    return results
+
+
+def _request_order(custom_id: str) -> tuple:
+    _, group, chunk = custom_id.split("/")
+    groups = [ALL_FIELDS_GROUP, *FIELD_GROUPS]
+    return groups.index(group), int(chunk)
+
+
+def dataset_card_from_batch(
+    card_id: str, results: Dict[str, Optional[dict]]
+) -> Optional[DatasetCard]:
+    """
+    Merges the batch extractions of a source card, in group and chunk
+    order as the synchronous agent does. A card without results, e.g. its
+    URLs could not be fetched when the batch was built, is None, so that
+    no empty card is published.
+
+    Args:
+        card_id (str): the id of the source card.
+        results (Dict[str, Optional[dict]]): the extractions by custom id.
+
+    Returns:
+        Optional[DatasetCard]: the source card, None if it has no results.
+    """
+    custom_ids = sorted(
+        (
+            custom_id
+            for custom_id in results
+            if custom_id.startswith(f"{card_id}/")
+        ),
+        key=_request_order,
+    )
+    if not custom_ids:
+        _logger.warning(f"No batch results for the source card {card_id}")
+        return None
+    dataset_card = DatasetCard()
+    merge_extractions(
+        dataset_card,
+        [results[custom_id] for custom_id in custom_ids],
+        list(DatasetCard.model_fields),
+    )
+    return dataset_card
@@ -0,0 +1,107 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+
+import pyarrow.compute as pc
+
+from datasets import ClassLabel, DatasetDict, Value
+from src.utils.preprocessing import clean_labels
+from src.utils.stats import CATEGORICAL_COLUMNS, arrow_table
+
+if TYPE_CHECKING:
+    from datasets import Features
+
+
+def _sorted_names(values: Iterable[str]) -> List[str]:
+    values = set(values)
+    # numeric labels ("0", "1", ...) are ordered by value, so that
+    # contiguous ones keep their value as class index
+    if all(value.isdigit() for value in values):
+        return sorted(values, key=int)
+    return sorted(values)
+
+
+def class_names(
+    dataset: "DatasetDict", column: str, mapping: Optional[Dict[str, str]]
+) -> List[str]:
+    """
+    Derives the class names of a categorical column: first the values of
+    its config mapping, cleaned as the normalizers clean them, then any
+    other value observed in the dataset.
+
+    Args:
+        dataset (DatasetDict): the dataset.
+        column (str): the categorical column.
+        mapping (Optional[Dict[str, str]]): the config mapping of the column.
+
+    Returns:
+        List[str]: the class names.
+    """
+    names = _sorted_names(
+        clean_labels(value) for value in (mapping or {}).values()
+    )
+    observed = set()
+    for split in dataset.values():
+        observed.update(
+            pc.unique(arrow_table(split).column(column)).to_pylist()
+        )
+    observed.discard(None)
+    return names + _sorted_names(observed - set(names))
+
+
+def encode_categorical_columns(
+    dataset: "DatasetDict",
+    mapping: Dict[str, Dict[str, str]],
+    columns: Sequence[str] = CATEGORICAL_COLUMNS,
+) -> "DatasetDict":
+    """
+    Encodes the categorical string columns of a dataset as `ClassLabel`
+    features, which store a small integer per row instead of the string.
+    The class names are derived from the config mapping and the observed
+    values, and decode back to the original strings.
+
+    Args:
+        dataset (DatasetDict): the normalized dataset.
+        mapping (Dict[str, Dict[str, str]]): the config mapping.
+        columns (Sequence[str]): the columns to encode, when present.
+
+    Returns:
+        DatasetDict: the dataset with the encoded columns.
+    """
+    encoded = {
+        column: ClassLabel(
+            names=class_names(dataset, column, mapping.get(column))
+        )
+        for column in columns
+        if all(
+            split.features.get(column) == Value("string")
+            for split in dataset.values()
+        )
+    }
+    if not encoded:
+        return dataset
+
+    splits = {}
+    for name, split in dataset.items():
+        features = split.features.copy()
+        features.update(encoded)
+        splits[name] = split.cast(features)
+    return DatasetDict(splits)
+
+
+def class_label_names(
+    features: "Features", column: str
+) -> Optional[List[str]]:
+    """
+    Returns the class names of a column encoded as `ClassLabel`, to decode
+    its values, or None if the column is not encoded.
+
+    Args:
+        features (Features): the features of a dataset split.
+        column (str): the column.
+
+    Returns:
+        Optional[List[str]]: the class names.
+    """
+    feature = features.get(column)
+    if isinstance(feature, ClassLabel):
+        return feature.names
+    return None
@@ -1,5 +1,27 @@
+import pandas as pd
+import pyarrow as pa
+
 from src.utils.preprocessing import clean_labels, fix_encoding
-from src.utils.utils import get_files_from_dir
+from src.utils.utils import get_file_suffix, get_files_from_dir
+
+ARROW_STRING = pd.ArrowDtype(pa.string())
+
+# pandas dtype backends of the normalized columns, NumPy object columns if None
+DTYPE_BACKENDS = (None, "numpy_nullable", "pyarrow")
+
+
+def to_arrow_backend(series: pd.Series) -> pd.Series:
+    """
+    Converts a column to an Arrow-backed one, inferring its Arrow type.
+    Element-wise operations (`apply`, `map`) return NumPy object columns.
+    """
+    if isinstance(series.dtype, pd.ArrowDtype):
+        return series
+    return pd.Series(
+        pd.arrays.ArrowExtensionArray(pa.array(series, from_pandas=True)),
+        index=series.index,
+        name=series.name,
+    )
 
 
 class DatasetNormalizer:
@@ -12,11 +34,23 @@ class DatasetNormalizer:
         self.output_col = config["normalizer"]["output_col"]
         self.mapping = config["mapping"]
         self.keep_columns = config["normalizer"]["keep_columns"]
+        self.dtype_backend = config["normalizer"].get("dtype_backend")
+        if self.dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(f"Unsupported dtype backend: {self.dtype_backend}")
+
+    def to_backend(self, series: pd.Series) -> pd.Series:
+        if self.dtype_backend is None:
+            return series
+        if self.dtype_backend == "pyarrow":
+            return to_arrow_backend(series)
+        if self.dtype_backend == "numpy_nullable":
+            return series.convert_dtypes(dtype_backend="numpy_nullable")
+        raise ValueError(f"Unsupported dtype backend: {self.dtype_backend}")
 
     def normalize_texts(self, df):
         for text_column in self.input_cols:
-            df[text_column.lower()] = df[text_column.lower()].apply(
-                fix_encoding
+            df[text_column.lower()] = self.to_backend(
+                df[text_column.lower()].apply(fix_encoding)
             )
         return df
 
@@ -34,22 +68,25 @@ class DatasetNormalizer:
                 df[column_name] = (
                     df[column_name].map(mapping).fillna(df[column_name])
                 )
-                df[column_name] = df[column_name].str.lower()
+                df[column_name] = self.to_backend(
+                    df[column_name].str.lower()
+                )
         return df
 
     def add_language_column(self, df):
         if "language" not in df.columns:
             df["language"] = self.language
+            df["language"] = self.to_backend(df["language"])
         return df
 
     def add_language_variation_column(self, dfs, dir_path):
         files = get_files_from_dir(dir_path)
         for file, ds in zip(files, dfs):
-            suffix = file.split("_")[-1].split(".")[0].lower()
-            ds["language_variation"] = suffix
+            ds["language_variation"] = get_file_suffix(file)
+            ds["language_variation"] = self.to_backend(ds["language_variation"])
         return dfs
 
-    def standard_cleanup(self, df):
+    def clean_frame(self, df):
         # clean cols just in case
         df.columns = [col.lower().replace(" ", "") for col in df.columns]
         # add the language column
@@ -57,17 +94,30 @@ class DatasetNormalizer:
         # decode texts
         df = self.normalize_texts(df)
         # clean the labels col
-        df[self.output_col] = df[self.output_col].apply(clean_labels)
+        df[self.output_col] = self.to_backend(
+            df[self.output_col].apply(clean_labels)
+        )
+        return df
+
+    def selects_language_variation(self, variations) -> bool:
+        """
+        Whether rows must be filtered by language variation, i.e., the
+        dataset has language variations and some of them match the language.
+        """
+        return self.language_var and any(
+            self.language in variation for variation in variations
+        )
+
+    def standard_cleanup(self, df):
+        df = self.clean_frame(df)
         # check for possible mappings
         if self.mapping:
             df = self.normalize_column(df)
         # check for correct language
-        if self.language_var:
-            unique_variations = df["language_variation"].unique()
-            if any(
-                self.language in variation for variation in unique_variations
-            ):
-                df = df[df["language_variation"].str.contains(self.language)]
+        if self.language_var and self.selects_language_variation(
+            df["language_variation"].unique()
+        ):
+            df = df[df["language_variation"].str.contains(self.language)]
         # keep only the columns we want
         df = df[self.keep_columns]
 
@@ -0,0 +1,105 @@
+import re
+from typing import Optional
+
+from src.utils.logging import get_logger
+from src.utils.registry import LazyRegistry
+
+_logger = get_logger(__name__)
+
+# text extractors of each MIME type, with the `(content, content_type)`
+# signature of the URL cache extractors. Other types fall back to
+# unstructured
+extractor_registry = LazyRegistry(
+    {
+        "text/html": ".html:html_to_text",
+        "application/xhtml+xml": ".html:html_to_text",
+        "application/pdf": ".pdf:pdf_to_text",
+        "text/plain": ".text:plain_text",
+        "text/markdown": ".text:plain_text",
+    },
+    package=__name__,
+)
+
+# bumped when the extractors change, so the texts cached by the URL cache
+# are extracted again
+EXTRACTOR_NAME = "extractors-1"
+
+_HTML_PREFIXES = (b"<!doctype html", b"<html", b"<head", b"<body")
+_BINARY_TYPES = ("", "application/octet-stream", "binary/octet-stream")
+_CHARSET_PATTERN = re.compile(r"charset=[\"']?([\w.:-]+)", re.IGNORECASE)
+
+
+def sniff_mime_type(content: bytes, content_type: str = "") -> str:
+    """
+    Sniffs the MIME type of a document from its first bytes, falling back
+    to the declared content type. Servers often declare PDFs and pages as
+    generic binaries, or the other way around.
+
+    Args:
+        content (bytes): the raw document.
+        content_type (str): the declared Content-Type, if any.
+
+    Returns:
+        str: the MIME type, without parameters.
+    """
+    head = content[:1024].lstrip(b"\xef\xbb\xbf \t\r\n")
+    if head.startswith(b"%PDF-"):
+        return "application/pdf"
+    lower_head = head.lower()
+    if lower_head.startswith(_HTML_PREFIXES) or (
+        lower_head.startswith((b"<?xml", b"<!--")) and b"<html" in lower_head
+    ):
+        return "text/html"
+
+    declared = content_type.split(";")[0].strip().lower()
+    if declared not in _BINARY_TYPES:
+        return declared
+    if b"\x00" not in head:
+        return "text/plain"
+    return "application/octet-stream"
+
+
+def declared_charset(content_type: str) -> Optional[str]:
+    """
+    Returns the charset parameter of a Content-Type, if any.
+
+    Args:
+        content_type (str): the Content-Type.
+
+    Returns:
+        Optional[str]: the charset.
+    """
+    match = _CHARSET_PATTERN.search(content_type)
+    return match.group(1) if match else None
+
+
+def extract_unstructured_text(content: bytes, content_type: str) -> str:
+    """Extract the text of a document (HTML, PDF...) with unstructured."""
+    import io
+
+    from unstructured.partition.auto import partition
+
+    elements = partition(
+        file=io.BytesIO(content),
+        content_type=content_type.split(";")[0] or None,
+    )
+    return "\n\n".join([str(el) for el in elements])
+
+
+def extract_text(content: bytes, content_type: str = "") -> str:
+    """
+    Extracts the text of a document with the extractor of its sniffed MIME
+    type: paragraphs are separated by blank lines.
+
+    Args:
+        content (bytes): the raw document.
+        content_type (str): the declared Content-Type, if any.
+
+    Returns:
+        str: the text of the document.
+    """
+    mime_type = sniff_mime_type(content, content_type)
+    if mime_type not in extractor_registry:
+        _logger.info(f"No extractor of {mime_type}, using unstructured")
+        return extract_unstructured_text(content, content_type)
+    return extractor_registry[mime_type](content, content_type)
@@ -0,0 +1,120 @@
+import re
+
+from src.utils.extractors import declared_charset
+
+# elements without readable text
+SKIPPED_TAGS = (
+    "script",
+    "style",
+    "noscript",
+    "template",
+    "svg",
+    "iframe",
+    "object",
+    "canvas",
+)
+# elements ending a paragraph
+BLOCK_TAGS = (
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "caption",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "title",
+    "ul",
+)
+
+# elements ending a line within a paragraph
+LINE_TAGS = ("br", "tr")
+# elements separated by a space from the next one, e.g. menu links
+SPACED_TAGS = ("a", "button", "td", "th")
+
+# marks the line breaks, as the rest of the whitespace is collapsed
+_LINE_BREAK = "\u2028"
+_META_CHARSET_PATTERN = re.compile(
+    rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.IGNORECASE
+)
+_XML_DECLARATION_PATTERN = re.compile(r"^\s*<\?xml[^>]*\?>")
+_PARAGRAPH_BREAK_PATTERN = re.compile(r"\n\s*\n")
+
+
+def _decode(content: bytes, content_type: str) -> str:
+    charset = declared_charset(content_type)
+    if charset is None:
+        match = _META_CHARSET_PATTERN.search(content[:4096])
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return content.decode(charset, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+
+def html_to_text(content: bytes, content_type: str = "") -> str:
+    """
+    Extracts the text of an HTML page with lxml's C parser: scripts,
+    styles and comments are dropped, each block element (paragraphs,
+    headings, list items, tables...) ends a paragraph, and line breaks and
+    table rows end a line.
+
+    Args:
+        content (bytes): the raw page.
+        content_type (str): the declared Content-Type, for the charset.
+
+    Returns:
+        str: the paragraphs of the page, separated by blank lines.
+    """
+    import lxml.html
+    from lxml import etree
+
+    html = _XML_DECLARATION_PATTERN.sub("", _decode(content, content_type))
+    if not html.strip():
+        return ""
+    tree = lxml.html.document_fromstring(html)
+    etree.strip_elements(
+        tree,
+        etree.Comment,
+        etree.ProcessingInstruction,
+        *SKIPPED_TAGS,
+        with_tail=False,
+    )
+    for element in tree.iter(*SPACED_TAGS):
+        if not element.tail:
+            element.tail = " "
+    for element in tree.iter(*LINE_TAGS):
+        element.tail = _LINE_BREAK + (element.tail or "")
+    for element in tree.iter(*BLOCK_TAGS):
+        element.tail = "\n\n" + (element.tail or "")
+
+    paragraphs = []
+    for paragraph in _PARAGRAPH_BREAK_PATTERN.split("".join(tree.itertext())):
+        lines = (
+            " ".join(line.split()) for line in paragraph.split(_LINE_BREAK)
+        )
+        paragraph = "\n".join(line for line in lines if line)
+        if paragraph:
+            paragraphs.append(paragraph)
+    return "\n\n".join(paragraphs)
@@ -0,0 +1,87 @@
+import re
+import threading
+from typing import Iterator
+
+# pdfium is not thread-safe
+_pdfium_lock = threading.Lock()
+
+# pdfium replaces the soft hyphen and line break of a broken word with this
+_PDFIUM_HYPHEN = "\x02"
+# soft hyphens breaking a word across lines, removed with the line break
+_SOFT_HYPHENATION = "\u00ad\n"
+# hard hyphens at the end of a line might be part of a compound, e.g.
+# "state-\nof-the-art", so only the line break is removed
+_HYPHEN_BREAK_PATTERN = re.compile(r"(\w-)\n(?=\w)")
+
+
+def iter_pdf_pages(content: bytes) -> Iterator[str]:
+    """
+    Extracts the text of a PDF page by page with pdfium, so that only one
+    page is loaded at a time. The pdfium lock is only held while a page is
+    read, never across a yield, so a consumer that stops early or extracts
+    another PDF meanwhile does not block the other extractions.
+
+    Args:
+        content (bytes): the raw PDF.
+
+    Yields:
+        str: the text of each page.
+    """
+    import pypdfium2 as pdfium
+
+    with _pdfium_lock:
+        pdf = pdfium.PdfDocument(content)
+    try:
+        with _pdfium_lock:
+            num_pages = len(pdf)
+        for index in range(num_pages):
+            with _pdfium_lock:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_bounded()
+                finally:
+                    textpage.close()
+                    page.close()
+            yield text
+    finally:
+        with _pdfium_lock:
+            pdf.close()
+
+
+def clean_pdf_page(text: str) -> str:
+    """
+    Cleans the text of a PDF page: words broken across lines by a soft
+    hyphen are joined, and lines ending in a hard hyphen are joined keeping
+    it, e.g. "state-of-the-art".
+
+    Args:
+        text (str): the text of the page, as extracted by pdfium.
+
+    Returns:
+        str: the cleaned text.
+    """
+    text = text.replace(_PDFIUM_HYPHEN, "")
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    text = text.replace(_SOFT_HYPHENATION, "")
+    return _HYPHEN_BREAK_PATTERN.sub(r"\1", text).strip()
+
+
+def pdf_to_text(content: bytes, content_type: str = "") -> str:
+    """
+    Extracts the text of a PDF, e.g. an arXiv or ACL paper: pages are
+    separated by blank lines and words hyphenated across lines are joined.
+
+    Args:
+        content (bytes): the raw PDF.
+        content_type (str): the declared Content-Type, unused.
+
+    Returns:
+        str: the text of the PDF.
+    """
+    pages = []
+    for text in iter_pdf_pages(content):
+        text = clean_pdf_page(text)
+        if text:
+            pages.append(text)
+    return "\n\n".join(pages)
@@ -0,0 +1,20 @@
+from src.utils.extractors import declared_charset
+
+
+def plain_text(content: bytes, content_type: str = "") -> str:
+    """
+    Decodes a plain text document, in its declared charset or UTF-8.
+
+    Args:
+        content (bytes): the raw document.
+        content_type (str): the declared Content-Type, for the charset.
+
+    Returns:
+        str: the text.
+    """
+    charset = declared_charset(content_type) or "utf-8-sig"
+    try:
+        text = content.decode(charset, errors="replace")
+    except LookupError:
+        text = content.decode("utf-8-sig", errors="replace")
+    return text.replace("\r\n", "\n").strip()
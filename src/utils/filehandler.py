@@ -1,5 +1,5 @@
 import os
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Union
 
 import pandas as pd
 
@@ -13,6 +13,8 @@ class FileHandler:
     Attributes:
         input_dir (str): The directory containing the input files.
         input_files (List[str]): A list of file paths in the input directory.
+        dtype_backend (Optional[str]): pandas dtype backend of the DataFrames,
+            e.g. "pyarrow" for Arrow-backed columns. NumPy (object strings) if None.
 
     Methods:
         process_files() -> Dict[str, Union[pd.DataFrame, List[str]]]:
@@ -27,15 +29,20 @@ class FileHandler:
             Processes a TXT file and returns a DataFrame.
     """
 
-    def __init__(self, input_dir: str):
+    def __init__(self, input_dir: str, dtype_backend: Optional[str] = None):
         """
         Initializes the FileHandler with the input directory.
 
         Args:
             input_dir (str): The directory containing the input files.
+            dtype_backend (Optional[str]): pandas dtype backend of the DataFrames.
         """
         self.input_dir = input_dir
         self.input_files = get_files_from_dir(self.input_dir)
+        self.dtype_backend = dtype_backend
+        self.read_options = (
+            {"dtype_backend": dtype_backend} if dtype_backend else {}
+        )
 
     def process_files(self) -> Dict[str, Union[pd.DataFrame, List[str]]]:
         """
@@ -69,7 +76,7 @@ class FileHandler:
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
-        return pd.read_csv(file_path, sep="\t")
+        return pd.read_csv(file_path, sep="\t", **self.read_options)
 
     def process_csv(self, file_path: str) -> pd.DataFrame:
         """
@@ -81,7 +88,7 @@ class FileHandler:
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
-        return pd.read_csv(file_path)
+        return pd.read_csv(file_path, **self.read_options)
 
     def process_xlsx(self, file_path: str) -> pd.DataFrame:
         """
@@ -93,7 +100,7 @@ class FileHandler:
         Returns:
             pd.DataFrame: The processed DataFrame.
         """
-        return pd.read_excel(file_path)
+        return pd.read_excel(file_path, **self.read_options)
 
     def process_txt(self, file_path: str) -> pd.DataFrame:
         """
@@ -1,14 +1,40 @@
+import json
+from typing import Optional
+
 import requests
-import tiktoken
-from bs4 import BeautifulSoup
 from openai import OpenAI
 
+from src.utils.extractors import EXTRACTOR_NAME, extract_text
+from src.utils.llm_cache import CacheMissError, LLMCache, get_llm_cache
 from src.utils.logging import get_logger
 from src.utils.preprocessing import clean_url_text
+from src.utils.telemetry import get_telemetry, openai_http_client
+from src.utils.tokens import (
+    DEFAULT_MAX_PROMPT_TOKENS,
+    count_tokens,
+    get_encoder,
+    truncate_to_tokens,
+)
+from src.utils.url_cache import get_url_cache
 
 _logger = get_logger(__name__)
 
 
+def extract_html_text(content: bytes, content_type: str) -> str:
+    """
+    Extracts and cleans the text of a page, or of any other document the
+    extractors handle (e.g. a PDF).
+
+    Args:
+        content (bytes): The raw page.
+        content_type (str): The MIME type of the page.
+
+    Returns:
+        str: The cleaned text of the page.
+    """
+    return clean_url_text(extract_text(content, content_type))
+
+
 class GPTClient:
     def __init__(
         self,
@@ -17,6 +43,8 @@ class GPTClient:
         json_mode: bool = False,
         truncate_max_tokens: int = 500,
         gpt_timeout: int = 20,
+        cache: Optional[LLMCache] = None,
+        max_prompt_tokens: int = DEFAULT_MAX_PROMPT_TOKENS,
     ):
         """
         Initializes the client with the provided API key and model configuration.
@@ -27,9 +55,14 @@ class GPTClient:
         - json_mode (bool): Switch used to include the "response_format" param as a json_object. This doesn't work on GPT-4.
         - truncate_max_tokens (int): Maximum number of tokens after truncation on the examples used for in-context learning.
         - gpt_timeout (int): The timeout for the OpenAI client in seconds.
+        - cache (Optional[LLMCache]): Cache of the responses, the process-wide one if None.
+        - max_prompt_tokens (int): Prompts are truncated to this number of tokens to fit in the model context.
         """
         self.client = OpenAI(
-            organization=None, api_key=openai_api_key, timeout=gpt_timeout
+            organization=None,
+            api_key=openai_api_key,
+            timeout=gpt_timeout,
+            http_client=openai_http_client(),
         )
 
         self.generation_params = {
@@ -42,10 +75,51 @@ class GPTClient:
         if json_mode:
             self.generation_params["response_format"] = {"type": "json_object"}
 
-        self.tokenizer = tiktoken.encoding_for_model(model)
+        self.tokenizer = get_encoder(model)
+        self.max_prompt_tokens = max_prompt_tokens
 
         self.truncate_max_tokens = truncate_max_tokens
 
+        self.cache = cache or get_llm_cache()
+
+    def complete(self, prompt: str, **params) -> str:
+        """
+        Sends a single user message to the chat completions API, reusing
+        the cached response of identical requests.
+
+        Args:
+            prompt (str): The content of the user message.
+            **params: Parameters of the request, e.g. the model.
+
+        Returns:
+            str: The content of the response.
+        """
+        model = params.get("model", self.generation_params["model"])
+        if count_tokens(prompt, model) > self.max_prompt_tokens:
+            _logger.warning(
+                f"Prompt truncated to {self.max_prompt_tokens} tokens"
+            )
+            prompt = truncate_to_tokens(prompt, self.max_prompt_tokens, model)
+        messages = [{"role": "user", "content": prompt}]
+        key = self.cache.key(json.dumps(messages), tools=None, **params)
+        with get_telemetry().track(model) as call:
+
+            def create() -> str:
+                call.cached = False
+                response = self.client.chat.completions.create(
+                    messages=messages, **params
+                )
+                call.record_usage(
+                    response.usage.prompt_tokens,
+                    response.usage.completion_tokens,
+                    cached=False,
+                )
+                return response.choices[0].message.content
+
+            # a cache hit unless the response is requested
+            call.cached = True
+            return self.cache.get_or_compute(key, create)
+
     def extract_url_content(self, url: str) -> str:
         """
         Extracts and cleans the content from a given URL.
@@ -58,18 +132,16 @@ class GPTClient:
         """
         _logger.info(f"Extracting content from URL: {url}")
         try:
-            response = requests.get(url)
-            response.raise_for_status()
+            return get_url_cache().text(
+                url, f"clean-{EXTRACTOR_NAME}", extract_html_text
+            )
         except requests.RequestException as e:
             _logger.warning(f"Failed to fetch URL content: {e}")
             return ""
-
-        soup = BeautifulSoup(response.text, "html.parser")
-        page_content = soup.get_text(separator="\n", strip=True)
-
-        clean_content = clean_url_text(page_content)
-
-        return clean_content
+        except Exception as e:
+            # the extractors raise their own errors on malformed documents
+            _logger.warning(f"Failed to extract URL content: {e}")
+            return ""
 
     def summarize_url(self, url: str, prompt: str) -> str:
         """
@@ -88,13 +160,21 @@ class GPTClient:
         with open("prompts/url_summarizer.txt", "r") as file:
             prompt_template = file.read()
 
+        # the page is truncated, never the instructions of the template
+        model = self.generation_params["model"]
+        page_content = truncate_to_tokens(
+            page_content,
+            self.max_prompt_tokens - count_tokens(prompt_template, model),
+            model,
+        )
         prompt = prompt_template.format(page_content=page_content)
 
         try:
-            response = self.client.chat.completions.create(
-                messages=[{"role": "user", "content": prompt}]
+            summary = self.complete(
+                prompt, model=self.generation_params["model"]
             )
-            summary = response.choices[0].message["content"]
+        except CacheMissError:
+            raise
         except Exception as e:
             _logger.warning(f"Failed to generate summary: {e}")
             return ""
@@ -108,9 +188,6 @@ class GPTClient:
 
         _logger.info(f"Generating model card...")
 
-        response = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt_template}],
-            model=self.generation_params["model"],
+        return self.complete(
+            prompt_template, model=self.generation_params["model"]
         )
-
-        return response.choices[0].message.content
@@ -1,15 +1,45 @@
+import json
 import os
+import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-
-from huggingface_hub import HfApi, create_repo, hf_hub_download
-
-from datasets import DatasetDict, load_dataset, load_from_disk
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote
+
+import pyarrow.parquet as pq
+
+from huggingface_hub import (
+    CommitOperationAdd,
+    CommitOperationDelete,
+    DatasetCard,
+    HfFileSystem,
+    get_session,
+    hf_hub_url,
+)
+from huggingface_hub.errors import EntryNotFoundError, HfHubHTTPError
+from huggingface_hub.utils import build_hf_headers, hf_raise_for_status
+
+from datasets import DatasetDict, Features, load_dataset, load_from_disk
+from datasets.info import DatasetInfosDict
+from src.utils.http import get_hf_api
+from src.utils.io import HUB_DATA_DIR, MAX_FILES_PER_COMMIT
 from src.utils.logging import get_logger
 
+if TYPE_CHECKING:
+    from fsspec import AbstractFileSystem
+
 _logger = get_logger(__name__)
 
+# branch with the Parquet conversion the Hub makes of datasets
+PARQUET_REVISION = "refs/convert/parquet"
+
+# retries of a conditional update whose parent commit is no longer the head
+MAX_COMMIT_RETRIES = 3
+
+_SHARD_NAME_REGEX = re.compile(r"^(?P<split>.+)-\d{5}-of-\d{5}\.parquet$")
+
 
 def download_hf_file(
     file_name: str, repo_id: str, token: str, save_path: str
@@ -29,7 +59,7 @@ def download_hf_file(
     _logger.info(f"Downloading {file_name} from repo: {repo_id}")
 
     # Download the specified file
-    file_path = hf_hub_download(
+    file_path = get_hf_api().hf_hub_download(
         repo_id=repo_id,
         filename=file_name,
         repo_type="dataset",  # Change to "model" if it's a model repo
@@ -53,7 +83,7 @@ def download_hf_file(
 def upload_hf_file(
     path_or_fileobj, path_in_repo, repo_id, token, repo_type="dataset"
 ):
-    client = HfApi()
+    client = get_hf_api()
     client.upload_file(
         path_or_fileobj=path_or_fileobj,
         path_in_repo=path_in_repo,
@@ -63,158 +93,307 @@ def upload_hf_file(
     )
 
 
+def read_hf_file(
+    file_name: str, repo_id: str, token: str, revision: str
+) -> Optional[str]:
+    """
+    Reads a file of a Hugging Face dataset repository at a given revision
+    into memory, without going through the local cache.
+
+    Args:
+        file_name (str): The name of the file to read.
+        repo_id (str): The ID of the Hugging Face repository.
+        token (str): The Hugging Face API token.
+        revision (str): The commit to read the file from.
+
+    Returns:
+        Optional[str]: The content of the file, None if it does not exist.
+    """
+    response = get_session().get(
+        hf_hub_url(
+            repo_id, file_name, repo_type="dataset", revision=revision
+        ),
+        headers=build_hf_headers(token=token),
+    )
+    if response.status_code == 404:
+        return None
+    hf_raise_for_status(response)
+    return response.text
+
+
+def _merge_hf_file_content(
+    file_name: str, existing_content: Optional[str], new_content, separator: str
+) -> str:
+    """
+    Merges the new content into the existing content of a file: JSON
+    dictionaries are merged (existing is updated with new) and text is
+    appended after the separator.
+    """
+    if file_name.endswith(".json") and isinstance(new_content, dict):
+        combined_content = new_content
+        if existing_content is not None:
+            try:
+                existing_json = json.loads(existing_content)
+                combined_content = {**existing_json, **new_content}
+                _logger.info(
+                    f"Merged JSON with {len(existing_json)} existing and {len(new_content)} new fields"
+                )
+            except Exception as e:
+                _logger.warning(
+                    f"Could not merge existing JSON: {e}. Using new JSON only."
+                )
+        return json.dumps(combined_content, indent=2)
+
+    if existing_content is None:
+        return new_content
+
+    # Format the separator with the current date if needed
+    if "{date}" in separator:
+        separator = separator.format(
+            date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        )
+    _logger.info(
+        f"Combined content created with {len(existing_content)} + {len(new_content)} characters"
+    )
+    return existing_content + separator + new_content
+
+
 def append_to_hf_file(
     file_name: str,
     repo_id: str,
     token: str,
     new_content,
-    save_path: str,
     separator: str = "\n\n<!-- New content added on {date} -->\n\n",
+    max_retries: int = MAX_COMMIT_RETRIES,
 ) -> None:
     """
     Appends new content to an existing file in a Hugging Face repository.
     If the file doesn't exist, it creates it with just the new content.
     For JSON files, merges the dictionaries instead of appending.
 
+    The file is read and merged in memory and committed on top of the
+    revision it was read from. If the repository changed in between (e.g.,
+    another card run committed), the update is read, merged and committed
+    again, so concurrent updates are never overwritten.
+
     Args:
         file_name: Name of the file to update
         repo_id: Hugging Face repository ID
         token: Authentication token
         new_content: Content to append/merge (string for text, dict for JSON)
-        save_path: Local path to save the file temporarily
         separator: Separator for text files (ignored for JSON)
+        max_retries: Attempts after a conflicting commit before giving up
+
+    Raises:
+        HfHubHTTPError: if the update still conflicts after `max_retries`.
     """
     _logger.info(f"Appending to file {file_name} in repository {repo_id}")
+    client = get_hf_api()
+
+    for attempt in range(max_retries + 1):
+        parent_commit = client.repo_info(
+            repo_id, repo_type="dataset", token=token
+        ).sha
+        existing_content = read_hf_file(
+            file_name, repo_id, token, revision=parent_commit
+        )
+        if existing_content is None:
+            _logger.info(f"{file_name} does not exist. Creating new file.")
 
-    # Check if we're dealing with a JSON file and dictionary content
-    is_json = file_name.endswith(".json") and isinstance(new_content, dict)
-
-    try:
-        if is_json:
-            # For JSON files, try to load existing JSON and merge
-            try:
-                # Download the file
-                file_path = download_hf_file(
-                    file_name=file_name,
-                    repo_id=repo_id,
-                    token=token,
-                    save_path=save_path,
-                )
-
-                # Parse the existing JSON
-                import json
-
-                with open(Path(save_path) / file_name, "r") as f:
-                    existing_json = json.load(f)
-
-                _logger.info(
-                    f"Successfully loaded existing JSON from {file_name}"
-                )
-
-                # Merge dictionaries (existing is updated with new)
-                combined_content = {**existing_json, **new_content}
-                _logger.info(
-                    f"Merged JSON with {len(existing_json)} existing and {len(new_content)} new fields"
-                )
-            except Exception as e:
-                _logger.warning(
-                    f"Could not load or merge existing JSON: {e}. Using new JSON only."
-                )
-                combined_content = new_content
-        else:
-            # For text files, append as before
-            existing_content = download_hf_file(
+        combined_content = _merge_hf_file_content(
+            file_name, existing_content, new_content, separator
+        )
+        try:
+            update_hf_file(
                 file_name=file_name,
                 repo_id=repo_id,
                 token=token,
-                save_path=save_path,
+                new_content=combined_content,
+                parent_commit=parent_commit,
             )
-            _logger.info(f"Successfully downloaded existing {file_name}")
-
-            # Format the separator with the current date if needed
-            if "{date}" in separator:
-                separator = separator.format(
-                    date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                )
-
-            # Combine the existing and new content
-            combined_content = existing_content + separator + new_content
-            _logger.info(
-                f"Combined content created with {len(existing_content)} + {len(new_content)} characters"
+        except HfHubHTTPError as e:
+            status_code = getattr(e.response, "status_code", None)
+            if status_code not in (409, 412) or attempt == max_retries:
+                raise
+            _logger.warning(
+                f"{repo_id} changed while updating {file_name}, retrying "
+                f"({attempt + 1}/{max_retries})"
             )
-
-    except Exception as e:
-        _logger.warning(
-            f"Could not download existing file: {e}. Creating new file."
-        )
-        combined_content = new_content
-
-    # Update the file with the combined content
-    update_hf_file(
-        file_name=file_name,
-        repo_id=repo_id,
-        token=token,
-        new_content=combined_content,
-        save_path=save_path,
-    )
+            continue
+        break
     _logger.info(f"File {file_name} updated in repository {repo_id}")
 
 
 def update_hf_file(
-    file_name: str, repo_id: str, token: str, new_content, save_path: str
+    file_name: str,
+    repo_id: str,
+    token: str,
+    new_content,
+    parent_commit: Optional[str] = None,
 ) -> None:
     """
-    Update a file's content in a Hugging Face repository.
+    Update a file's content in a Hugging Face repository, uploading it from
+    memory.
 
     Args:
         file_name: Name of the file to update
         repo_id: Hugging Face repository ID
         token: Authentication token
         new_content: Content to update (string for text, dict for JSON)
-        save_path: Local path to save the file temporarily
+        parent_commit: If given, the commit fails unless it is the head of
+            the repository
     """
     _logger.info(f"Updating {file_name} for repo: {repo_id}")
 
-    # Ensure the local directory exists
-    save_path = Path(save_path) / file_name
-    save_path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(new_content, dict):
+        new_content = json.dumps(new_content, indent=2)
 
-    # Handle content based on type
-    with open(save_path, "w") as file:
-        if isinstance(new_content, dict):
-            import json
+    get_hf_api().create_commit(
+        repo_id=repo_id,
+        operations=[
+            CommitOperationAdd(
+                path_in_repo=file_name,
+                path_or_fileobj=new_content.encode("utf-8"),
+            )
+        ],
+        commit_message=f"Update {file_name}",
+        token=token,
+        repo_type="dataset",
+        parent_commit=parent_commit,
+    )
+
+
+class RepoIndex:
+    """
+    Index of the existing dataset repositories, listed in bulk once per
+    organization and kept for `ttl` seconds. Repositories created through
+    `create_dataset_repo` are added locally, without listing again.
+
+    Attributes:
+        ttl (float): Seconds before the listing of an organization expires.
+    """
+
+    def __init__(self, ttl: float = 600):
+        self.ttl = ttl
+        self._repos: Dict[str, Set[str]] = {}
+        self._listed_at: Dict[str, float] = {}
+
+    def exists(self, repo_id: str, token: Optional[str] = None) -> bool:
+        """
+        Whether a dataset repository exists. Errors listing the
+        repositories are raised, never taken as a missing repository.
+
+        Args:
+            repo_id (str): The ID of the Hugging Face repository.
+            token (Optional[str]): The Hugging Face API token.
+
+        Returns:
+            bool: True if the repository exists.
+        """
+        organization = repo_id.split("/")[0]
+        listed_at = self._listed_at.get(organization)
+        if listed_at is None or time.monotonic() - listed_at > self.ttl:
+            self.refresh(organization, token)
+        return repo_id in self._repos[organization]
+
+    def refresh(self, organization: str, token: Optional[str] = None) -> None:
+        """
+        Lists all the dataset repositories of an organization.
+        """
+        _logger.info(f"Listing dataset repositories of {organization}")
+        self._repos[organization] = {
+            dataset.id
+            for dataset in get_hf_api().list_datasets(
+                author=organization, token=token
+            )
+        }
+        self._listed_at[organization] = time.monotonic()
 
-            json.dump(new_content, file, indent=2)
-        else:
-            file.write(new_content)
+    def add(self, repo_id: str) -> None:
+        """
+        Adds a repository created in this process to the index.
+        """
+        self._repos.setdefault(repo_id.split("/")[0], set()).add(repo_id)
 
-    _logger.info(f"{file_name} updated and saved to: {save_path}")
+    def clear(self) -> None:
+        self._repos.clear()
+        self._listed_at.clear()
 
-    # Update the file content on Hugging Face
-    upload_hf_file(save_path, file_name, repo_id, token, "dataset")
 
-    # Delete the file from the save_path
-    os.remove(save_path)
-    _logger.info(f"{file_name} deleted from local path: {save_path}")
+# shared by all the repository checks of a run
+repo_index = RepoIndex()
 
 
 def auth_check(repo_id, hf_env_var="HF_API_KEY"):
     # check repo
-    client = HfApi()
-    repo_id = repo_id
     token = os.environ[hf_env_var]
+    exists = repo_index.exists(repo_id, token=token)
+    if not exists:
+        _logger.warning(f"Repo {repo_id} not found.")
+    return exists
 
-    try:
-        client.dataset_info(repo_id, token=token)
-        return True
-    except Exception as e:
-        _logger.warning(f"Repo {repo_id} not found. {e}")
-        return False
+
+def create_dataset_repo(
+    repo_id: str,
+    private: bool = False,
+    wait: float = 0,
+    hf_env_var: str = "HF_API_KEY",
+) -> None:
+    """
+    Creates a dataset repository and adds it to the repository index.
+
+    Args:
+        repo_id (str): The ID of the Hugging Face repository.
+        private (bool): Whether the repository is private.
+        wait (float): Seconds to wait for the repository to be available.
+        hf_env_var (str): Environment variable with the Hugging Face API token.
+    """
+    _logger.info(f"Creating repo {repo_id}")
+    get_hf_api().create_repo(
+        repo_id,
+        repo_type="dataset",
+        private=private,
+        token=os.environ[hf_env_var],
+        exist_ok=True,
+    )
+    repo_index.add(repo_id)
+    time.sleep(wait)
+
+
+def hub_parquet_files(
+    results_path: Path, splits: Optional[List[str]] = None
+) -> List[Path]:
+    """
+    Lists the Hub-ready Parquet shards written at normalization time.
+
+    Args:
+        results_path (Path): The path to the dataset results directory.
+        splits (Optional[List[str]]): Splits to list, all of them if None.
+
+    Returns:
+        List[Path]: The shards, sorted by name.
+    """
+    files = sorted((Path(results_path) / HUB_DATA_DIR).glob("*.parquet"))
+    if splits is not None:
+        files = [file for file in files if shard_split(file.name) in splits]
+    return files
+
+
+def shard_split(shard_name: str) -> str:
+    """
+    Gets the split of a shard named `{split}-{shard}-of-{num_shards}.parquet`.
+    """
+    match = _SHARD_NAME_REGEX.match(shard_name)
+    if match is None:
+        raise ValueError(f"Not a Hub Parquet shard name: {shard_name}")
+    return match.group("split")
 
 
 def upload_dataset(config: dict, repo_name: str, results_path: Path) -> None:
     """
-    Upload a dataset to a Hugging Face repository.
+    Upload a dataset to a Hugging Face repository. The Parquet shards
+    written at normalization time are uploaded as they are; datasets
+    without them are loaded from disk and pushed.
 
     Args:
         config (dict): The configuration dictionary for the dataset.
@@ -226,12 +405,139 @@ def upload_dataset(config: dict, repo_name: str, results_path: Path) -> None:
     """
     _logger.info(f"Uploading dataset to repo: {repo_name}")
 
-    dataset = load_from_disk(results_path)
-    dataset.push_to_hub(repo_name, token=True)
+    if hub_parquet_files(results_path):
+        get_hf_api().upload_folder(
+            repo_id=repo_name,
+            folder_path=results_path,
+            repo_type="dataset",
+            allow_patterns=f"{HUB_DATA_DIR}/*.parquet",
+            # shards of previous uploads not overwritten by this one
+            delete_patterns=f"{HUB_DATA_DIR}/*.parquet",
+            commit_message="Upload dataset",
+        )
+    else:
+        dataset = load_from_disk(results_path)
+        dataset.push_to_hub(repo_name, token=True)
 
     _logger.info(f"Dataset uploaded to {repo_name}")
 
 
+def main_dataset_operations(
+    config_name: str,
+    results_path: Path,
+    splits: Optional[List[str]] = None,
+    repo_files: Optional[List[str]] = None,
+) -> Tuple[list, dict]:
+    """
+    Builds the commit operations that add a dataset, from its Hub-ready
+    Parquet shards, as a config of the main dataset repository.
+
+    Args:
+        config_name (str): Name of the config in the main dataset.
+        results_path (Path): The path to the dataset results directory.
+        splits (Optional[List[str]]): Splits to add, all of them if None.
+        repo_files (Optional[List[str]]): Files currently in the main
+            dataset repository, to delete stale shards of the config.
+
+    Returns:
+        Tuple[list, dict]: The commit operations and the config entry for
+            the `configs` metadata of the dataset card.
+    """
+    files = hub_parquet_files(results_path, splits)
+    operations = [
+        CommitOperationAdd(
+            path_in_repo=f"{config_name}/{file.name}", path_or_fileobj=file
+        )
+        for file in files
+    ]
+    new_paths = {operation.path_in_repo for operation in operations}
+    operations += [
+        CommitOperationDelete(path_in_repo=repo_file)
+        for repo_file in repo_files or []
+        if repo_file.startswith(f"{config_name}/")
+        and repo_file not in new_paths
+    ]
+    data_files = [
+        {"split": split, "path": f"{config_name}/{split}-*"}
+        for split in sorted({shard_split(file.name) for file in files})
+    ]
+    return operations, {"config_name": config_name, "data_files": data_files}
+
+
+def update_card_configs(card: DatasetCard, config_entries: List[dict]) -> None:
+    """
+    Merges config entries into the `configs` metadata of a dataset card,
+    replacing the entries of configs with the same name.
+
+    Args:
+        card (DatasetCard): The dataset card to update.
+        config_entries (List[dict]): The new config entries.
+    """
+    new_names = {entry["config_name"] for entry in config_entries}
+    configs = [
+        entry
+        for entry in card.data.get("configs") or []
+        if entry["config_name"] not in new_names
+    ]
+    card.data["configs"] = sorted(
+        configs + config_entries, key=lambda entry: entry["config_name"]
+    )
+
+
+def load_dataset_card(repo_id: str) -> DatasetCard:
+    """
+    Loads the dataset card of a repository, or an empty one if the
+    repository has no README.md yet.
+    """
+    try:
+        return DatasetCard.load(repo_id, repo_type="dataset")
+    except EntryNotFoundError:
+        return DatasetCard("")
+
+
+def commit_to_main_dataset(
+    main_hf_dataset: str, datasets: List[Tuple[str, Path, Optional[List[str]]]]
+) -> None:
+    """
+    Adds datasets as configs of the main dataset repository in a single
+    commit: their Parquet shards plus the merged `configs` metadata of the
+    dataset card.
+
+    Args:
+        main_hf_dataset (str): The main Hugging Face dataset repository name.
+        datasets (List[Tuple[str, Path, Optional[List[str]]]]): config name,
+            results path and splits (all of them if None) of each dataset.
+    """
+    client = get_hf_api()
+    repo_files = client.list_repo_files(main_hf_dataset, repo_type="dataset")
+
+    operations, config_entries = [], []
+    for config_name, results_path, splits in datasets:
+        config_operations, config_entry = main_dataset_operations(
+            config_name, results_path, splits, repo_files
+        )
+        operations += config_operations
+        config_entries.append(config_entry)
+
+    card = load_dataset_card(main_hf_dataset)
+    update_card_configs(card, config_entries)
+    operations.append(
+        CommitOperationAdd(
+            path_in_repo="README.md", path_or_fileobj=str(card).encode()
+        )
+    )
+
+    config_names = [entry["config_name"] for entry in config_entries]
+    client.create_commit(
+        main_hf_dataset,
+        operations=operations,
+        commit_message=f"Add {len(config_names)} configs",
+        commit_description="\n".join(config_names),
+        repo_type="dataset",
+    )
+    _logger.info(f"Configs {config_names} added to {main_hf_dataset}")
+
+
 def add_to_main_dataset(
     repo_name: str, results_path: Path, main_hf_dataset: str
 ) -> None:
@@ -243,46 +549,236 @@ def add_to_main_dataset(
         results_path (Path): The path to the dataset results directory.
         main_hf_dataset (str): The main Hugging Face dataset repository name.
 
+    Returns:
+        None
+    """
+    add_many_to_main_dataset([(repo_name, results_path)], main_hf_dataset)
+
+
+def add_many_to_main_dataset(
+    datasets: List[Tuple[str, Path]],
+    main_hf_dataset: str,
+    max_files_per_commit: int = MAX_FILES_PER_COMMIT,
+) -> None:
+    """
+    Add several datasets to the main Hugging Face dataset repository,
+    batching their Parquet shards and the merged `configs` metadata into
+    as few commits as possible, each one with at most
+    `max_files_per_commit` shards. Datasets without Parquet shards are
+    pushed one by one.
+
+    Args:
+        datasets (List[Tuple[str, Path]]): Repository name and results
+            path of each dataset.
+        main_hf_dataset (str): The main Hugging Face dataset repository name.
+        max_files_per_commit (int): Maximum number of shards per commit.
+
     Returns:
         None
     """
     _logger.info(
-        f"Adding dataset from {repo_name} to main dataset: {main_hf_dataset}"
+        f"Adding {len(datasets)} datasets to main dataset: {main_hf_dataset}"
     )
 
-    dataset = load_from_disk(results_path)
-
     if not auth_check(main_hf_dataset):
-        create_repo(main_hf_dataset, repo_type="dataset")
-        time.sleep(5)
-
-    if main_hf_dataset == "iberbench/iberbench_all":
-        # for the main repo only add the train split:
-        train_split = DatasetDict({"train": dataset["train"]})
-        train_split.push_to_hub(
-            main_hf_dataset, config_name=repo_name.split("/")[-1]
-        )
-    else:
-        dataset.push_to_hub(
-            main_hf_dataset, config_name=repo_name.split("/")[-1]
-        )
+        create_dataset_repo(main_hf_dataset, wait=5)
+
+    # for the main repo only add the train split
+    splits = ["train"] if main_hf_dataset == "iberbench/iberbench_all" else None
+
+    batch, batch_files = [], 0
+    for repo_name, results_path in datasets:
+        config_name = repo_name.split("/")[-1]
+        num_files = len(hub_parquet_files(results_path, splits))
+        if not num_files:
+            dataset = load_from_disk(results_path)
+            if splits is not None:
+                dataset = DatasetDict({split: dataset[split] for split in splits})
+            dataset.push_to_hub(main_hf_dataset, config_name=config_name)
+            _logger.info(f"Dataset from {repo_name} added to {main_hf_dataset}")
+            continue
+
+        if batch and batch_files + num_files > max_files_per_commit:
+            commit_to_main_dataset(main_hf_dataset, batch)
+            batch, batch_files = [], 0
+        batch.append((config_name, results_path, splits))
+        batch_files += num_files
+
+    if batch:
+        commit_to_main_dataset(main_hf_dataset, batch)
+
+
+def _dataset_details(splits: Dict[str, int], features: "Features") -> dict:
+    return {
+        "splits": splits,
+        "fields": {name: str(info) for name, info in features.items()},
+        "size": sum(splits.values()),
+    }
 
-    _logger.info(f"Dataset from {repo_name} added to {main_hf_dataset}")
 
+def _features_split(splits: Dict[str, Any]) -> str:
+    # features are reported from the train split, as the full load did
+    return "train" if "train" in splits else next(iter(splits))
 
-def extract_dataset_details(repo_path: str, subset_name: str = None) -> dict:
 
-    dataset = load_dataset(path=repo_path, name=subset_name)
+def dataset_details_from_card(
+    card: DatasetCard, config_name: str = "default"
+) -> Optional[dict]:
+    """
+    Reads the details of a dataset config (rows per split and features)
+    from the `dataset_info` metadata of its dataset card.
+
+    Args:
+        card (DatasetCard): The dataset card of the repository.
+        config_name (str): The config of the dataset.
 
-    splits = dataset.keys()  # Train, validation, test splits
-    total_size = sum(len(dataset[split]) for split in splits)
+    Returns:
+        Optional[dict]: The dataset details, None if the card lacks them.
+    """
+    info = DatasetInfosDict.from_dataset_card_data(card.data).get(
+        config_name
+    )
+    if info is None or not info.splits or not info.features:
+        return None
+    splits = {name: split.num_examples for name, split in info.splits.items()}
+    return _dataset_details(splits, info.features)
 
-    features = dataset["train"].features
 
-    details = {
-        "splits": {split: len(dataset[split]) for split in splits},
-        "fields": {name: str(info) for name, info in features.items()},
-        "size": total_size,
+def dataset_details_from_parquet(
+    fs: "AbstractFileSystem", files: Dict[str, List[str]]
+) -> Optional[dict]:
+    """
+    Reads the details of a dataset (rows per split and features) from the
+    footers of its Parquet files, which are fetched with range requests
+    instead of downloading the files.
+
+    Args:
+        fs (AbstractFileSystem): The filesystem holding the files.
+        files (Dict[str, List[str]]): The Parquet files of each split.
+
+    Returns:
+        Optional[dict]: The dataset details, None if there are no files.
+    """
+    files = {split: paths for split, paths in files.items() if paths}
+    if not files:
+        return None
+
+    def read_footer(path: str) -> pq.FileMetaData:
+        # no read-ahead: only the footer bytes are requested
+        with fs.open(path, "rb", block_size=0) as f:
+            return pq.ParquetFile(f).metadata
+
+    paths = [path for split_paths in files.values() for path in split_paths]
+    with ThreadPoolExecutor() as executor:
+        footers = dict(zip(paths, executor.map(read_footer, paths)))
+
+    splits = {
+        split: sum(footers[path].num_rows for path in split_paths)
+        for split, split_paths in files.items()
     }
+    features = Features.from_arrow_schema(
+        footers[files[_features_split(files)][0]].schema.to_arrow_schema()
+    )
+    return _dataset_details(splits, features)
+
+
+def _hub_parquet_data_files(
+    fs: "AbstractFileSystem",
+    repo_path: str,
+    card: DatasetCard,
+    config_name: str,
+) -> Dict[str, List[str]]:
+    """
+    Finds the Parquet files of each split of a dataset config: those
+    declared in the `configs` metadata of the dataset card, those of the
+    default `data/{split}-*.parquet` layout or, otherwise, the ones of the
+    Hub Parquet conversion, which is skipped when partial.
+    """
+    for config in card.data.get("configs") or []:
+        if config.get("config_name", "default") != config_name:
+            continue
+        data_files = config.get("data_files", [])
+        if isinstance(data_files, str):
+            data_files = [{"split": "train", "path": data_files}]
+        files = {}
+        for data_file in data_files:
+            patterns = data_file["path"]
+            if isinstance(patterns, str):
+                patterns = [patterns]
+            files[data_file["split"]] = sorted(
+                path
+                for pattern in patterns
+                for path in fs.glob(f"datasets/{repo_path}/{pattern}")
+                if path.endswith(".parquet")
+            )
+        return files
+
+    # the layout of `push_to_hub` and `write_hub_parquet`, without configs
+    if config_name == "default":
+        files = {}
+        data_path = f"datasets/{repo_path}/{HUB_DATA_DIR}"
+        for path in sorted(fs.glob(f"{data_path}/*.parquet")):
+            split = path.rsplit("/", 1)[-1].split("-", 1)[0]
+            files.setdefault(split, []).append(path)
+        if files:
+            return files
+
+    root = f"datasets/{repo_path}@{quote(PARQUET_REVISION, safe='')}"
+    files = {}
+    for path in sorted(fs.glob(f"{root}/{config_name}/*/*.parquet")):
+        split = path.split("/")[-2]
+        if split.startswith("partial-"):
+            return {}
+        files.setdefault(split, []).append(path)
+    return files
+
+
+def extract_dataset_details(
+    repo_path: str, subset_name: str = None, full_load: bool = True
+) -> Optional[dict]:
+    """
+    Extracts the rows per split, the features and the size of a Hub
+    dataset. They are read from the dataset card metadata or from the
+    footers of its Parquet files; the dataset is fully loaded only when
+    neither is available.
+
+    Args:
+        repo_path (str): The ID of the Hugging Face repository.
+        subset_name (str): The config of the dataset, the default if None.
+        full_load (bool): Whether to fall back to loading the dataset.
+
+    Returns:
+        Optional[dict]: The dataset details, None if they are not in the
+            metadata and `full_load` is False.
+    """
+    config_name = subset_name or "default"
+    try:
+        card = load_dataset_card(repo_path)
+        details = dataset_details_from_card(card, config_name)
+        if details is not None:
+            _logger.info(f"Read {repo_path} details from its dataset card")
+            return details
+
+        # shares the pooled Hub client
+        get_hf_api()
+        fs = HfFileSystem()
+        details = dataset_details_from_parquet(
+            fs, _hub_parquet_data_files(fs, repo_path, card, config_name)
+        )
+        if details is not None:
+            _logger.info(f"Read {repo_path} details from its Parquet footers")
+            return details
+    except Exception as e:
+        _logger.warning(
+            f"Could not read {repo_path} details from metadata: {e}"
+        )
 
-    return details
+    if not full_load:
+        return None
+
+    _logger.info(f"Loading {repo_path} to extract its details")
+    dataset = load_dataset(path=repo_path, name=subset_name)
+    return _dataset_details(
+        {split: len(dataset[split]) for split in dataset.keys()},
+        dataset[_features_split(dataset)].features,
+    )
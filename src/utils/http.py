@@ -0,0 +1,147 @@
+import os
+from typing import TYPE_CHECKING, Optional
+
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import requests
+    from huggingface_hub import HfApi
+
+_logger = get_logger(__name__)
+
+DEFAULT_POOL_SIZE = int(os.environ.get("IBERBENCH_HTTP_POOL_SIZE", 20))
+# seconds, for URL fetches and Hub connections. Hub reads are not bounded
+# by default since big commits can take long to be answered
+DEFAULT_TIMEOUT = float(os.environ.get("IBERBENCH_HTTP_TIMEOUT", 30))
+
+_settings = {
+    "pool_size": DEFAULT_POOL_SIZE,
+    "timeout": DEFAULT_TIMEOUT,
+    "hub_read_timeout": None,
+}
+_session: Optional["requests.Session"] = None
+_hf_api: Optional["HfApi"] = None
+_hub_configured = False
+
+
+def configure_http(
+    pool_size: int = DEFAULT_POOL_SIZE,
+    timeout: float = DEFAULT_TIMEOUT,
+    hub_read_timeout: Optional[float] = None,
+) -> None:
+    """
+    Configures the process-wide HTTP clients. Clients already created are
+    closed and built again with the new settings on their next use.
+
+    Args:
+        pool_size (int): Maximum number of pooled keep-alive connections.
+        timeout (float): Timeout in seconds of URL fetches and of Hub connections.
+        hub_read_timeout (Optional[float]): Timeout in seconds of Hub reads, unbounded if None.
+    """
+    global _session, _hub_configured
+    _settings.update(
+        pool_size=pool_size, timeout=timeout, hub_read_timeout=hub_read_timeout
+    )
+    if _session is not None:
+        _session.close()
+        _session = None
+    _hub_configured = False
+
+
+def get_http_session() -> "requests.Session":
+    """
+    Returns the process-wide session used to fetch URLs, which reuses
+    TCP/TLS connections and applies the configured timeout by default.
+
+    Returns:
+        requests.Session: the shared session.
+    """
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        class TimeoutHTTPAdapter(HTTPAdapter):
+            def send(self, request, timeout=None, **kwargs):
+                if timeout is None:
+                    timeout = _settings["timeout"]
+                return super().send(request, timeout=timeout, **kwargs)
+
+        adapter = TimeoutHTTPAdapter(
+            pool_connections=_settings["pool_size"],
+            pool_maxsize=_settings["pool_size"],
+        )
+        _session = requests.Session()
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
+
+def _configure_hub_client() -> None:
+    """
+    Makes `huggingface_hub` (and `datasets`) share a single pooled client
+    with the configured limits and timeouts. The default session is kept
+    if `httpx2` or `huggingface_hub.set_client_factory` are not available.
+    """
+    global _hub_configured
+    try:
+        import httpx2
+        from huggingface_hub import get_session, set_client_factory
+    except ImportError:
+        # older `huggingface_hub` releases build their own sessions
+        _logger.debug("Using the default HuggingFace Hub session")
+        _hub_configured = True
+        return
+
+    # keep the hooks of the default client (offline mode, request ids...)
+    event_hooks = get_session().event_hooks
+    timeout = httpx2.Timeout(
+        _settings["hub_read_timeout"], connect=_settings["timeout"]
+    )
+    limits = httpx2.Limits(
+        max_connections=_settings["pool_size"],
+        max_keepalive_connections=_settings["pool_size"],
+    )
+
+    def client_factory() -> httpx2.Client:
+        return httpx2.Client(
+            event_hooks=event_hooks,
+            follow_redirects=True,
+            timeout=timeout,
+            limits=limits,
+        )
+
+    set_client_factory(client_factory)
+    _hub_configured = True
+
+
+def get_hf_api() -> "HfApi":
+    """
+    Returns the process-wide HuggingFace Hub client. Use `set_hf_api` to
+    replace it, e.g., with a local stand-in in tests.
+
+    Returns:
+        HfApi: the shared client.
+    """
+    global _hf_api
+    if not _hub_configured:
+        _configure_hub_client()
+    if _hf_api is None:
+        from huggingface_hub import HfApi
+
+        _hf_api = HfApi()
+    return _hf_api
+
+
+def set_hf_api(api: Optional["HfApi"]) -> None:
+    """
+    Replaces the process-wide HuggingFace Hub client. None restores the
+    default one.
+
+    Args:
+        api (Optional[HfApi]): the client to be used.
+    """
+    global _hf_api, _hub_configured
+    _hf_api = api
+    # a stand-in must not touch the Hub session
+    _hub_configured = api is not None
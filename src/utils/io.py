@@ -1,10 +1,21 @@
 import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Union
 
-from datasets import Dataset
 from src.models.config import Config, TaskConfig
 
+if TYPE_CHECKING:
+    from datasets import Dataset, DatasetDict
+
+# directory, inside a dataset results path, with the Hub-ready Parquet shards
+HUB_DATA_DIR = "data"
+
+# bound of the number of files of a commit to the main dataset
+MAX_FILES_PER_COMMIT = 500
+
 
 def read_json(path: str | Path) -> dict:
     """
@@ -32,6 +43,150 @@ def save_json(path: str | Path, json_dict: dict) -> None:
         json.dump(json_dict, fw, indent=4)
 
 
+def save_dataset(
+    dataset: "DatasetDict",
+    path: str | Path,
+    max_shard_size: Union[str, int] = "500MB",
+    num_proc: int = 1,
+    compression: Optional[str] = None,
+) -> None:
+    """
+    Saves a dataset to disk, sharding each split into Arrow files of at
+    most `max_shard_size` that are written in parallel by `num_proc`
+    processes. Shards are also the units of parallel uploads.
+
+    Args:
+        dataset (DatasetDict): dataset to be saved.
+        path (str | Path): directory where to save the dataset.
+        max_shard_size (Union[str, int]): maximum size of each shard, e.g. "500MB".
+        num_proc (int): number of processes writing the shards.
+        compression (Optional[str]): Arrow IPC codec ("zstd" or "lz4") to
+            compress the shards with. Compressed shards are smaller but are
+            decompressed in memory instead of memory-mapped when loaded.
+    """
+    import pyarrow as pa
+
+    if compression and not pa.Codec.is_available(compression):
+        raise ValueError(f"Unsupported compression codec: {compression}")
+
+    dataset.save_to_disk(
+        path,
+        max_shard_size=max_shard_size,
+        num_proc=num_proc if num_proc > 1 else None,
+    )
+    if compression:
+        shards = sorted(Path(path).glob("*/data-*.arrow"))
+        with ThreadPoolExecutor(max_workers=max(num_proc, 1)) as executor:
+            list(
+                executor.map(
+                    lambda shard: compress_arrow_file(shard, compression),
+                    shards,
+                )
+            )
+
+
+def compress_arrow_file(path: str | Path, compression: str) -> None:
+    """
+    Rewrites, record batch by record batch, an Arrow stream file with
+    compressed buffers. The file can still be loaded with `load_from_disk`.
+
+    Args:
+        path (str | Path): path to the Arrow stream file.
+        compression (str): Arrow IPC codec, e.g. "zstd".
+    """
+    import pyarrow as pa
+
+    path = Path(path)
+    tmp_path = path.with_suffix(".tmp")
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    with pa.memory_map(str(path)) as source:
+        reader = pa.ipc.open_stream(source)
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_stream(
+                sink, reader.schema, options=options
+            ) as writer:
+                for batch in reader:
+                    writer.write_batch(batch)
+    os.replace(tmp_path, path)
+
+
+def write_hub_parquet(
+    dataset: "DatasetDict",
+    path: str | Path,
+    max_shard_size: Union[str, int] = "500MB",
+    row_group_size: int = 10_000,
+    compression: str = "zstd",
+    num_proc: int = 1,
+) -> list[Path]:
+    """
+    Writes a dataset as Parquet shards with the HuggingFace Hub layout
+    (`data/{split}-{shard:05d}-of-{num_shards:05d}.parquet`), so the shards
+    can be uploaded as they are instead of being encoded again by
+    `push_to_hub`.
+
+    Args:
+        dataset (DatasetDict): dataset to be written.
+        path (str | Path): directory of the dataset, `data/` is created in it.
+        max_shard_size (Union[str, int]): maximum size of each shard, e.g. "500MB".
+        row_group_size (int): number of rows of each Parquet row group.
+        compression (str): Parquet compression codec.
+        num_proc (int): number of threads writing the shards.
+
+    Returns:
+        list[Path]: paths of the written shards.
+    """
+    import pyarrow.parquet as pq
+
+    from datasets.utils.py_utils import convert_file_size_to_int
+
+    data_path = Path(path) / HUB_DATA_DIR
+    data_path.mkdir(parents=True, exist_ok=True)
+    # remove shards of previous runs, their number might differ
+    for old_shard in data_path.glob("*.parquet"):
+        old_shard.unlink()
+
+    max_shard_bytes = convert_file_size_to_int(max_shard_size)
+    jobs = []
+    for split, split_ds in dataset.items():
+        num_shards = int(split_ds.data.nbytes / max_shard_bytes) + 1
+        num_shards = max(min(num_shards, len(split_ds)), 1)
+        for index in range(num_shards):
+            shard_path = (
+                data_path / f"{split}-{index:05d}-of-{num_shards:05d}.parquet"
+            )
+            jobs.append((split_ds, num_shards, index, shard_path))
+
+    def write_shard(job) -> Path:
+        split_ds, num_shards, index, shard_path = job
+        shard = split_ds.shard(num_shards, index=index, contiguous=True)
+        # keep the features in the schema metadata, as `push_to_hub` does
+        table = shard.with_format("arrow")[:].replace_schema_metadata(
+            shard.features.arrow_schema.metadata
+        )
+        pq.write_table(
+            table,
+            shard_path,
+            row_group_size=row_group_size,
+            compression=compression,
+        )
+        return shard_path
+
+    with ThreadPoolExecutor(max_workers=max(num_proc, 1)) as executor:
+        return list(executor.map(write_shard, jobs))
+
+
+def remove_hub_parquet(path: str | Path) -> None:
+    """
+    Removes the Hub-ready Parquet shards of a dataset, e.g. those of a
+    previous run when they are not written again, so that stale shards
+    are never uploaded instead of the saved dataset.
+
+    Args:
+        path (str | Path): directory of the dataset.
+    """
+    shutil.rmtree(Path(path) / HUB_DATA_DIR, ignore_errors=True)
+
+
 def load_configs(path: str | Path) -> Config:
     """
     Load config from a JSON file and validate it using Pydantic.
@@ -75,16 +230,26 @@ def create_repo_name(prefix: str, dataset_name: str):
     return f"{prefix}/{dataset_name}"
 
 
-def get_language_variety(dataset: Dataset) -> Optional[str]:
+def get_language_variety(dataset: "Dataset") -> Optional[str]:
+    from src.utils.categorical import class_label_names
+
     if "language_variation" in dataset["train"].features:
-        return dataset["train"]["language_variation"][0]
+        # reads a single row instead of the whole column
+        first_row = dataset["train"].with_format("arrow")[:1]
+        value = first_row.column("language_variation")[0].as_py()
+        names = class_label_names(
+            dataset["train"].features, "language_variation"
+        )
+        if names is not None and value is not None:
+            value = names[value]
+        return value
     return None
 
 
 def dataset_results_path(
     base_path: str | Path,
     task_config: TaskConfig,
-    dataset: Dataset = None,
+    dataset: "Dataset" = None,
 ) -> Path:
     """
     Appends to a base path a random file name.
@@ -106,7 +271,9 @@ def dataset_results_path(
     return base_path / dataset_name
 
     
-def create_dataset_metadata(config: Config, dataset: Dataset):
+def create_dataset_metadata(config: Config, dataset: "Dataset"):
+    from src.utils.stats import dataset_statistics
+
     task_config = config.task
     task_info = task_config.model_dump()
     # Add language variety
@@ -135,9 +302,12 @@ def create_dataset_metadata(config: Config, dataset: Dataset):
         problem_type = "summarization"
     task_info["problem_type"] = problem_type
 
+    # Computed with Arrow kernels, the columns are never converted to lists
+    statistics = dataset_statistics(dataset)
+
     # Add num labels and labels if classification
     if problem_type == "classification":
-        label_set = list(set(dataset["test"]["label"]))
+        label_set = list(statistics["test"]["label_distribution"])
         task_info["num_labels"] = len(label_set)
         label_mapping = config.mapping.get("label")
         if label_mapping is None and len(label_set) == 2:
@@ -148,5 +318,6 @@ def create_dataset_metadata(config: Config, dataset: Dataset):
                 label_set = [label_mapping[label] for label in label_set]
 
         task_info["labels"] = label_set
-            
+
+    task_info["statistics"] = statistics
     return task_info
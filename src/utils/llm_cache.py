@@ -0,0 +1,338 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    Literal,
+    Optional,
+    Union,
+)
+
+from src.utils.logging import get_logger
+
+_logger = get_logger(__name__)
+
+CacheMode = Literal["read_write", "replay", "off"]
+
+DEFAULT_LLM_CACHE_PATH = Path(
+    os.environ.get("IBERBENCH_LLM_CACHE_PATH", ".llm_cache")
+)
+DEFAULT_LLM_CACHE_MODE: CacheMode = os.environ.get(
+    "IBERBENCH_LLM_CACHE_MODE", "read_write"
+)
+DEFAULT_LLM_CACHE_SIZE = "1GB"
+
+_SIZE_UNITS = {"KB": 2**10, "MB": 2**20, "GB": 2**30}
+
+# looked up responses that are not cached, told apart from cached Nones
+_MISS = object()
+
+# awaited by the LangChain adapter before a request that misses the cache
+_on_miss: ContextVar[Optional[Callable[[], Awaitable[None]]]] = ContextVar(
+    "llm_cache_on_miss", default=None
+)
+
+
+class CacheMissError(LookupError):
+    """An LLM response that is not cached was requested in replay mode."""
+
+
+def _size_to_bytes(size: Union[str, int]) -> int:
+    if isinstance(size, int):
+        return size
+    size = size.strip().upper()
+    for unit, factor in _SIZE_UNITS.items():
+        if size.endswith(unit):
+            return int(float(size[: -len(unit)]) * factor)
+    return int(size)
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """
+    Persistent cache of LLM responses, content-addressed by the hash of the
+    request: model, parameters, tool schemas and the hash of the prompt.
+    Each response is a JSON file under `path`; when the cache grows over
+    `max_size`, the least recently used responses are evicted.
+
+    Modes:
+        - "read_write": cached responses are reused and new ones stored.
+        - "replay": only cached responses are used, misses raise
+          `CacheMissError`, so runs can be replayed offline.
+        - "off": the cache is bypassed.
+
+    Attributes:
+        path (Path): Directory of the cache.
+        max_size (int): Maximum size of the cache in bytes.
+        mode (str): One of "read_write", "replay" or "off".
+        hits (int): Responses served from the cache.
+        misses (int): Responses not found in the cache.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = DEFAULT_LLM_CACHE_PATH,
+        max_size: Union[str, int] = DEFAULT_LLM_CACHE_SIZE,
+        mode: CacheMode = DEFAULT_LLM_CACHE_MODE,
+    ):
+        if mode not in ("read_write", "replay", "off"):
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+        self.path = Path(path)
+        self.max_size = _size_to_bytes(max_size)
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def key(prompt: str, **request: Any) -> str:
+        """
+        Hashes a request into its cache key.
+
+        Args:
+            prompt (str): The prompt, or the serialized messages.
+            **request: The rest of the request: model, parameters, tools...
+
+        Returns:
+            str: The cache key.
+        """
+        request["prompt_hash"] = _sha256(prompt)
+        return _sha256(json.dumps(request, sort_keys=True, default=str))
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / key[:2] / f"{key}.json"
+
+    def _lookup(self, key: str) -> Any:
+        if self.mode == "off":
+            return _MISS
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, "r") as f:
+                value = json.load(f)["response"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            with self._lock:
+                self.misses += 1
+            if self.mode == "replay":
+                raise CacheMissError(f"LLM response {key} is not cached")
+            return _MISS
+
+        # the modification time tracks the last use, for the eviction
+        os.utime(entry_path)
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Looks up a response, counting the hit or miss.
+
+        Args:
+            key (str): The cache key of the request.
+
+        Returns:
+            Optional[Any]: The cached response, None if it is not cached.
+
+        Raises:
+            CacheMissError: if the response is not cached in replay mode.
+        """
+        value = self._lookup(key)
+        return None if value is _MISS else value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Stores a response, evicting the least recently used ones if the
+        cache grows over its maximum size. Nothing is stored in replay or
+        off modes.
+
+        Args:
+            key (str): The cache key of the request.
+            value (Any): The JSON-serializable response.
+        """
+        if self.mode != "read_write":
+            return
+        entry_path = self._entry_path(key)
+        entry_path.parent.mkdir(parents=True, exist_ok=True)
+        old_size = entry_path.stat().st_size if entry_path.exists() else 0
+        # written aside and renamed, concurrent readers never see half files
+        tmp_path = entry_path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"response": value}, f)
+        os.replace(tmp_path, entry_path)
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._disk_size()
+            else:
+                self._size += entry_path.stat().st_size - old_size
+            if self._size > self.max_size:
+                self._evict()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached response of a request, computing and storing it
+        on a miss. A None response is cached like any other.
+
+        Args:
+            key (str): The cache key of the request.
+            compute (Callable[[], Any]): Computes the response.
+
+        Returns:
+            Any: The response.
+        """
+        value = self._lookup(key)
+        if value is _MISS:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def _entries(self):
+        return self.path.glob("*/*.json")
+
+    def _disk_size(self) -> int:
+        return sum(entry.stat().st_size for entry in self._entries())
+
+    def _evict(self) -> None:
+        # down to 90% of the maximum size, so evictions are not per write
+        target = self.max_size * 0.9
+        entries = sorted(
+            ((entry.stat(), entry) for entry in self._entries()),
+            key=lambda item: item[0].st_mtime,
+        )
+        for stat, entry in entries:
+            if self._size <= target:
+                break
+            entry.unlink(missing_ok=True)
+            self._size -= stat.st_size
+        _logger.info(f"Evicted LLM cache entries down to {self._size} bytes")
+
+    def clear(self) -> None:
+        """
+        Removes every cached response. The hit and miss counters are kept.
+        """
+        with self._lock:
+            for entry_dir in self.path.glob("*"):
+                if entry_dir.is_dir():
+                    shutil.rmtree(entry_dir, ignore_errors=True)
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the hit and miss counters.
+
+        Returns:
+            Dict[str, int]: hits, misses and requests.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "requests": self.hits + self.misses,
+        }
+
+
+@contextmanager
+def on_cache_miss(callback: Callable[[], Awaitable[None]]) -> Iterator[None]:
+    """
+    Awaits `callback` before each async request of the block that misses
+    the LangChain cache, i.e. before each request actually sent, e.g. to
+    take it from a rate limiter.
+
+    Args:
+        callback (Callable[[], Awaitable[None]]): the callback.
+    """
+    token = _on_miss.set(callback)
+    try:
+        yield
+    finally:
+        _on_miss.reset(token)
+
+
+def langchain_cache(cache: LLMCache):
+    """
+    Adapts an `LLMCache` to the LangChain cache interface, to be passed as
+    `cache` to a chat model. LangChain's `llm_string` holds the model, its
+    parameters and the bound tool schemas; the response messages (with
+    their tool calls) are stored as dictionaries.
+
+    Args:
+        cache (LLMCache): the cache.
+
+    Returns:
+        BaseCache: the LangChain cache.
+    """
+    from langchain_core.caches import BaseCache
+    from langchain_core.messages import messages_from_dict, messages_to_dict
+    from langchain_core.outputs import ChatGeneration
+
+    class LangChainLLMCache(BaseCache):
+        def lookup(self, prompt: str, llm_string: str):
+            value = cache.get(cache.key(prompt, llm=llm_string))
+            if value is None:
+                return None
+            messages = messages_from_dict(value)
+            # flags the hit for the telemetry of the call
+            for message in messages:
+                message.response_metadata["from_cache"] = True
+            return [ChatGeneration(message=message) for message in messages]
+
+        async def alookup(self, prompt: str, llm_string: str):
+            value = await super().alookup(prompt, llm_string)
+            callback = _on_miss.get()
+            if value is None and callback is not None:
+                await callback()
+            return value
+
+        def update(self, prompt: str, llm_string: str, return_val) -> None:
+            cache.put(
+                cache.key(prompt, llm=llm_string),
+                messages_to_dict(
+                    [generation.message for generation in return_val]
+                ),
+            )
+
+        def clear(self, **kwargs: Any) -> None:
+            cache.clear()
+
+    return LangChainLLMCache()
+
+
+_llm_cache: Optional[LLMCache] = None
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Returns the process-wide LLM response cache, configured from the
+    `IBERBENCH_LLM_CACHE_PATH` and `IBERBENCH_LLM_CACHE_MODE` environment
+    variables unless `set_llm_cache` replaced it.
+
+    Returns:
+        LLMCache: the shared cache.
+    """
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
+
+
+def set_llm_cache(cache: Optional[LLMCache]) -> None:
+    """
+    Replaces the process-wide LLM response cache. None restores the default
+    one.
+
+    Args:
+        cache (Optional[LLMCache]): the cache to be used.
+    """
+    global _llm_cache
+    _llm_cache = cache
@@ -1,10 +1,33 @@
+import atexit
+import copy
+import json
 import logging
+import multiprocessing
+import os
 import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from queue import SimpleQueue
+from typing import Any, Dict, Iterator, List, Optional
 
 _time = datetime.now()
 
+# directory of the run, inherited through the environment by the workers,
+# which would otherwise name their own directory when spawned
+RUN_LOG_DIR_ENV = "IBERBENCH_RUN_LOG_DIR"
+os.environ.setdefault(
+    RUN_LOG_DIR_ENV,
+    str(
+        Path("logs")
+        .joinpath(_time.strftime("%Y_%m_%d"), _time.strftime("%H_%M_%S"))
+        .absolute()
+    ),
+)
+
 COLORS = {
     "grey": "\x1b[38;20m",
     "yellow": "\x1b[33;20m",
@@ -16,6 +39,25 @@ COLORS = {
     "reset": "\x1b[0m",
 }
 
+LOG_FORMAT = "[%(asctime)s] - %(levelname)s - %(context)s%(message)s"
+LOG_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+LOG_FILE = "text-machina.log"
+JSON_LOG_FILE = "text-machina.jsonl"
+
+# "json" writes the log file as JSON lines instead of text
+DEFAULT_LOG_FORMAT = os.environ.get("IBERBENCH_LOG_FORMAT", "text")
+
+# context of the records: the process-wide fields set by `set_log_context`,
+# e.g. in a worker initializer, and those of the enclosing `log_context`
+_process_context: Dict[str, Any] = {}
+_context: ContextVar[Dict[str, Any]] = ContextVar("log_context", default={})
+
+_setup_lock = threading.Lock()
+_queue_handler: Optional["_QueueHandler"] = None
+_handlers: List[logging.Handler] = []
+_listener: Optional[QueueListener] = None
+_listener_pid: Optional[int] = None
+
 
 def log(logger_method, text: str, color: str) -> str:
     """
@@ -32,9 +74,164 @@ def log(logger_method, text: str, color: str) -> str:
     return logger_method(COLORS[color] + text + COLORS["reset"])
 
 
+def run_log_dir() -> Path:
+    """
+    Returns the directory of the logs and reports of this run, shared by
+    its worker processes.
+
+    Returns:
+        Path: the directory, `logs/<date>/<time>` unless
+            `IBERBENCH_RUN_LOG_DIR` sets it.
+    """
+    return Path(os.environ[RUN_LOG_DIR_ENV])
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formats each record as a JSON object in a line: time, level, logger,
+    process, the fields of its log context and the message.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "process": record.processName,
+            "pid": record.process,
+            **getattr(record, "log_context", {}),
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _ContextFilter(logging.Filter):
+    # runs in the thread logging the record, where its context is set
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = {**_process_context, **_context.get()}
+        record.log_context = fields
+        record.context = (
+            "[" + " ".join(f"{k}={v}" for k, v in fields.items()) + "] "
+            if fields
+            else ""
+        )
+        return True
+
+
+_EXCEPTION_FORMATTER = logging.Formatter()
+
+
+class _QueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # as `QueueHandler.prepare`, but the traceback is kept apart from
+        # the message, for the `exception` of the JSON lines
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _EXCEPTION_FORMATTER.formatException(
+                record.exc_info
+            )
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # the writer thread does not survive a fork, and pool workers exit
+        # without flushing a queue, so workers write their records directly
+        if _listener is not None and os.getpid() == _listener_pid:
+            self.queue.put_nowait(record)
+        else:
+            for handler in _handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+def _build_handlers(log_dir: Path, json_lines: bool) -> List[logging.Handler]:
+    formatter = logging.Formatter(LOG_FORMAT, datefmt=LOG_DATE_FORMAT)
+    log_dir.mkdir(parents=True, exist_ok=True)
+    if json_lines:
+        fh = logging.FileHandler(log_dir / JSON_LOG_FILE, encoding="utf-8")
+        fh.setFormatter(JsonLinesFormatter())
+    else:
+        fh = logging.FileHandler(log_dir / LOG_FILE, encoding="utf-8")
+        fh.setFormatter(formatter)
+
+    sh = logging.StreamHandler(sys.stdout)
+    sh.setFormatter(formatter)
+    return [sh, fh]
+
+
+def stop_logging() -> None:
+    """
+    Stops the background writer, once the records queued so far are
+    written. Records logged afterwards are written directly. Registered to
+    run at exit.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+        for handler in _handlers:
+            # as in `logging.shutdown`, streams might be closed at exit
+            try:
+                handler.flush()
+            except (OSError, ValueError):
+                pass
+
+
+def configure_logging(
+    json_lines: Optional[bool] = None, log_dir: Optional[Path] = None
+) -> None:
+    """
+    Sets up the logging of the process: the loggers of `get_logger` put
+    their records on a queue, and a single background thread writes them
+    to stdout and to the log file of the run, so logging does not block
+    the hot paths nor contend for the file. Called again, it replaces the
+    previous setup, flushing it first.
+
+    Args:
+        json_lines (Optional[bool]): write the log file as JSON lines,
+            `text-machina.jsonl`, instead of text. If None, it is enabled
+            by `IBERBENCH_LOG_FORMAT=json`.
+        log_dir (Optional[Path]): directory of the log file,
+            `run_log_dir()` if None.
+    """
+    global _queue_handler, _handlers, _listener, _listener_pid
+    if json_lines is None:
+        json_lines = DEFAULT_LOG_FORMAT == "json"
+    stop_logging()
+    with _setup_lock:
+        for handler in _handlers:
+            handler.close()
+        _handlers = _build_handlers(log_dir or run_log_dir(), json_lines)
+        if _queue_handler is None:
+            _queue_handler = _QueueHandler(SimpleQueue())
+            _queue_handler.addFilter(_ContextFilter())
+            atexit.register(stop_logging)
+
+        # spawned workers exit without flushing a queue either, they write
+        # their records directly
+        if multiprocessing.parent_process() is None:
+            _listener = QueueListener(
+                _queue_handler.queue, *_handlers, respect_handler_level=True
+            )
+            _listener_pid = os.getpid()
+            _listener.start()
+
+
 def get_logger(module_name: str) -> logging.Logger:
     """
-    Returns the logger used across modules.
+    Returns the logger used across modules. Its records go through the
+    queue of the process, set up on the first call; calling it again for a
+    module returns the same logger without adding handlers.
 
     Args:
         module_name (str): name of the module.
@@ -42,33 +239,47 @@ def get_logger(module_name: str) -> logging.Logger:
     Returns:
         logging.Logger: the logger.
     """
+    if _queue_handler is None:
+        configure_logging()
     logger = logging.getLogger(module_name)
     logger.setLevel(logging.INFO)
+    if _queue_handler not in logger.handlers:
+        logger.addHandler(_queue_handler)
+    return logger
 
-    formatter = logging.Formatter(
-        "[%(asctime)s] - %(levelname)s - %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-    )
 
-    logfile = (
-        Path("logs")
-        .joinpath(
-            _time.strftime("%Y_%m_%d"),
-            _time.strftime("%H_%M_%S"),
-            "text-machina.log",
-        )
-        .absolute()
-    )
+@contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """
+    Adds fields, e.g. the config name and the stage, to the records logged
+    within the block, including those of its asyncio tasks and forked
+    workers.
 
-    logfile.parent.mkdir(parents=True, exist_ok=True)
+    Args:
+        **fields: the fields of the context.
 
-    fh = logging.FileHandler(logfile)
-    fh.setFormatter(formatter)
+    Example:
+        >>> with log_context(config="tass2020", stage="normalize"):
+        ...     _logger.info("Cleaning dataset")
+        [2025-01-01 10:00:00] - INFO - [config=tass2020 stage=normalize] ...
+    """
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
 
-    sh = logging.StreamHandler(sys.stdout)
-    sh.setFormatter(formatter)
 
-    logger.addHandler(sh)
-    logger.addHandler(fh)
+def set_log_context(**fields: Any) -> None:
+    """
+    Sets fields of the context of every record of the process, e.g. from
+    the initializer of a pool worker. A None value removes the field.
 
-    return logger
+    Args:
+        **fields: the fields of the context.
+    """
+    for name, value in fields.items():
+        if value is None:
+            _process_context.pop(name, None)
+        else:
+            _process_context[name] = value
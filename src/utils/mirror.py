@@ -0,0 +1,187 @@
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from src.utils.http import get_hf_api
+from src.utils.io import load_configs, read_json, save_json
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+_logger = get_logger(__name__)
+
+DEFAULT_MIRROR_PATH = Path(os.environ.get("IBERBENCH_MIRROR_PATH", "mirror"))
+MANIFEST_NAME = "manifest.json"
+
+
+def source_key(repo_id: str, subset: str = "") -> str:
+    """
+    Key used to identify an upstream source in the mirror manifest.
+
+    Args:
+        repo_id (str): HuggingFace dataset repository id.
+        subset (str): dataset subset (configuration) name, if any.
+
+    Returns:
+        str: the manifest key.
+    """
+    return f"{repo_id}::{subset or 'default'}"
+
+
+def collect_hf_sources(config_path: Path) -> List[Tuple[str, str, str]]:
+    """
+    Collects every HuggingFace source referenced by the configs under
+    `config_path`, without duplicates.
+
+    Args:
+        config_path (Path): a config file or a directory of configs.
+
+    Returns:
+        List[Tuple[str, str, str]]: (repo_id, subset, revision) triplets.
+    """
+    config_path = Path(config_path)
+    files = (
+        [config_path]
+        if config_path.is_file()
+        else sorted(config_path.rglob("*.json"))
+    )
+    sources = {}
+    for file in files:
+        dataset_config = load_configs(file).dataset
+        if not dataset_config.hf_repo_id:
+            continue
+        key = source_key(dataset_config.hf_repo_id, dataset_config.hf_subset)
+        sources[key] = (
+            dataset_config.hf_repo_id,
+            dataset_config.hf_subset,
+            dataset_config.hf_revision,
+        )
+    return list(sources.values())
+
+
+def load_manifest(mirror_path: Path = DEFAULT_MIRROR_PATH) -> Dict[str, dict]:
+    """
+    Loads the manifest of the local mirror.
+
+    Args:
+        mirror_path (Path): root of the local mirror.
+
+    Returns:
+        Dict[str, dict]: manifest entries by source key, empty if the
+            mirror does not exist.
+    """
+    manifest_path = Path(mirror_path) / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    return read_json(manifest_path)
+
+
+def mirror_source(
+    repo_id: str,
+    subset: str = "",
+    revision: str = "",
+    mirror_path: Path = DEFAULT_MIRROR_PATH,
+    refresh: bool = False,
+) -> dict:
+    """
+    Snapshots all the splits of a HuggingFace dataset into Parquet files
+    in the local mirror, pinned by the resolved commit sha.
+
+    Args:
+        repo_id (str): HuggingFace dataset repository id.
+        subset (str): dataset subset (configuration) name, if any.
+        revision (str): branch, tag or commit to pin. Latest if empty.
+        mirror_path (Path): root of the local mirror.
+        refresh (bool): snapshot again even if the revision is mirrored.
+
+    Returns:
+        dict: the manifest entry of the mirrored source.
+    """
+    from datasets import load_dataset
+
+    mirror_path = Path(mirror_path)
+    manifest = load_manifest(mirror_path)
+    key = source_key(repo_id, subset)
+
+    sha = get_hf_api().dataset_info(repo_id, revision=revision or None).sha
+    entry = manifest.get(key)
+    if (
+        entry
+        and entry["revision"] == sha
+        and not refresh
+        and all(
+            (mirror_path / split_file).exists()
+            for split_file in entry["splits"].values()
+        )
+    ):
+        _logger.info(f"{key} already mirrored at revision {sha}")
+        return entry
+
+    _logger.info(f"Mirroring {key} at revision {sha}")
+    dataset = load_dataset(
+        path=repo_id,
+        name=subset or None,
+        revision=sha,
+        trust_remote_code=True,
+    )
+
+    source_dir = Path(repo_id) / (subset or "default") / sha
+    (mirror_path / source_dir).mkdir(parents=True, exist_ok=True)
+    splits = {}
+    for split, split_ds in dataset.items():
+        split_file = source_dir / f"{split}.parquet"
+        split_ds.to_parquet(mirror_path / split_file)
+        splits[split] = str(split_file)
+
+    entry = {
+        "repo_id": repo_id,
+        "subset": subset,
+        "pinned": revision,
+        "revision": sha,
+        "splits": splits,
+    }
+    # re-read to not lose entries written meanwhile by other runs
+    manifest = load_manifest(mirror_path)
+    manifest[key] = entry
+    save_json(mirror_path / MANIFEST_NAME, manifest)
+    return entry
+
+
+def read_mirrored_split(
+    repo_id: str,
+    subset: str,
+    split: str,
+    revision: str = "",
+    mirror_path: Path = DEFAULT_MIRROR_PATH,
+) -> Optional["pa.Table"]:
+    """
+    Reads a split from the local mirror, memory-mapping the Parquet file.
+
+    Args:
+        repo_id (str): HuggingFace dataset repository id.
+        subset (str): dataset subset (configuration) name, if any.
+        split (str): split name.
+        revision (str): pinned revision. Any mirrored revision if empty.
+        mirror_path (Path): root of the local mirror.
+
+    Returns:
+        Optional[pa.Table]: the split, or None if it is not mirrored.
+    """
+    entry = load_manifest(mirror_path).get(source_key(repo_id, subset))
+    if entry is None or split not in entry["splits"]:
+        return None
+    if revision and revision not in (entry["revision"], entry["pinned"]):
+        _logger.warning(
+            f"Mirror of {repo_id} is at {entry['revision']}, not {revision}"
+        )
+        return None
+
+    split_file = Path(mirror_path) / entry["splits"][split]
+    if not split_file.exists():
+        return None
+
+    import pyarrow.parquet as pq
+
+    _logger.info(f"Reading {split} split of {repo_id} from {split_file}")
+    return pq.read_table(split_file, memory_map=True)
@@ -1,11 +1,67 @@
+import asyncio
+import os
 import time
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import UnstructuredURLLoader
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 
-from src.models.model_card_config import DatasetCard
+from src.models.model_card_config import (
+    DEFAULT_FIELD_VALUES,
+    FIELD_GROUPS,
+    DatasetCard,
+    dataset_card_subset,
+    field_group_query,
+)
+from src.utils.extractors import EXTRACTOR_NAME, extract_text
+from src.utils.llm_cache import (
+    CacheMissError,
+    LLMCache,
+    get_llm_cache,
+    langchain_cache,
+    on_cache_miss,
+)
+from src.utils.logging import get_logger
+from src.utils.rate_limit import (
+    DEFAULT_REQUESTS_PER_MINUTE,
+    DEFAULT_TOKENS_PER_MINUTE,
+    RateLimiter,
+)
+from src.utils.retrieval import DEFAULT_PASSAGE_TOKENS, DEFAULT_TOP_K, BM25
+from src.utils.telemetry import (
+    get_telemetry,
+    openai_async_http_client,
+    openai_http_client,
+)
+from src.utils.tokens import (
+    DEFAULT_CHUNK_OVERLAP_TOKENS,
+    DEFAULT_CHUNK_TOKENS,
+    count_tokens,
+    token_length_function,
+)
+from src.utils.url_cache import get_url_cache
+
+_logger = get_logger(__name__)
+
+# model extracting the dataset card fields
+CARD_MODEL = "gpt-4o"
+
+# rough estimate of the response tokens, for the rate limiter
+OUTPUT_TOKENS_PER_FIELD = 50
+
+# chunks sent to the LLM at the same time
+DEFAULT_MAX_CONCURRENCY = 8
+
+EXTRACTION_PROMPT = ChatPromptTemplate.from_template(
+    """Extract information from the provided text to fill a dataset card. 
+        Be thorough and comprehensive in your extraction.
+        For any field where information isn't available in the text, use "[More Information Needed]".
+        
+        TEXT:
+        {text}
+        """
+)
 
 
 def populate_template(dataset_card: DatasetCard):
@@ -85,26 +141,40 @@ def populate_template(dataset_card: DatasetCard):
 def load_content_from_urls(urls: list):
     """Load and concatenate content from multiple URLs."""
     print(f"Loading content from {len(urls)} URLs...")
-    loader = UnstructuredURLLoader(urls=urls)
-    docs = loader.load()
+    # each URL is fetched and parsed once per run, and revalidated with the
+    # local copy across runs
+    url_cache = get_url_cache()
+    contents = []
+    for url in urls:
+        try:
+            contents.append(
+                url_cache.text(url, EXTRACTOR_NAME, extract_text)
+            )
+        except Exception as e:
+            print(f"Error fetching or processing {url}, exception: {e}")
 
-    if not docs:
+    if not contents:
         return None
 
     # Concatenate all documents' content
-    all_content = "\n\n".join([doc.page_content for doc in docs])
+    all_content = "\n\n".join(contents)
     print(
-        f"Loaded {len(docs)} documents, total content length: {len(all_content)}"
+        f"Loaded {len(contents)} documents, total content length: {len(all_content)}"
     )
     return all_content
 
 
-def split_content_into_chunks(content: str, chunk_size=6000, chunk_overlap=200):
-    """Split content into manageable chunks for processing."""
+def split_content_into_chunks(
+    content: str,
+    chunk_size=DEFAULT_CHUNK_TOKENS,
+    chunk_overlap=DEFAULT_CHUNK_OVERLAP_TOKENS,
+    model: str = CARD_MODEL,
+):
+    """Split content into chunks of at most `chunk_size` model tokens."""
     text_splitter = RecursiveCharacterTextSplitter(
         chunk_size=chunk_size,
         chunk_overlap=chunk_overlap,
-        length_function=len,
+        length_function=token_length_function(model),
     )
     chunks = text_splitter.split_text(content)
     print(f"Split content into {len(chunks)} chunks")
@@ -150,17 +220,9 @@ def update_dataset_card(dataset_card, extracted_data, all_fields):
             new_value = extracted_data[field]
 
             # Only update if the new value is meaningful and current value is default/empty
-            is_current_default = (
-                current_value == ""
-                or current_value == "Dataset ID"
-                or current_value == "[More Information Needed]"
-            )
+            is_current_default = current_value in DEFAULT_FIELD_VALUES
 
-            is_new_meaningful = (
-                new_value != ""
-                and new_value != "Dataset ID"
-                and new_value != "[More Information Needed]"
-            )
+            is_new_meaningful = new_value not in DEFAULT_FIELD_VALUES
 
             if is_current_default and is_new_meaningful:
                 print(
@@ -172,23 +234,23 @@ def update_dataset_card(dataset_card, extracted_data, all_fields):
     return updates_made
 
 
+def missing_fields(dataset_card, all_fields) -> List[str]:
+    """Fields of the dataset card that still have their default value."""
+    return [
+        field
+        for field in all_fields
+        if getattr(dataset_card, field) in DEFAULT_FIELD_VALUES
+    ]
+
+
 def process_chunk(chunk_text, structured_llm, dataset_card, all_fields):
     """Process a single content chunk and update the dataset card."""
-    # Create a prompt for extracting fields
-    prompt = ChatPromptTemplate.from_template(
-        """Extract information from the provided text to fill a dataset card. 
-        Be thorough and comprehensive in your extraction.
-        For any field where information isn't available in the text, use "[More Information Needed]".
-        
-        TEXT:
-        {text}
-        """
-    )
-
     try:
         # Get structured output
-        chain = prompt | structured_llm
-        response = chain.invoke({"text": chunk_text})
+        chain = EXTRACTION_PROMPT | structured_llm
+        with get_telemetry().track(CARD_MODEL) as call:
+            response = chain.invoke({"text": chunk_text})
+            call.record_message(response)
 
         # Extract data from response
         extracted_data = extract_data_from_response(response)
@@ -207,39 +269,306 @@ def process_chunk(chunk_text, structured_llm, dataset_card, all_fields):
         return 0
 
 
-def generate_dataset_card_from_urls(urls: list):
-    """Generate a dataset card by loading and processing content from multiple URLs."""
+async def extract_chunk(
+    chunk_text: str,
+    structured_llm,
+    rate_limiter: RateLimiter,
+    num_fields: int = len(DatasetCard.model_fields),
+) -> Optional[dict]:
+    """Extract the dataset card fields of a chunk with the async client."""
+
+    throttled = 0.0
+
+    # cached responses are not requests, only misses are rate limited
+    async def acquire():
+        nonlocal throttled
+        start = time.perf_counter()
+        await rate_limiter.acquire(
+            count_tokens(chunk_text, CARD_MODEL)
+            + num_fields * OUTPUT_TOKENS_PER_FIELD
+        )
+        throttled = time.perf_counter() - start
+
+    try:
+        chain = EXTRACTION_PROMPT | structured_llm
+        try:
+            with get_telemetry().track(CARD_MODEL) as call:
+                with on_cache_miss(acquire):
+                    response = await chain.ainvoke({"text": chunk_text})
+                call.record_message(response)
+        finally:
+            # the latency of the request, without the rate limiter wait
+            call.latency -= throttled
+        return extract_data_from_response(response)
+
+    except CacheMissError:
+        raise
+    except Exception as e:
+        print(f"Error processing chunk: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return None
+
+
+async def extract_chunks(
+    chunks: List[str],
+    structured_llm,
+    rate_limiter: RateLimiter,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    num_fields: int = len(DatasetCard.model_fields),
+) -> List[Optional[dict]]:
+    """Extract the fields of all the chunks concurrently, in chunk order."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def bounded_extract(i: int, chunk_text: str) -> Optional[dict]:
+        async with semaphore:
+            _logger.debug(f"Processing chunk {i+1}/{len(chunks)}")
+            return await extract_chunk(
+                chunk_text, structured_llm, rate_limiter, num_fields
+            )
+
+    return await asyncio.gather(
+        *(bounded_extract(i, chunk) for i, chunk in enumerate(chunks))
+    )
+
+
+def merge_extractions(
+    dataset_card, extractions: List[Optional[dict]], all_fields
+) -> int:
+    """
+    Merge the extractions of the chunks into the dataset card in chunk
+    order, so the result does not depend on which request finished first.
+    """
+    return sum(
+        update_dataset_card(dataset_card, extracted_data, all_fields)
+        for extracted_data in extractions
+        if extracted_data
+    )
+
+
+async def extract_missing_fields(
+    dataset_card,
+    chunks: List[str],
+    llm,
+    rate_limiter: RateLimiter,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> int:
+    """
+    Fills the fields of the dataset card that are still missing, processing
+    the chunks in waves of `max_concurrency` concurrent requests. Each wave
+    only asks for the fields missing after the previous ones, and no more
+    chunks are sent once every field is filled.
+    """
+    total_updates = 0
+    all_fields = list(DatasetCard.model_fields)
+    for start in range(0, len(chunks), max_concurrency):
+        missing = missing_fields(dataset_card, all_fields)
+        if not missing:
+            _logger.info(
+                f"All fields filled, skipping {len(chunks) - start} remaining"
+                " chunks"
+            )
+            break
+
+        _logger.info(f"Extracting {len(missing)} missing fields")
+        structured_llm = llm.bind_tools([dataset_card_subset(tuple(missing))])
+        extractions = await extract_chunks(
+            chunks[start : start + max_concurrency],
+            structured_llm,
+            rate_limiter,
+            max_concurrency,
+            num_fields=len(missing),
+        )
+        total_updates += merge_extractions(dataset_card, extractions, missing)
+    return total_updates
+
+
+def pack_passages(
+    passages: List[str],
+    indices: Iterable[int],
+    chunk_tokens: int = DEFAULT_CHUNK_TOKENS,
+) -> List[str]:
+    """
+    Pack the selected passages, in document order, into chunks of up to
+    `chunk_tokens` tokens.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for i in sorted(set(indices)):
+        passage_tokens = count_tokens(passages[i], CARD_MODEL)
+        if current and current_tokens + passage_tokens > chunk_tokens:
+            chunks.append("\n\n".join(current))
+            current, current_tokens = [], 0
+        current.append(passages[i])
+        current_tokens += passage_tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+def group_chunks(
+    dataset_card, passages: List[str], top_k: int = DEFAULT_TOP_K
+) -> Dict[str, Tuple[Tuple[str, ...], List[str]]]:
+    """
+    Select, for each group with missing fields, the `top_k` passages most
+    relevant to them (ranked by BM25 against the terms and descriptions of
+    the fields), packed into chunks. Groups are kept in `FIELD_GROUPS`
+    order.
+    """
+    index = BM25(passages)
+    groups = {}
+    for group, fields in FIELD_GROUPS.items():
+        fields = tuple(missing_fields(dataset_card, fields))
+        if not fields:
+            continue
+        selected = index.top_k(field_group_query(group, fields), top_k)
+        groups[group] = (fields, pack_passages(passages, selected))
+        _logger.info(
+            f"Selected {len(groups[group][1])} chunks of {group} fields"
+        )
+    return groups
+
+
+async def extract_fields_by_group(
+    dataset_card,
+    passages: List[str],
+    llm,
+    rate_limiter: RateLimiter,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    top_k: int = DEFAULT_TOP_K,
+) -> int:
+    """
+    Fills the missing fields of the dataset card group by group, sending
+    the LLM only the chunks selected by `group_chunks` instead of the
+    whole content. The groups are extracted concurrently and, as they
+    fill disjoint fields, each chunk is merged as soon as it is extracted.
+    Each chunk only asks for the fields of its group still missing, and
+    no more chunks of a group are sent once its fields are filled.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def extract_group(fields: Tuple[str, ...], chunks: List[str]):
+        updates = 0
+        for i, chunk_text in enumerate(chunks):
+            missing = missing_fields(dataset_card, fields)
+            if not missing:
+                _logger.info(
+                    f"All fields of the group filled, skipping"
+                    f" {len(chunks) - i} remaining chunks"
+                )
+                break
+
+            structured_llm = llm.bind_tools(
+                [dataset_card_subset(tuple(missing))]
+            )
+            async with semaphore:
+                extraction = await extract_chunk(
+                    chunk_text, structured_llm, rate_limiter, len(missing)
+                )
+            updates += merge_extractions(dataset_card, [extraction], missing)
+        return updates
+
+    groups = group_chunks(dataset_card, passages, top_k)
+    results = await asyncio.gather(
+        *(extract_group(fields, chunks) for fields, chunks in groups.values())
+    )
+    return sum(results)
+
+
+def source_card_key(urls: Iterable[str]) -> Tuple[str, ...]:
+    """Key of the source card shared by the configs with the same URLs."""
+    return tuple(sorted(set(urls)))
+
+
+def format_splits(splits: Dict[str, int]) -> str:
+    """Describe the number of examples of each split."""
+    return ", ".join(
+        f"{split}: {num_rows} examples" for split, num_rows in splits.items()
+    )
+
+
+def specialize_dataset_card(
+    source_card: DatasetCard,
+    dataset_id: str,
+    language: str,
+    dataset_details: Optional[dict] = None,
+) -> DatasetCard:
+    """
+    Fill the config-specific fields of a source card, shared by the configs
+    generated from the same URLs: dataset id, language and, when the
+    dataset details are known, its splits and size.
+    """
+    update = {"dataset_id": dataset_id, "languages": language}
+    if dataset_details:
+        update["data_splits"] = format_splits(dataset_details["splits"])
+        update["data_size"] = f"{dataset_details['size']} examples"
+    return source_card.model_copy(update=update)
+
+
+def card_llm(cache: Optional[LLMCache] = None) -> ChatOpenAI:
+    """Chat model of the card extraction, with its responses cached."""
+    cache = cache or get_llm_cache()
+    kwargs = {}
+    if cache.mode == "replay" and "OPENAI_API_KEY" not in os.environ:
+        # never used, every response comes from the cache
+        kwargs["api_key"] = "replay"
+    return ChatOpenAI(
+        model_name=CARD_MODEL,
+        temperature=0,
+        cache=langchain_cache(cache),
+        http_client=openai_http_client(),
+        http_async_client=openai_async_http_client(),
+        **kwargs,
+    )
+
+
+def generate_dataset_card_from_urls(
+    urls: list,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+    tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+    top_k: int = DEFAULT_TOP_K,
+) -> Optional[DatasetCard]:
+    """
+    Generate a dataset card by loading and processing content from multiple
+    URLs. With `top_k`, only the passages most relevant to each group of
+    fields are sent to the LLM; with 0, every chunk is. None if no URL
+    could be fetched.
+    """
     # Load content from all URLs
     all_content = load_content_from_urls(urls)
     if not all_content:
-        return {"error": "Failed to retrieve content from any URL"}
+        _logger.warning("Failed to retrieve content from any URL")
+        return None
 
     # Initialize an empty dataset card
     dataset_card = DatasetCard()
 
-    # Get all field names from DatasetCard
-    all_fields = [
-        f
-        for f in dir(dataset_card)
-        if not f.startswith("_") and not callable(getattr(dataset_card, f))
-    ]
-
-    # Split content into chunks
-    chunks = split_content_into_chunks(all_content)
-
-    # Create LLM with tools
-    llm = ChatOpenAI(model_name="gpt-4o", temperature=0)
-    structured_llm = llm.bind_tools([DatasetCard])
-
-    # Process each chunk
-    total_updates = 0
-    for i, chunk_text in enumerate(chunks):
-        print(f"Processing chunk {i+1}/{len(chunks)} for all fields")
-        updates = process_chunk(
-            chunk_text, structured_llm, dataset_card, all_fields
+    llm = card_llm()
+    rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+    if top_k:
+        # Retrieve the relevant passages of each group of fields
+        passages = split_content_into_chunks(
+            all_content, chunk_size=DEFAULT_PASSAGE_TOKENS
+        )
+        total_updates = asyncio.run(
+            extract_fields_by_group(
+                dataset_card,
+                passages,
+                llm,
+                rate_limiter,
+                max_concurrency,
+                top_k,
+            )
+        )
+    else:
+        # Process every chunk, asking only for the missing fields
+        chunks = split_content_into_chunks(all_content)
+        total_updates = asyncio.run(
+            extract_missing_fields(
+                dataset_card, chunks, llm, rate_limiter, max_concurrency
+            )
         )
-        total_updates += updates
-        time.sleep(1)  # Rate limiting
 
     print(f"Total fields updated: {total_updates}")
     return dataset_card
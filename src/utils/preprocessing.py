@@ -1,4 +1,6 @@
 import json
+import re
+from typing import Callable
 
 from ftfy import fix_text
 
@@ -14,6 +16,19 @@ def clean_labels(labels: str) -> str:
     return labels
 
 
+# the characters `str.split()` splits on, as an explicit class for Arrow's
+# RE2 engine, whose `\s` only matches ASCII whitespace
+WHITESPACE = (
+    "\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003"
+    "\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000"
+)
+_WHITESPACE_CLASS = "".join(f"\\x{{{ord(char):x}}}" for char in WHITESPACE)
+_NON_SPACE_WHITESPACE_CLASS = _WHITESPACE_CLASS.replace("\\x{20}", "")
+
+_URL_PATTERN = re.compile(r"http[s]?://\S+")
+_HTML_ENTITY_PATTERN = re.compile(r"&[a-z]+;")
+
+
 def clean_text(text: str) -> str:
     """
     Cleans a text from datasets
@@ -24,12 +39,8 @@ def clean_text(text: str) -> str:
     Returns:
         str: a cleaned text
     """
-    text = text.replace("\n", " ")
-    text = text.replace("\r", " ")
-    text = text.replace("\t", " ")
-    text = text.replace(":", " ")
-    text = " ".join(text.split())
-    return text
+    # newlines, carriage returns and tabs are split on as any whitespace
+    return " ".join(text.replace(":", " ").split())
 
 
 def clean_url_text(text: str) -> str:
@@ -42,30 +53,113 @@ def clean_url_text(text: str) -> str:
     Returns:
         str: A cleaned text.
     """
-    import re
-
-    # Remove excessive newlines, tabs, and carriage returns
-    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ")
-
-    # Replace non-breaking spaces and other Unicode whitespace
-    text = text.replace("\xa0", " ").replace("\u200b", " ")
+    # Zero-width spaces are taken as whitespace
+    if "\u200b" in text:
+        text = text.replace("\u200b", " ")
 
-    # Remove excessive spaces and normalize
+    # Collapse newlines, tabs, non-breaking spaces and any other whitespace
     text = " ".join(text.split())
 
     # Remove URLs if present within the text
-    text = re.sub(r"http[s]?://\S+", "", text)
+    if "http" in text:
+        text = _URL_PATTERN.sub("", text)
 
     # Remove unnecessary colons (if applicable)
     text = text.replace(":", " ")
 
     # Optional: Remove HTML entities (e.g., &amp; -> &, &lt; -> <)
-    text = re.sub(r"&[a-z]+;", " ", text)
+    if "&" in text:
+        text = _HTML_ENTITY_PATTERN.sub(" ", text)
 
     # Optional: Remove special characters or HTML artifacts
-    text = re.sub(r"[<>]", "", text)
+    return text.replace("<", "").replace(">", "")
+
+
+def _clean_batch(texts, clean: Callable[[str], str], clean_arrow):
+    import pandas as pd
+    import pyarrow as pa
+
+    if isinstance(texts, (pa.Array, pa.ChunkedArray)):
+        return clean_arrow(texts)
+    if isinstance(texts, pd.Series):
+        # Arrow-backed columns: ArrowDtype, and pandas strings on pyarrow
+        if isinstance(texts.dtype, pd.ArrowDtype) or (
+            getattr(texts.dtype, "storage", None) == "pyarrow"
+        ):
+            return pd.Series(
+                pd.array(clean_arrow(pa.array(texts)), dtype=texts.dtype),
+                index=texts.index,
+                name=texts.name,
+            )
+        return texts.map(clean, na_action="ignore")
+    return [None if text is None else clean(text) for text in texts]
+
+
+def _clean_text_arrow(texts):
+    import pyarrow.compute as pc
+
+    # single spaces between words are not replaced
+    texts = pc.replace_substring_regex(
+        texts,
+        pattern=(
+            f"[{_WHITESPACE_CLASS}:]{{2,}}|[{_NON_SPACE_WHITESPACE_CLASS}:]"
+        ),
+        replacement=" ",
+    )
+    return pc.utf8_trim(texts, characters=" ")
 
-    return text
+
+def _clean_url_text_arrow(texts):
+    import pyarrow.compute as pc
+
+    # the steps of `clean_url_text`, each vectorized over the column
+    texts = pc.replace_substring_regex(
+        texts,
+        pattern=(
+            f"[{_WHITESPACE_CLASS}\\x{{200b}}]{{2,}}"
+            f"|[{_NON_SPACE_WHITESPACE_CLASS}\\x{{200b}}]"
+        ),
+        replacement=" ",
+    )
+    texts = pc.utf8_trim(texts, characters=" ")
+    texts = pc.replace_substring_regex(
+        texts, pattern="https?://[^ ]+", replacement=""
+    )
+    texts = pc.replace_substring(texts, pattern=":", replacement=" ")
+    texts = pc.replace_substring_regex(
+        texts, pattern="&[a-z]+;", replacement=" "
+    )
+    return pc.replace_substring_regex(texts, pattern="[<>]", replacement="")
+
+
+def clean_text_batch(texts):
+    """
+    Cleans a column of texts as `clean_text` does. Arrow arrays and
+    Arrow-backed pandas columns are cleaned with vectorized Arrow kernels,
+    other columns element-wise. Nulls are kept.
+
+    Args:
+        texts (Union[pa.Array, pa.ChunkedArray, pd.Series, Iterable[str]]): the texts.
+
+    Returns:
+        Union[pa.Array, pa.ChunkedArray, pd.Series, List[str]]: the cleaned texts, in the same container.
+    """
+    return _clean_batch(texts, clean_text, _clean_text_arrow)
+
+
+def clean_url_text_batch(texts):
+    """
+    Cleans a column of texts extracted from URLs as `clean_url_text` does.
+    Arrow arrays and Arrow-backed pandas columns are cleaned with
+    vectorized Arrow kernels, other columns element-wise. Nulls are kept.
+
+    Args:
+        texts (Union[pa.Array, pa.ChunkedArray, pd.Series, Iterable[str]]): the texts.
+
+    Returns:
+        Union[pa.Array, pa.ChunkedArray, pd.Series, List[str]]: the cleaned texts, in the same container.
+    """
+    return _clean_batch(texts, clean_url_text, _clean_url_text_arrow)
 
 
 def fix_encoding(text: str) -> str:
@@ -0,0 +1,110 @@
+import asyncio
+import os
+import time
+from typing import Callable, Optional
+
+# defaults of the OpenAI rate limits the model card agent keeps under
+DEFAULT_REQUESTS_PER_MINUTE = int(
+    os.environ.get("IBERBENCH_LLM_REQUESTS_PER_MINUTE", 500)
+)
+DEFAULT_TOKENS_PER_MINUTE = int(
+    os.environ.get("IBERBENCH_LLM_TOKENS_PER_MINUTE", 30_000)
+)
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at `rate_per_minute` up to
+    `capacity` tokens.
+
+    Attributes:
+        rate (float): Tokens added per second.
+        capacity (float): Maximum number of tokens, i.e., the burst size.
+        tokens (float): Tokens currently available.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate_per_minute / 60
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self._clock = clock
+        self._updated_at = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` tokens are available. Amounts over the
+        capacity wait for a full bucket.
+
+        Args:
+            amount (float): Tokens to be consumed.
+
+        Returns:
+            float: Seconds to wait, 0 if they are available.
+        """
+        self._refill()
+        missing = min(amount, self.capacity) - self.tokens
+        return max(missing, 0) / self.rate
+
+    def consume(self, amount: float) -> None:
+        """
+        Takes `amount` tokens from the bucket, which might be left in debt
+        by amounts over the capacity.
+
+        Args:
+            amount (float): Tokens to be consumed.
+        """
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Asynchronous rate limiter of requests and tokens per minute, shared by
+    the concurrent requests to an API. Waiting requests are served in
+    arrival order.
+
+    Attributes:
+        requests (TokenBucket): Bucket of requests per minute.
+        tokens (TokenBucket): Bucket of tokens per minute.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.requests = TokenBucket(requests_per_minute, clock=clock)
+        self.tokens = TokenBucket(tokens_per_minute, clock=clock)
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Waits until a request of `tokens` tokens is within the limits and
+        accounts for it.
+
+        Args:
+            tokens (int): Estimated tokens of the request.
+        """
+        async with self._lock:
+            while True:
+                wait = max(
+                    self.requests.wait_time(1), self.tokens.wait_time(tokens)
+                )
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+            self.requests.consume(1)
+            self.tokens.consume(tokens)
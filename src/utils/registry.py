@@ -0,0 +1,61 @@
+import importlib
+from typing import Callable, Dict, Iterator, Mapping, Optional
+
+
+class LazyRegistry(Mapping):
+    """
+    A name -> callable registry whose entries are imported on demand.
+
+    Entries are registered as "module:attribute" strings, so registering a
+    function does not import its module (nor its dependencies) until the
+    entry is looked up for the first time.
+
+    Attributes:
+        package (Optional[str]): anchor for relative module paths.
+
+    Example:
+        registry = LazyRegistry({"hf_repo": ".hf_repo_norm:hf_repo_normalizer"}, package=__name__)
+        normalize_fn = registry["hf_repo"]
+    """
+
+    def __init__(
+        self, entries: Dict[str, str], package: Optional[str] = None
+    ):
+        """
+        Initializes the registry.
+
+        Args:
+            entries (Dict[str, str]): "module:attribute" targets by name.
+            package (Optional[str]): anchor for relative module paths.
+        """
+        self.package = package
+        self._targets: Dict[str, str] = {}
+        self._loaded: Dict[str, Callable] = {}
+        for name, target in entries.items():
+            self.register(name, target)
+
+    def register(self, name: str, target: str) -> None:
+        """
+        Registers a new entry, replacing any previous one with that name.
+
+        Args:
+            name (str): name to look the entry up.
+            target (str): "module:attribute" path of the callable.
+        """
+        if ":" not in target:
+            raise ValueError(f"Registry targets must be 'module:attr': {target}")
+        self._targets[name] = target
+        self._loaded.pop(name, None)
+
+    def __getitem__(self, name: str) -> Callable:
+        if name not in self._loaded:
+            module_path, attribute = self._targets[name].split(":")
+            module = importlib.import_module(module_path, self.package)
+            self._loaded[name] = getattr(module, attribute)
+        return self._loaded[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._targets)
+
+    def __len__(self) -> int:
+        return len(self._targets)
@@ -0,0 +1,97 @@
+import math
+import re
+from collections import Counter
+from typing import List, Sequence
+
+# passages retrieved for each group of card fields
+DEFAULT_TOP_K = 8
+# size of the retrieval passages, so that the top-k of a group fill one
+# extraction chunk
+DEFAULT_PASSAGE_TOKENS = 500
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Splits a text into lowercase words, for lexical matching.
+
+    Args:
+        text (str): the text.
+
+    Returns:
+        List[str]: the words.
+    """
+    return _WORD_PATTERN.findall(text.lower())
+
+
+class BM25:
+    """
+    Okapi BM25 index of a list of passages, ranking them by lexical
+    relevance to a query. Runs locally, without network or GPU.
+
+    Attributes:
+        k1 (float): Saturation of the term frequencies.
+        b (float): Normalization by the passage length.
+    """
+
+    def __init__(
+        self, passages: Sequence[str], k1: float = 1.5, b: float = 0.75
+    ):
+        self.k1 = k1
+        self.b = b
+        self._frequencies = [Counter(tokenize(text)) for text in passages]
+        self._lengths = [sum(freqs.values()) for freqs in self._frequencies]
+        self._avg_length = sum(self._lengths) / max(len(self._lengths), 1)
+        document_frequencies = Counter(
+            word for freqs in self._frequencies for word in freqs
+        )
+        num_passages = len(self._frequencies)
+        self._idf = {
+            word: math.log(1 + (num_passages - df + 0.5) / (df + 0.5))
+            for word, df in document_frequencies.items()
+        }
+
+    def scores(self, query: str) -> List[float]:
+        """
+        Scores every passage for a query.
+
+        Args:
+            query (str): the query.
+
+        Returns:
+            List[float]: the score of each passage, in passage order.
+        """
+        words = [word for word in set(tokenize(query)) if word in self._idf]
+        scores = []
+        for freqs, length in zip(self._frequencies, self._lengths):
+            norm = self.k1 * (
+                1 - self.b + self.b * length / (self._avg_length or 1)
+            )
+            scores.append(
+                sum(
+                    self._idf[word]
+                    * freqs[word]
+                    * (self.k1 + 1)
+                    / (freqs[word] + norm)
+                    for word in words
+                    if word in freqs
+                )
+            )
+        return scores
+
+    def top_k(self, query: str, k: int = DEFAULT_TOP_K) -> List[int]:
+        """
+        Returns the indices of the `k` passages most relevant to a query,
+        from the most to the least relevant. Ties keep the passage order.
+
+        Args:
+            query (str): the query.
+            k (int): the number of passages.
+
+        Returns:
+            List[int]: the indices of the passages.
+        """
+        scores = self.scores(query)
+        ranking = sorted(range(len(scores)), key=lambda i: -scores[i])
+        return ranking[:k]
@@ -0,0 +1,146 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+if TYPE_CHECKING:
+    from datasets import Dataset, DatasetDict
+
+# quantiles of the text lengths (in characters) reported for each split
+LENGTH_QUANTILES = (0.5, 0.9, 0.99)
+
+# string columns that are categories rather than texts
+CATEGORICAL_COLUMNS = ("label", "language", "language_variation")
+
+
+def arrow_table(dataset: "Dataset") -> pa.Table:
+    """
+    Returns the Arrow table of a dataset split without converting it to
+    Python objects. Memory-mapped splits are not copied.
+
+    Args:
+        dataset (Dataset): the dataset split.
+
+    Returns:
+        pa.Table: the Arrow table.
+    """
+    return dataset.with_format("arrow")[:]
+
+
+def value_distribution(
+    column: pa.ChunkedArray, names: Optional[List[str]] = None
+) -> Dict[Any, int]:
+    """
+    Counts the occurrences of each value of a column, sorted by value.
+
+    Args:
+        column (pa.ChunkedArray): the column.
+        names (Optional[List[str]]): class names to decode the values of a
+            `ClassLabel` column with.
+
+    Returns:
+        Dict[Any, int]: number of rows of each value.
+    """
+    counts = pc.value_counts(column)
+    values = counts.field("values").to_pylist()
+    if names is not None:
+        values = [None if value is None else names[value] for value in values]
+    distribution = dict(zip(values, counts.field("counts").to_pylist()))
+    return dict(sorted(distribution.items(), key=lambda item: str(item[0])))
+
+
+def length_statistics(
+    column: pa.ChunkedArray,
+) -> Dict[str, Optional[float]]:
+    """
+    Computes the min, mean, max and quantiles of the lengths, in
+    characters, of a text column. Null texts are ignored.
+
+    Args:
+        column (pa.ChunkedArray): the text column.
+
+    Returns:
+        Dict[str, Optional[float]]: the statistics, None for an empty column.
+    """
+    lengths = pc.utf8_length(column)
+    min_max = pc.min_max(lengths).as_py()
+    quantiles = pc.quantile(lengths, q=list(LENGTH_QUANTILES)).to_pylist()
+    return {
+        "min": min_max["min"],
+        "mean": pc.mean(lengths).as_py(),
+        "max": min_max["max"],
+        **{
+            f"p{int(q * 100)}": value
+            for q, value in zip(LENGTH_QUANTILES, quantiles)
+        },
+    }
+
+
+def split_statistics(
+    table: pa.Table,
+    label_column: Optional[str] = "label",
+    label_names: Optional[List[str]] = None,
+) -> dict:
+    """
+    Computes the statistics of a split with Arrow compute kernels: number
+    of rows, null counts per column, label distribution and text length
+    statistics of the string columns that are not categories.
+
+    Args:
+        table (pa.Table): the Arrow table of the split.
+        label_column (Optional[str]): column with the labels, if any.
+        label_names (Optional[List[str]]): class names of the labels, if
+            they are encoded as `ClassLabel`.
+
+    Returns:
+        dict: the statistics of the split.
+    """
+    statistics = {
+        "num_rows": table.num_rows,
+        "null_counts": {
+            name: table.column(name).null_count for name in table.column_names
+        },
+    }
+    if label_column in table.column_names:
+        statistics["label_distribution"] = value_distribution(
+            table.column(label_column), label_names
+        )
+    statistics["text_lengths"] = {
+        field.name: length_statistics(table.column(field.name))
+        for field in table.schema
+        if field.name not in CATEGORICAL_COLUMNS
+        and (
+            pa.types.is_string(field.type)
+            or pa.types.is_large_string(field.type)
+        )
+    }
+    return statistics
+
+
+def dataset_statistics(
+    dataset: "DatasetDict",
+    splits: Optional[Sequence[str]] = None,
+    label_column: Optional[str] = "label",
+) -> Dict[str, dict]:
+    """
+    Computes the statistics of each split of a dataset, see
+    `split_statistics`.
+
+    Args:
+        dataset (DatasetDict): the dataset.
+        splits (Optional[Sequence[str]]): splits to describe, all if None.
+        label_column (Optional[str]): column with the labels, if any.
+
+    Returns:
+        Dict[str, dict]: the statistics of each split.
+    """
+    from src.utils.categorical import class_label_names
+
+    return {
+        split: split_statistics(
+            arrow_table(dataset[split]),
+            label_column,
+            class_label_names(dataset[split].features, label_column),
+        )
+        for split in splits or dataset.keys()
+    }
@@ -0,0 +1,336 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from src.utils.logging import get_logger, run_log_dir
+
+_logger = get_logger(__name__)
+
+DEFAULT_TELEMETRY_FILE = "llm_telemetry.json"
+
+# upper bounds, in seconds, of the latency histogram buckets
+LATENCY_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 60)
+LATENCY_PERCENTILES = (50, 90, 99)
+
+# USD per million prompt and completion tokens, matched by model prefix
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1": (2.00, 8.00),
+}
+
+DEFAULT_SCOPE = "run"
+
+_scope: ContextVar[str] = ContextVar("telemetry_scope", default=DEFAULT_SCOPE)
+_current_call: ContextVar[Optional["LLMCall"]] = ContextVar(
+    "telemetry_call", default=None
+)
+
+
+@dataclass
+class LLMCall:
+    """
+    Telemetry of an LLM call.
+
+    Attributes:
+        model (str): The model of the call.
+        scope (str): The config the call was made for.
+        prompt_tokens (int): Prompt tokens billed, 0 for cache hits.
+        completion_tokens (int): Completion tokens billed, 0 for cache hits.
+        latency (float): Seconds until the response, retries included.
+        retries (int): Retries of the HTTP request.
+        cached (bool): Whether the response came from the LLM cache.
+        error (Optional[str]): The exception raised by the call, if any.
+    """
+
+    model: str
+    scope: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency: float = 0.0
+    retries: int = 0
+    cached: bool = False
+    error: Optional[str] = None
+
+    def record_usage(
+        self, prompt_tokens: int, completion_tokens: int, cached: bool
+    ) -> None:
+        """
+        Records the token usage of the response.
+
+        Args:
+            prompt_tokens (int): Prompt tokens of the response.
+            completion_tokens (int): Completion tokens of the response.
+            cached (bool): Whether the response came from the LLM cache.
+        """
+        self.cached = cached
+        if not cached:
+            self.prompt_tokens = prompt_tokens
+            self.completion_tokens = completion_tokens
+
+    def record_message(self, message) -> None:
+        """
+        Records the token usage of a LangChain chat response, flagged as
+        cached by the LLM cache adapter.
+
+        Args:
+            message (AIMessage): the response.
+        """
+        usage = getattr(message, "usage_metadata", None) or {}
+        self.record_usage(
+            usage.get("input_tokens", 0),
+            usage.get("output_tokens", 0),
+            message.response_metadata.get("from_cache", False),
+        )
+
+    @property
+    def cost(self) -> Optional[float]:
+        """USD cost of the call, None for models without a known price."""
+        prefixes = [
+            prefix for prefix in MODEL_PRICES if self.model.startswith(prefix)
+        ]
+        if not prefixes:
+            return None
+        # the longest prefix, e.g. gpt-4o-mini before gpt-4o
+        prompt_price, completion_price = MODEL_PRICES[max(prefixes, key=len)]
+        return (
+            self.prompt_tokens * prompt_price
+            + self.completion_tokens * completion_price
+        ) / 1_000_000
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    # nearest rank
+    index = max(round(percentile / 100 * len(values)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def latency_histogram(latencies: List[float]) -> Dict[str, int]:
+    """
+    Counts the latencies in the buckets of `LATENCY_BUCKETS`.
+
+    Args:
+        latencies (List[float]): latencies in seconds.
+
+    Returns:
+        Dict[str, int]: the count of each bucket, e.g. "<=0.5s", ">60s".
+    """
+    histogram = {f"<={bound}s": 0 for bound in LATENCY_BUCKETS}
+    histogram[f">{LATENCY_BUCKETS[-1]}s"] = 0
+    for latency in latencies:
+        bucket = next(
+            (f"<={bound}s" for bound in LATENCY_BUCKETS if latency <= bound),
+            f">{LATENCY_BUCKETS[-1]}s",
+        )
+        histogram[bucket] += 1
+    return histogram
+
+
+def summarize_calls(calls: List[LLMCall]) -> dict:
+    """
+    Aggregates the telemetry of some calls. Latencies are those of the
+    requests sent to the API, cache hits excluded.
+
+    Args:
+        calls (List[LLMCall]): the calls.
+
+    Returns:
+        dict: calls, cache hits, errors, retries, tokens, cost and latency
+            statistics and histogram.
+    """
+    latencies = sorted(call.latency for call in calls if not call.cached)
+    costs = [call.cost for call in calls]
+    summary = {
+        "calls": len(calls),
+        "cache_hits": sum(call.cached for call in calls),
+        "errors": sum(call.error is not None for call in calls),
+        "retries": sum(call.retries for call in calls),
+        "prompt_tokens": sum(call.prompt_tokens for call in calls),
+        "completion_tokens": sum(call.completion_tokens for call in calls),
+        "cost_usd": None if None in costs else round(sum(costs), 6),
+        "latency": {},
+        "latency_histogram": latency_histogram(latencies),
+    }
+    if latencies:
+        summary["latency"] = {
+            "mean": sum(latencies) / len(latencies),
+            **{
+                f"p{percentile}": _percentile(latencies, percentile)
+                for percentile in LATENCY_PERCENTILES
+            },
+            "max": latencies[-1],
+        }
+    return summary
+
+
+class Telemetry:
+    """
+    Collects the telemetry of the LLM calls of a run: tokens, latency,
+    retries and cache hits of each call, tagged with the config (scope)
+    they were made for.
+
+    Attributes:
+        calls (List[LLMCall]): The calls recorded.
+    """
+
+    def __init__(self):
+        self.calls: List[LLMCall] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def scope(self, name: str) -> Iterator[None]:
+        """
+        Tags the calls made within the context, in this thread or task,
+        with a scope, e.g. the config being processed.
+
+        Args:
+            name (str): the scope.
+        """
+        token = _scope.set(name)
+        try:
+            yield
+        finally:
+            _scope.reset(token)
+
+    @contextmanager
+    def track(self, model: str) -> Iterator[LLMCall]:
+        """
+        Measures an LLM call made within the context. The usage of the
+        response is recorded on the yielded `LLMCall`; HTTP retries are
+        recorded by the hooks of the OpenAI clients.
+
+        Args:
+            model (str): the model of the call.
+
+        Yields:
+            LLMCall: the telemetry of the call.
+        """
+        call = LLMCall(model=model, scope=_scope.get())
+        token = _current_call.set(call)
+        start = time.perf_counter()
+        try:
+            yield call
+        except BaseException as e:
+            call.error = type(e).__name__
+            raise
+        finally:
+            call.latency = time.perf_counter() - start
+            _current_call.reset(token)
+            with self._lock:
+                self.calls.append(call)
+
+    def report(self) -> dict:
+        """
+        Aggregates the calls per scope and for the whole run.
+
+        Returns:
+            dict: the summary of the run and of each scope.
+        """
+        with self._lock:
+            calls = list(self.calls)
+        scopes: Dict[str, List[LLMCall]] = {}
+        for call in calls:
+            scopes.setdefault(call.scope, []).append(call)
+        return {
+            "run": summarize_calls(calls),
+            "scopes": {
+                scope: summarize_calls(scope_calls)
+                for scope, scope_calls in scopes.items()
+            },
+            "calls": [{**asdict(call), "cost": call.cost} for call in calls],
+        }
+
+    def write_report(self, path: Union[str, Path, None] = None) -> Path:
+        """
+        Writes the JSON report of the run.
+
+        Args:
+            path (Union[str, Path, None]): the report file, in the log
+                directory of the run if None.
+
+        Returns:
+            Path: the report file.
+        """
+        path = Path(path or run_log_dir() / DEFAULT_TELEMETRY_FILE)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        report = self.report()
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        run = report["run"]
+        _logger.info(
+            f"LLM calls: {run['calls']} ({run['cache_hits']} cached), "
+            f"tokens: {run['prompt_tokens']} + {run['completion_tokens']}, "
+            f"cost: {run['cost_usd']} USD. Report: {path}"
+        )
+        return path
+
+
+def _record_retries(request) -> None:
+    call = _current_call.get()
+    if call is not None:
+        # sent by the OpenAI clients on every attempt of a request
+        retries = int(request.headers.get("x-stainless-retry-count", 0))
+        call.retries = max(call.retries, retries)
+
+
+async def _arecord_retries(request) -> None:
+    _record_retries(request)
+
+
+def openai_http_client():
+    """
+    Returns an HTTP client for the sync OpenAI client, with the OpenAI
+    defaults, that records the retries of the tracked calls.
+
+    Returns:
+        httpx.Client: the HTTP client.
+    """
+    from openai import DefaultHttpxClient
+
+    return DefaultHttpxClient(event_hooks={"request": [_record_retries]})
+
+
+def openai_async_http_client():
+    """
+    Returns an HTTP client for the async OpenAI client, with the OpenAI
+    defaults, that records the retries of the tracked calls.
+
+    Returns:
+        httpx.AsyncClient: the HTTP client.
+    """
+    from openai import DefaultAsyncHttpxClient
+
+    return DefaultAsyncHttpxClient(event_hooks={"request": [_arecord_retries]})
+
+
+_telemetry: Optional[Telemetry] = None
+
+
+def get_telemetry() -> Telemetry:
+    """
+    Returns the process-wide telemetry of the LLM calls.
+
+    Returns:
+        Telemetry: the shared telemetry.
+    """
+    global _telemetry
+    if _telemetry is None:
+        _telemetry = Telemetry()
+    return _telemetry
+
+
+def set_telemetry(telemetry: Optional[Telemetry]) -> None:
+    """
+    Replaces the process-wide telemetry. None restores a new one.
+
+    Args:
+        telemetry (Optional[Telemetry]): the telemetry to be used.
+    """
+    global _telemetry
+    _telemetry = telemetry
@@ -0,0 +1,104 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Optional
+
+from src.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    import tiktoken
+
+_logger = get_logger(__name__)
+
+# chunks are packed up to this number of tokens, so long documents take
+# few and full extraction calls
+DEFAULT_CHUNK_TOKENS = 4_000
+DEFAULT_CHUNK_OVERLAP_TOKENS = 50
+
+# prompt budget within the 128k context of GPT-4o models, leaving room
+# for the response
+DEFAULT_MAX_PROMPT_TOKENS = 100_000
+
+# encoding of the models tiktoken does not know yet
+FALLBACK_ENCODING = "o200k_base"
+
+# estimate used when the encoding can not be loaded, e.g. offline
+CHARS_PER_TOKEN = 4
+
+
+@lru_cache(maxsize=None)
+def get_encoder(model: str) -> Optional["tiktoken.Encoding"]:
+    """
+    Returns the tiktoken encoder of a model, loaded once per process.
+    tiktoken downloads the encodings on first use, so the encoder is None
+    if it can not be loaded and the tokens are estimated from characters.
+
+    Args:
+        model (str): the model name, e.g. "gpt-4o".
+
+    Returns:
+        Optional[tiktoken.Encoding]: the encoder.
+    """
+    import tiktoken
+
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding(FALLBACK_ENCODING)
+    except Exception as e:
+        _logger.warning(f"Estimating tokens, no encoding for {model}: {e}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """
+    Counts the tokens of a text for a model.
+
+    Args:
+        text (str): the text.
+        model (str): the model name.
+
+    Returns:
+        int: the number of tokens.
+    """
+    encoder = get_encoder(model)
+    if encoder is None:
+        return -(-len(text) // CHARS_PER_TOKEN)
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def token_length_function(model: str = "gpt-4o") -> Callable[[str], int]:
+    """
+    Returns a function measuring texts in tokens of a model, e.g. for the
+    `length_function` of LangChain text splitters.
+
+    Args:
+        model (str): the model name.
+
+    Returns:
+        Callable[[str], int]: the length function.
+    """
+    return lambda text: count_tokens(text, model)
+
+
+def truncate_to_tokens(
+    text: str, max_tokens: int, model: str = "gpt-4o"
+) -> str:
+    """
+    Truncates a text to its first `max_tokens` tokens of a model.
+
+    Args:
+        text (str): the text.
+        max_tokens (int): the maximum number of tokens.
+        model (str): the model name.
+
+    Returns:
+        str: the text, truncated if it was longer.
+    """
+    max_tokens = max(max_tokens, 0)
+    encoder = get_encoder(model)
+    if encoder is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+    tokens = encoder.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoder.decode(tokens[:max_tokens])
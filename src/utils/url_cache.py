@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Optional, Union
+
+from src.utils.http import get_http_session
+from src.utils.logging import get_logger
+
+_logger = get_logger(__name__)
+
+DEFAULT_URL_CACHE_PATH = Path(
+    os.environ.get("IBERBENCH_URL_CACHE_PATH", ".url_cache")
+)
+
+# extracts the text of a fetched document from its bytes and content type
+Extractor = Callable[[bytes, str], str]
+
+
+@dataclass
+class FetchedURL:
+    """
+    A fetched document.
+
+    Attributes:
+        url (str): The URL of the document.
+        content (bytes): The raw bytes of the document.
+        content_type (str): The MIME type of the document.
+        changed (bool): Whether it changed since it was cached.
+    """
+
+    url: str
+    content: bytes
+    content_type: str
+    changed: bool
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+class URLCache:
+    """
+    Local cache of fetched URLs: the raw bytes of each document and the
+    texts extracted from them, revalidated with ETag/Last-Modified
+    conditional requests. Within a run, each URL is fetched and each text
+    extracted only once, however many configs share it.
+
+    Attributes:
+        path (Path): Directory of the cache, one subdirectory per URL.
+    """
+
+    def __init__(self, path: Union[str, Path] = DEFAULT_URL_CACHE_PATH):
+        self.path = Path(path)
+        self._fetched: Dict[str, FetchedURL] = {}
+        self._texts: Dict[tuple, str] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _url_path(self, url: str) -> Path:
+        return self.path / hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _lock(self, url: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(url, threading.Lock())
+
+    def _read_cached(self, url: str) -> Optional[dict]:
+        url_path = self._url_path(url)
+        try:
+            meta = json.loads((url_path / "meta.json").read_text())
+            content = (url_path / "content").read_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return {**meta, "content": content}
+
+    def _store(self, url: str, response) -> None:
+        url_path = self._url_path(url)
+        url_path.mkdir(parents=True, exist_ok=True)
+        # stale texts were extracted from the previous content
+        for text_file in url_path.glob("text-*.txt"):
+            text_file.unlink()
+        _write_atomic(url_path / "content", response.content)
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "content_type": response.headers.get("Content-Type", ""),
+        }
+        _write_atomic(url_path / "meta.json", json.dumps(meta).encode())
+
+    def fetch(self, url: str) -> FetchedURL:
+        """
+        Fetches a URL, revalidating its cached copy with a conditional
+        request. If the request fails and there is a cached copy, the copy
+        is used.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            FetchedURL: The fetched document.
+
+        Raises:
+            requests.RequestException: if the request fails and the URL is
+                not cached.
+        """
+        import requests
+
+        with self._lock(url):
+            if url in self._fetched:
+                return self._fetched[url]
+
+            cached = self._read_cached(url)
+            headers = {}
+            if cached is not None:
+                if cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+            try:
+                response = get_http_session().get(url, headers=headers)
+                if response.status_code != 304:
+                    response.raise_for_status()
+            except requests.RequestException as e:
+                if cached is None:
+                    raise
+                _logger.warning(f"Failed to revalidate {url}, cached: {e}")
+                response = None
+
+            if response is None or response.status_code == 304:
+                _logger.info(f"Using cached content of {url}")
+                fetched = FetchedURL(
+                    url, cached["content"], cached["content_type"], False
+                )
+            else:
+                _logger.info(f"Fetched {url}")
+                self._store(url, response)
+                fetched = FetchedURL(
+                    url,
+                    response.content,
+                    response.headers.get("Content-Type", ""),
+                    True,
+                )
+            self._fetched[url] = fetched
+            return fetched
+
+    def text(self, url: str, extractor_name: str, extract: Extractor) -> str:
+        """
+        Returns the text of a URL extracted by `extract`, reusing the text
+        cached for this extractor while the document does not change.
+
+        Args:
+            url (str): The URL of the document.
+            extractor_name (str): Name of the extractor, part of the key.
+            extract (Extractor): Extracts the text from the bytes and the
+                content type of the document.
+
+        Returns:
+            str: The extracted text.
+        """
+        fetched = self.fetch(url)
+        key = (url, extractor_name)
+        with self._lock(url):
+            if key in self._texts:
+                return self._texts[key]
+
+            text_path = self._url_path(url) / f"text-{extractor_name}.txt"
+            if not fetched.changed and text_path.exists():
+                text = text_path.read_text()
+            else:
+                text = extract(fetched.content, fetched.content_type)
+                if text_path.parent.exists():
+                    _write_atomic(text_path, text.encode("utf-8"))
+            self._texts[key] = text
+            return text
+
+
+_url_cache: Optional[URLCache] = None
+
+
+def get_url_cache() -> URLCache:
+    """
+    Returns the process-wide URL cache, shared by all the configs of a run.
+
+    Returns:
+        URLCache: the shared cache.
+    """
+    global _url_cache
+    if _url_cache is None:
+        _url_cache = URLCache()
+    return _url_cache
+
+
+def set_url_cache(cache: Optional[URLCache]) -> None:
+    """
+    Replaces the process-wide URL cache. None restores the default one.
+
+    Args:
+        cache (Optional[URLCache]): the cache to be used.
+    """
+    global _url_cache
+    _url_cache = cache
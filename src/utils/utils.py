@@ -28,10 +28,24 @@ def find_files_with_suffix(base_path: Path, base_name: str):
     return files
 
 
+def get_file_suffix(file_name: str) -> str:
+    """
+    Gets the suffix of a file name, used as language variation (e.g.
+    "train_es.csv" -> "es").
+
+    Args:
+        file_name (str): name or path of the file.
+
+    Returns:
+        str: the lowercased suffix.
+    """
+    return file_name.split("_")[-1].split(".")[0].lower()
+
+
 def group_datasets(dfs):
     grouped_datasets = {}
     for file_name, dataset in dfs.items():
-        suffix = file_name.split("_")[-1].split(".")[0].lower()
+        suffix = get_file_suffix(file_name)
         prefix = file_name.split("_")[0].lower()
         dataset.columns = ["ID"] + [prefix] + list(dataset.columns[2:])
         if suffix not in grouped_datasets:
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.models.model_card_config import DatasetCard
+from src.utils.batch import (
+    BATCH_ENDPOINT,
+    card_batch_id,
+    card_batch_requests,
+    dataset_card_from_batch,
+    read_batch_results,
+    write_batch_requests,
+)
+from src.utils.model_card_utils import extract_fields_by_group
+from src.utils.rate_limit import RateLimiter
+from tests.test_card_extraction import ALL_FIELDS, FakeLLM
+
+CONTENT = "\n\n".join(
+    [f"Section {i}. Results of the baseline systems." for i in range(40)]
+    + [
+        f"{field} {DatasetCard.model_fields[field].description}"
+        for field in ALL_FIELDS
+    ]
+)
+
+
+def _answer(request: dict) -> dict:
+    """
+    Batch API stand-in: answers a request as `FakeLLM` does, filling the
+    requested fields whose name is in the prompt.
+    """
+    body = request["body"]
+    text = body["messages"][0]["content"].split("TEXT:")[-1]
+    fields = body["tools"][0]["function"]["parameters"]["properties"]
+    args = {
+        field: f"{field} value" if field in text else "" for field in fields
+    }
+    message = {
+        "role": "assistant",
+        "tool_calls": [
+            {
+                "id": "0",
+                "type": "function",
+                "function": {
+                    "name": "DatasetCard",
+                    "arguments": json.dumps(args),
+                },
+            }
+        ],
+    }
+    return {
+        "id": f"batch_req_{request['custom_id']}",
+        "custom_id": request["custom_id"],
+        "response": {
+            "status_code": 200,
+            "body": {"choices": [{"message": message}]},
+        },
+        "error": None,
+    }
+
+
+class TestBatch(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.path = Path(self.tmp_dir.name)
+
+    def test_card_batch_id_is_shared_by_the_same_urls(self):
+        self.assertEqual(
+            card_batch_id(["https://b.org", "https://a.org"]),
+            card_batch_id(["https://a.org", "https://b.org", "https://a.org"]),
+        )
+        self.assertNotEqual(
+            card_batch_id(["https://a.org"]), card_batch_id(["https://b.org"])
+        )
+
+    def test_batch_matches_sync_extraction(self):
+        card_id = card_batch_id(["https://example.org/paper.pdf"])
+        requests = card_batch_requests(card_id, CONTENT)
+        write_batch_requests(requests, self.path / "batch" / "input.jsonl")
+
+        with open(self.path / "batch" / "input.jsonl") as f:
+            lines = [json.loads(line) for line in f]
+        self.assertEqual(lines, requests)
+        for request in lines:
+            self.assertTrue(request["custom_id"].startswith(f"{card_id}/"))
+            self.assertEqual(request["url"], BATCH_ENDPOINT)
+
+        # the results of the job come back in any order
+        with open(self.path / "output.jsonl", "w") as f:
+            for request in reversed(lines):
+                f.write(json.dumps(_answer(request)) + "\n")
+        batch_card = dataset_card_from_batch(
+            card_id, read_batch_results(self.path / "output.jsonl")
+        )
+
+        sync_card = DatasetCard()
+        asyncio.run(
+            extract_fields_by_group(
+                sync_card, CONTENT.split("\n\n"), FakeLLM(), RateLimiter()
+            )
+        )
+        self.assertEqual(batch_card, sync_card)
+
+    def test_failed_requests_extract_nothing(self):
+        with open(self.path / "output.jsonl", "w") as f:
+            failed = {
+                "custom_id": "abc/license/0",
+                "response": None,
+                "error": {"code": "server_error", "message": "failed"},
+            }
+            f.write(json.dumps(failed) + "\n")
+        results = read_batch_results(self.path / "output.jsonl")
+        self.assertEqual(results, {"abc/license/0": None})
+        self.assertEqual(dataset_card_from_batch("abc", results), DatasetCard())
+
+    def test_cards_without_results_are_none(self):
+        results = {"abc/license/0": {"license": "CC BY 4.0"}}
+        self.assertIsNone(dataset_card_from_batch("def", results))
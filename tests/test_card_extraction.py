@@ -0,0 +1,155 @@
+import asyncio
+import unittest
+from unittest import mock
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.models.model_card_config import DatasetCard, dataset_card_subset
+from src.utils.model_card_utils import (
+    extract_fields_by_group,
+    extract_missing_fields,
+    generate_dataset_card_from_urls,
+    missing_fields,
+    source_card_key,
+    specialize_dataset_card,
+)
+from src.utils.rate_limit import RateLimiter
+
+
+class FakeLLM:
+    """
+    LLM stand-in that fills, from each chunk, the requested fields whose
+    name is in the chunk, and records the fields of each request.
+    """
+
+    def __init__(self):
+        self.requests = []
+
+    def bind_tools(self, tools):
+        (tool,) = tools
+        fields = list(tool.model_fields)
+
+        async def respond(prompt) -> AIMessage:
+            self.requests.append(fields)
+            text = prompt.to_string().split("TEXT:")[-1]
+            args = {
+                field: f"{field} value" if field in text else ""
+                for field in fields
+            }
+            return AIMessage(
+                content="",
+                tool_calls=[{"name": tool.__name__, "args": args, "id": "0"}],
+            )
+
+        return RunnableLambda(lambda prompt: None, afunc=respond)
+
+
+ALL_FIELDS = list(DatasetCard.model_fields)
+
+
+class TestCardExtraction(unittest.TestCase):
+
+    def test_dataset_card_subset(self):
+        model = dataset_card_subset(("license", "paper"))
+        self.assertEqual(model.__name__, "DatasetCard")
+        self.assertEqual(list(model.model_fields), ["license", "paper"])
+        self.assertEqual(
+            model.model_fields["license"].description,
+            DatasetCard.model_fields["license"].description,
+        )
+
+    def test_asks_only_for_missing_fields_and_stops(self):
+        half = len(ALL_FIELDS) // 2
+        chunks = [
+            " ".join(ALL_FIELDS[:half]),
+            " ".join(ALL_FIELDS[half:]),
+            "nothing else",
+            "nothing else",
+        ]
+        llm = FakeLLM()
+        dataset_card = DatasetCard()
+
+        updates = asyncio.run(
+            extract_missing_fields(
+                dataset_card, chunks, llm, RateLimiter(), max_concurrency=1
+            )
+        )
+
+        self.assertEqual(updates, len(ALL_FIELDS))
+        self.assertEqual(missing_fields(dataset_card, ALL_FIELDS), [])
+        # the second request only asks for the fields the first missed, and
+        # the last chunks are not sent
+        self.assertEqual(llm.requests, [ALL_FIELDS, ALL_FIELDS[half:]])
+
+    def test_groups_stop_once_their_fields_are_filled(self):
+        groups = {
+            "licensing": (("license", "paper"), ["license", "paper", "x"]),
+            "languages": (("languages",), ["languages", "languages"]),
+        }
+        llm = FakeLLM()
+        dataset_card = DatasetCard()
+
+        with mock.patch(
+            "src.utils.model_card_utils.group_chunks", return_value=groups
+        ):
+            updates = asyncio.run(
+                extract_fields_by_group(
+                    dataset_card, [], llm, RateLimiter(), max_concurrency=1
+                )
+            )
+
+        self.assertEqual(updates, 3)
+        self.assertEqual(
+            missing_fields(dataset_card, ["license", "paper", "languages"]),
+            [],
+        )
+        # each chunk asks for the fields of its group still missing, and the
+        # chunks left once a group is filled are not sent
+        self.assertEqual(
+            sorted(llm.requests),
+            [["languages"], ["license", "paper"], ["paper"]],
+        )
+
+    def test_source_card_reuse(self):
+        self.assertEqual(
+            source_card_key(["https://b.org", "https://a.org"]),
+            source_card_key(
+                ["https://a.org", "https://b.org", "https://a.org"]
+            ),
+        )
+
+        source_card = DatasetCard(license="MIT", languages="Spanish")
+        card = specialize_dataset_card(
+            source_card,
+            dataset_id="iberbench/task-basque",
+            language="basque",
+            dataset_details={"splits": {"train": 10, "test": 2}, "size": 12},
+        )
+        self.assertEqual(card.dataset_id, "iberbench/task-basque")
+        self.assertEqual(card.languages, "basque")
+        self.assertEqual(
+            card.data_splits, "train: 10 examples, test: 2 examples"
+        )
+        self.assertEqual(card.data_size, "12 examples")
+        self.assertEqual(card.license, "MIT")
+        # the shared source card is not modified
+        self.assertEqual(source_card.languages, "Spanish")
+
+        card = specialize_dataset_card(
+            source_card, "iberbench/task", "galician"
+        )
+        self.assertEqual(card.data_splits, source_card.data_splits)
+
+    def test_no_card_without_content(self):
+        with mock.patch(
+            "src.utils.model_card_utils.load_content_from_urls",
+            return_value="",
+        ):
+            self.assertIsNone(
+                generate_dataset_card_from_urls(["https://a.org"])
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
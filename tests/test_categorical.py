@@ -0,0 +1,80 @@
+import unittest
+
+from datasets import ClassLabel, Dataset, DatasetDict, Value
+from src.utils.categorical import encode_categorical_columns
+from src.utils.io import get_language_variety
+from src.utils.stats import dataset_statistics
+
+MAPPING = {
+    "label": {"none": "0", "favor": "1", "against": "2"},
+    "language_variation": {"es": "spanish", "eu": "basque"},
+}
+
+
+def _dataset() -> DatasetDict:
+    return DatasetDict(
+        {
+            split: Dataset.from_dict(
+                {
+                    "text": ["a", "b", "c"],
+                    "label": labels,
+                    "language": ["spanish"] * 3,
+                    "language_variation": ["spanish", "spanish", "galician"],
+                }
+            )
+            for split, labels in [
+                ("train", ["2", "0", None]),
+                ("test", ["1", "1", "0"]),
+            ]
+        }
+    )
+
+
+class TestCategorical(unittest.TestCase):
+
+    def test_encode_categorical_columns(self):
+        dataset = _dataset()
+        encoded = encode_categorical_columns(dataset, MAPPING)
+
+        features = encoded["train"].features
+        self.assertEqual(features["text"], Value("string"))
+        self.assertEqual(features["label"], ClassLabel(names=["0", "1", "2"]))
+        self.assertEqual(features["language"], ClassLabel(names=["spanish"]))
+        # mapped names first, then the observed ones
+        self.assertEqual(
+            features["language_variation"].names,
+            ["basque", "spanish", "galician"],
+        )
+        self.assertEqual(encoded["test"].features, features)
+        self.assertEqual(encoded["train"]["label"][:], [2, 0, None])
+
+        # consumers see the same values
+        label = features["label"]
+        self.assertEqual(
+            [label.int2str(value) for value in encoded["test"]["label"][:]],
+            dataset["test"]["label"][:],
+        )
+        self.assertEqual(get_language_variety(encoded), "spanish")
+        self.assertEqual(
+            dataset_statistics(encoded)["train"]["label_distribution"],
+            dataset_statistics(dataset)["train"]["label_distribution"],
+        )
+
+    def test_mapping_values_are_cleaned_as_labels(self):
+        dataset = DatasetDict(
+            {"train": Dataset.from_dict({"label": ["positive", "negative"]})}
+        )
+        mapping = {"label": {"P": " Positive", "N": "Negative"}}
+        encoded = encode_categorical_columns(dataset, mapping)
+        self.assertEqual(
+            encoded["train"].features["label"].names,
+            ["negative", "positive"],
+        )
+
+    def test_encoded_columns_are_not_encoded_again(self):
+        encoded = encode_categorical_columns(_dataset(), MAPPING)
+        self.assertIs(encode_categorical_columns(encoded, MAPPING), encoded)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from fsspec.implementations.local import LocalFileSystem
+from fsspec.implementations.memory import MemoryFileSystem
+from huggingface_hub import DatasetCard
+
+from datasets import ClassLabel, Dataset, DatasetDict, Features, Value
+from src.utils.hf_utils import (
+    _hub_parquet_data_files,
+    dataset_details_from_card,
+    dataset_details_from_parquet,
+)
+from src.utils.io import write_hub_parquet
+
+FEATURES = Features(
+    {"text": Value("string"), "label": ClassLabel(names=["neg", "pos"])}
+)
+
+CARD = """---
+dataset_info:
+- config_name: default
+  features:
+  - name: text
+    dtype: string
+  - name: label
+    dtype:
+      class_label:
+        names:
+          '0': neg
+          '1': pos
+  splits:
+  - name: train
+    num_examples: 3
+  - name: test
+    num_examples: 1
+- config_name: other
+  features:
+  - name: text
+    dtype: string
+---
+"""
+
+
+def _dataset(num_rows: int) -> Dataset:
+    return Dataset.from_dict(
+        {"text": ["a"] * num_rows, "label": [1] * num_rows}, features=FEATURES
+    )
+
+
+EXPECTED = {
+    "splits": {"train": 3, "test": 1},
+    "fields": {name: str(info) for name, info in FEATURES.items()},
+    "size": 4,
+}
+
+
+class TestDatasetDetails(unittest.TestCase):
+
+    def test_details_from_card(self):
+        card = DatasetCard(CARD)
+        self.assertEqual(dataset_details_from_card(card), EXPECTED)
+        # without split sizes, or without the config, they are not known
+        self.assertIsNone(dataset_details_from_card(card, "other"))
+        self.assertIsNone(dataset_details_from_card(card, "missing"))
+        self.assertIsNone(dataset_details_from_card(DatasetCard("")))
+
+    def test_details_from_parquet_footers(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset = DatasetDict({"train": _dataset(3), "test": _dataset(1)})
+            paths = write_hub_parquet(dataset, tmp_dir, row_group_size=1)
+            files = {
+                split: [str(p) for p in paths if p.name.startswith(split)]
+                for split in dataset
+            }
+
+            details = dataset_details_from_parquet(LocalFileSystem(), files)
+
+        self.assertEqual(details, EXPECTED)
+        self.assertIsNone(dataset_details_from_parquet(LocalFileSystem(), {}))
+
+    def test_default_data_layout_without_configs(self):
+        fs = MemoryFileSystem()
+        self.addCleanup(fs.rm, "/datasets", recursive=True)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            dataset = DatasetDict({"train": _dataset(3), "test": _dataset(1)})
+            for path in write_hub_parquet(dataset, tmp_dir):
+                fs.pipe(
+                    f"/datasets/org/repo/data/{path.name}", path.read_bytes()
+                )
+
+        files = _hub_parquet_data_files(
+            fs, "org/repo", DatasetCard(""), "default"
+        )
+        self.assertEqual(sorted(files), ["test", "train"])
+        self.assertEqual(dataset_details_from_parquet(fs, files), EXPECTED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,194 @@
+import os
+import re
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.utils.extractors import extract_text, sniff_mime_type
+from src.utils.extractors.html import html_to_text
+from src.utils.extractors.pdf import (
+    clean_pdf_page,
+    iter_pdf_pages,
+    pdf_to_text,
+)
+from src.utils.gpt_generate import GPTClient
+
+# saved pages and papers of shared tasks; more documents can be benchmarked
+# by pointing `IBERBENCH_EXTRACTION_CORPUS` to a directory of them
+CORPUS_PATH = Path(__file__).parent / "fixtures" / "extraction"
+BENCHMARK_REPETITIONS = 20
+
+# unstructured loads models and is slow, so its benchmark is opt-in
+BENCHMARK_UNSTRUCTURED = bool(
+    os.environ.get("IBERBENCH_BENCHMARK_UNSTRUCTURED")
+)
+
+
+def _corpus():
+    paths = sorted(CORPUS_PATH.iterdir())
+    extra_path = os.environ.get("IBERBENCH_EXTRACTION_CORPUS")
+    if extra_path:
+        paths += sorted(Path(extra_path).iterdir())
+    return {path: path.read_bytes() for path in paths if path.is_file()}
+
+
+def _words(text: str) -> set:
+    return set(re.findall(r"\w+", text.lower()))
+
+
+def _seconds(extract, content: bytes) -> float:
+    start = time.perf_counter()
+    for _ in range(BENCHMARK_REPETITIONS):
+        extract(content)
+    return (time.perf_counter() - start) / BENCHMARK_REPETITIONS
+
+
+class TestExtraction(unittest.TestCase):
+
+    def test_sniff_mime_type(self):
+        corpus = {path.name: content for path, content in _corpus().items()}
+        # servers often declare documents as generic binaries
+        self.assertEqual(
+            sniff_mime_type(corpus["paper.pdf"], "application/octet-stream"),
+            "application/pdf",
+        )
+        self.assertEqual(
+            sniff_mime_type(corpus["shared_task.html"], "text/plain"),
+            "text/html",
+        )
+        self.assertEqual(
+            sniff_mime_type(corpus["task_description.txt"]), "text/plain"
+        )
+        self.assertEqual(
+            sniff_mime_type(b"{}", "application/json; charset=utf-8"),
+            "application/json",
+        )
+
+    def test_html_text(self):
+        html = (
+            b"<html><head><title>T\xc3\xadtulo</title><style>p {}</style>"
+            b"<script>var x;</script></head><body><!-- menu --><h1>Tarea</h1>"
+            b"<p>Uno <b>dos</b><br>tres</p><nav><a>Home</a><a>Data</a></nav>"
+            b"<table><tr><td>es</td><td>10</td></tr><tr><td>eu</td><td>5</td>"
+            b"</tr></table></body></html>"
+        )
+        self.assertEqual(
+            html_to_text(html, "text/html; charset=utf-8"),
+            "Título\n\nTarea\n\nUno dos\ntres\n\nHome Data\n\nes 10\neu 5",
+        )
+        latin1 = "<p>Año</p>".encode("latin-1")
+        self.assertEqual(
+            html_to_text(latin1, "text/html; charset=latin-1"), "Año"
+        )
+        self.assertEqual(html_to_text(b""), "")
+
+    def test_pdf_text(self):
+        text = extract_text((CORPUS_PATH / "paper.pdf").read_bytes())
+        pages = text.split("\n\n")
+        self.assertEqual(len(pages), 2)
+        self.assertIn("annotated by three experts", pages[0])
+        self.assertIn("CC BY-NC-SA 4.0 license", pages[1])
+
+    def test_pdf_hyphenation(self):
+        text = (
+            "anno\x02tated by\r\nstate-\nof-the-art socio-\neconómico "
+            "anno\u00ad\ntated\r\n"
+        )
+        # compounds keep their hyphen, soft hyphens are removed
+        self.assertEqual(
+            clean_pdf_page(text),
+            "annotated by\nstate-of-the-art socio-económico annotated",
+        )
+
+    def test_pdf_pages_do_not_hold_the_lock(self):
+        content = (CORPUS_PATH / "paper.pdf").read_bytes()
+        pages = iter_pdf_pages(content)
+        first_page = next(pages)
+
+        # a nested extraction while the first one is not exhausted
+        nested = []
+        thread = threading.Thread(
+            target=lambda: nested.append(pdf_to_text(content))
+        )
+        thread.start()
+        thread.join(timeout=10)
+        self.assertFalse(thread.is_alive())
+        self.assertIn("annotated by three experts", nested[0])
+        self.assertEqual(len([first_page, *pages]), 2)
+
+    def test_malformed_url_content_is_empty(self):
+        cache = mock.Mock()
+        cache.text.side_effect = lambda url, name, extract: extract(
+            b"%PDF-1.4 truncated", "application/pdf"
+        )
+        with mock.patch(
+            "src.utils.gpt_generate.get_url_cache", return_value=cache
+        ):
+            self.assertEqual(
+                GPTClient("key").extract_url_content("https://a.org/p.pdf"),
+                "",
+            )
+
+    def test_plain_text(self):
+        self.assertEqual(
+            extract_text(b"\xef\xbb\xbfhola\r\nmundo\r\n", "text/plain"),
+            "hola\nmundo",
+        )
+
+
+class TestExtractionBenchmark(unittest.TestCase):
+    """
+    Benchmarks the HTML extractor against the previous HTML path,
+    BeautifulSoup with the pure-Python `html.parser` (a dev requirement).
+    """
+
+    def test_html_is_faster_and_keeps_the_text(self):
+        from bs4 import BeautifulSoup
+
+        def soup_text(content: bytes) -> str:
+            soup = BeautifulSoup(content, "html.parser")
+            return soup.get_text(separator="\n", strip=True)
+
+        for path, content in _corpus().items():
+            if sniff_mime_type(content) != "text/html":
+                continue
+            with self.subTest(path.name):
+                self.assertEqual(
+                    _words(html_to_text(content)), _words(soup_text(content))
+                )
+                old = _seconds(soup_text, content)
+                new = _seconds(html_to_text, content)
+                print(f"{path.name}: html.parser {old:.4f}s, lxml {new:.4f}s")
+                self.assertLess(new, old)
+
+
+
+@unittest.skipUnless(
+    BENCHMARK_UNSTRUCTURED, "set IBERBENCH_BENCHMARK_UNSTRUCTURED to run it"
+)
+class TestUnstructuredBenchmark(unittest.TestCase):
+    """
+    Benchmarks the extractors against the previous fallback, unstructured,
+    on the corpus. Opt-in: unstructured needs its models, downloaded on
+    first use.
+    """
+
+    def test_extractors_are_faster(self):
+        from src.utils.extractors import extract_unstructured_text
+
+        for path, content in _corpus().items():
+            content_type = sniff_mime_type(content)
+            old = _seconds(
+                lambda content: extract_unstructured_text(
+                    content, content_type
+                ),
+                content,
+            )
+            new = _seconds(extract_text, content)
+            print(
+                f"{path.name}: unstructured {old:.4f}s, extractors {new:.4f}s"
+            )
+            self.assertTrue(extract_text(content))
+            self.assertLess(new, old)
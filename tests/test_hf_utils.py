@@ -0,0 +1,214 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+import httpx
+from huggingface_hub import DatasetCard
+from huggingface_hub.errors import HfHubHTTPError
+
+from datasets import Dataset, DatasetDict
+from src.utils.hf_utils import (
+    add_many_to_main_dataset,
+    append_to_hf_file,
+    auth_check,
+    create_dataset_repo,
+    repo_index,
+)
+from src.utils.http import set_hf_api
+from src.utils.io import write_hub_parquet
+
+
+class FakeHfApi:
+    """
+    HfApi stand-in that keeps the repositories and commits in memory.
+    """
+
+    def __init__(self):
+        self.repos = set()
+        self.commits = []
+        self.listings = 0
+        self.files = {}
+        self.head = 0
+        # (status code, file, content) committed by another writer before
+        # each of the next conditional commits
+        self.concurrent_commits = []
+
+    def list_datasets(self, author, token=None):
+        self.listings += 1
+        return [
+            SimpleNamespace(id=repo_id)
+            for repo_id in sorted(self.repos)
+            if repo_id.startswith(f"{author}/")
+        ]
+
+    def create_repo(self, repo_id, **kwargs):
+        self.repos.add(repo_id)
+
+    def list_repo_files(self, repo_id, repo_type=None):
+        return []
+
+    def repo_info(self, repo_id, repo_type=None, token=None):
+        return SimpleNamespace(sha=str(self.head))
+
+    # stands in for `read_hf_file`, any revision reads the head
+    def read_file(self, file_name, repo_id, token, revision):
+        return self.files.get(file_name)
+
+    def create_commit(self, repo_id, operations, parent_commit=None, **kwargs):
+        if parent_commit is not None and self.concurrent_commits:
+            status_code, file_name, content = self.concurrent_commits.pop(0)
+            self._commit({file_name: content})
+        if parent_commit is not None and parent_commit != str(self.head):
+            response = httpx.Response(
+                status_code, request=httpx.Request("POST", "https://hf.co")
+            )
+            raise HfHubHTTPError(
+                "Parent commit is not the head", response=response
+            )
+        self.commits.append([op.path_in_repo for op in operations])
+        self._commit(
+            {
+                op.path_in_repo: op.path_or_fileobj.decode()
+                for op in operations
+                if isinstance(op.path_or_fileobj, bytes)
+            }
+        )
+
+    def _commit(self, files):
+        self.files.update(files)
+        self.head += 1
+
+
+class TestHfUtils(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+        self.api = FakeHfApi()
+        set_hf_api(self.api)
+        repo_index.clear()
+        for patch in (
+            mock.patch.dict(os.environ, {"HF_API_KEY": "token"}),
+            # no need to wait for the fake repositories to be available
+            mock.patch("src.utils.hf_utils.time.sleep"),
+        ):
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def tearDown(self):
+        set_hf_api(None)
+        repo_index.clear()
+        self.tmp_dir.cleanup()
+
+    def _results_path(self, name: str, num_shards: int) -> Path:
+        dataset = DatasetDict(
+            {
+                "train": Dataset.from_dict(
+                    {"text": [f"{name} {i}" for i in range(num_shards)]}
+                ),
+                "test": Dataset.from_dict({"text": ["test"]}),
+            }
+        )
+        # a shard per train row
+        write_hub_parquet(dataset, self.root / name, max_shard_size=1)
+        return self.root / name
+
+    def test_repo_index_listing(self):
+        self.api.repos = {"iberbench/a", "other/b"}
+        with mock.patch("src.utils.hf_utils.time.monotonic", return_value=0):
+            self.assertTrue(auth_check("iberbench/a"))
+            self.assertFalse(auth_check("iberbench/b"))
+            self.assertEqual(self.api.listings, 1)
+
+            # created repositories are known without listing again
+            create_dataset_repo("iberbench/b")
+            self.assertTrue(auth_check("iberbench/b"))
+            self.assertEqual(self.api.listings, 1)
+
+        # the listing expires after the TTL
+        self.api.repos.discard("iberbench/a")
+        with mock.patch(
+            "src.utils.hf_utils.time.monotonic",
+            return_value=repo_index.ttl + 1,
+        ):
+            self.assertFalse(auth_check("iberbench/a"))
+            self.assertTrue(auth_check("iberbench/b"))
+        self.assertEqual(self.api.listings, 2)
+
+    def _append(self, max_retries: int = 3) -> None:
+        with mock.patch(
+            "src.utils.hf_utils.read_hf_file", self.api.read_file
+        ):
+            append_to_hf_file(
+                "task_metadata.json",
+                "iberbench/task",
+                "token",
+                {"card": "new"},
+                max_retries=max_retries,
+            )
+
+    def test_conflicting_updates_are_merged_again(self):
+        self.api.files["task_metadata.json"] = '{"task": "old"}'
+        self.api.concurrent_commits = [
+            (412, "task_metadata.json", '{"task": "concurrent"}'),
+            (409, "task_metadata.json", '{"task": "last"}'),
+        ]
+        self._append()
+
+        # the update is committed on top of the last concurrent one
+        self.assertEqual(len(self.api.commits), 1)
+        self.assertEqual(
+            json.loads(self.api.files["task_metadata.json"]),
+            {"task": "last", "card": "new"},
+        )
+
+    def test_conflicting_updates_give_up(self):
+        self.api.concurrent_commits = [
+            (412, "task_metadata.json", "{}") for _ in range(3)
+        ]
+        with self.assertRaises(HfHubHTTPError):
+            self._append(max_retries=2)
+        self.assertEqual(self.api.commits, [])
+        self.assertEqual(self.api.concurrent_commits, [])
+
+    def test_main_dataset_commits_are_split_at_the_limit(self):
+        datasets = [
+            (f"iberbench/task_{i}", self._results_path(f"task_{i}", 2))
+            for i in range(3)
+        ]
+        with mock.patch(
+            "src.utils.hf_utils.load_dataset_card",
+            side_effect=lambda repo_id: DatasetCard(""),
+        ):
+            add_many_to_main_dataset(
+                datasets, "iberbench/iberbench_all", max_files_per_commit=4
+            )
+
+        self.assertIn("iberbench/iberbench_all", self.api.repos)
+        # the train shards of the first two datasets, then the last one,
+        # each commit with the card of its configs
+        self.assertEqual(
+            self.api.commits,
+            [
+                [
+                    "task_0/train-00000-of-00002.parquet",
+                    "task_0/train-00001-of-00002.parquet",
+                    "task_1/train-00000-of-00002.parquet",
+                    "task_1/train-00001-of-00002.parquet",
+                    "README.md",
+                ],
+                [
+                    "task_2/train-00000-of-00002.parquet",
+                    "task_2/train-00001-of-00002.parquet",
+                    "README.md",
+                ],
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
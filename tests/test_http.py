@@ -0,0 +1,22 @@
+import sys
+import unittest
+from unittest import mock
+
+from src.utils import http
+
+
+class TestHTTP(unittest.TestCase):
+
+    def tearDown(self):
+        http.configure_http()
+
+    def test_hub_client_without_httpx2(self):
+        http.configure_http()
+        # an import error is raised for modules set to None
+        with mock.patch.dict(sys.modules, {"httpx2": None}):
+            http._configure_hub_client()
+        self.assertTrue(http._hub_configured)
+
+
+if __name__ == "__main__":
+    unittest.main()
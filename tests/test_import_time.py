@@ -0,0 +1,66 @@
+import json
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = [
+    "bs4",
+    "datasets",
+    "huggingface_hub",
+    "langchain",
+    "langchain_community",
+    "langchain_core",
+    "langchain_openai",
+    "lxml",
+    "openai",
+    "pandas",
+    "pypdfium2",
+    "tiktoken",
+    "unstructured",
+]
+
+# Generous budget: the eager imports took several seconds, the lazy CLI
+# startup takes a few hundred milliseconds.
+IMPORT_TIME_BUDGET = 1.5
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+loaded = sorted({{m.split(".")[0] for m in sys.modules}})
+print(json.dumps({{"elapsed": elapsed, "loaded": loaded}}))
+"""
+
+
+def _import_in_subprocess(module: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_cli_does_not_import_heavy_dependencies(self):
+        loaded = set(_import_in_subprocess("src.cli")["loaded"])
+        self.assertEqual(loaded & set(HEAVY_MODULES), set())
+
+    def test_cleaning_registry_does_not_import_normalizers(self):
+        loaded = set(
+            _import_in_subprocess("src.ds_preprocessing.cleaning_fn")["loaded"]
+        )
+        self.assertEqual(loaded & set(HEAVY_MODULES), set())
+
+    def test_cli_import_time(self):
+        elapsed = min(
+            _import_in_subprocess("src.cli")["elapsed"] for _ in range(3)
+        )
+        self.assertLess(elapsed, IMPORT_TIME_BUDGET)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from datasets import Dataset, DatasetDict, load_from_disk
+from src.utils.hf_utils import hub_parquet_files
+from src.utils.io import remove_hub_parquet, save_dataset, write_hub_parquet
+
+
+def _dataset(num_rows: int = 100) -> DatasetDict:
+    return DatasetDict(
+        {
+            "train": Dataset.from_dict(
+                {
+                    "text": [f"text {i}" for i in range(num_rows)],
+                    "label": [str(i % 3) for i in range(num_rows)],
+                }
+            ),
+            "test": Dataset.from_dict(
+                {"text": ["a", "b"], "label": ["0", "1"]}
+            ),
+        }
+    )
+
+
+class TestIO(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _size(self, path: Path) -> int:
+        return sum(shard.stat().st_size for shard in path.glob("*/*.arrow"))
+
+    def test_sharded_compressed_round_trip(self):
+        dataset = _dataset(num_rows=2_000)
+        save_dataset(
+            dataset, self.path / "plain", max_shard_size=10_000, num_proc=2
+        )
+        save_dataset(
+            dataset,
+            self.path / "zstd",
+            max_shard_size=10_000,
+            num_proc=2,
+            compression="zstd",
+        )
+
+        shards = sorted((self.path / "zstd" / "train").glob("data-*.arrow"))
+        self.assertGreater(len(shards), 1)
+        self.assertLess(
+            self._size(self.path / "zstd"), self._size(self.path / "plain")
+        )
+        for name in ("plain", "zstd"):
+            loaded = load_from_disk(str(self.path / name))
+            for split in ("train", "test"):
+                self.assertEqual(
+                    loaded[split].to_list(), dataset[split].to_list()
+                )
+
+    def test_unsupported_compression(self):
+        with self.assertRaises(ValueError):
+            save_dataset(_dataset(), self.path, compression="unknown")
+
+    def test_stale_hub_parquet_is_removed(self):
+        write_hub_parquet(_dataset(), self.path)
+        self.assertEqual(len(hub_parquet_files(self.path)), 2)
+
+        # a later run without Hub Parquet shards
+        save_dataset(_dataset(num_rows=10), self.path)
+        remove_hub_parquet(self.path)
+        self.assertEqual(hub_parquet_files(self.path), [])
+        # nothing to remove is fine
+        remove_hub_parquet(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
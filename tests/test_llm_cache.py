@@ -0,0 +1,151 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from langchain_core.language_models.fake_chat_models import (
+    GenericFakeChatModel,
+)
+from langchain_core.messages import AIMessage
+
+from src.utils.llm_cache import (
+    CacheMissError,
+    LLMCache,
+    langchain_cache,
+    on_cache_miss,
+)
+
+
+def _fake_chat_model(cache: LLMCache, *contents: str) -> GenericFakeChatModel:
+    return GenericFakeChatModel(
+        messages=iter([AIMessage(content) for content in contents]),
+        cache=langchain_cache(cache),
+    )
+
+
+class TestLLMCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_key(self):
+        key = LLMCache.key("prompt", model="gpt-4o", tools=["a"])
+        self.assertEqual(
+            key, LLMCache.key("prompt", tools=["a"], model="gpt-4o")
+        )
+        for other in [
+            LLMCache.key("other prompt", model="gpt-4o", tools=["a"]),
+            LLMCache.key("prompt", model="gpt-4o-mini", tools=["a"]),
+            LLMCache.key("prompt", model="gpt-4o", tools=["b"]),
+        ]:
+            self.assertNotEqual(key, other)
+
+    def test_get_or_compute(self):
+        cache = LLMCache(self.path)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return {"content": "response"}
+
+        for _ in range(3):
+            self.assertEqual(
+                cache.get_or_compute("key", compute), {"content": "response"}
+            )
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(
+            cache.stats(), {"hits": 2, "misses": 1, "requests": 3}
+        )
+        # persistent across runs
+        self.assertEqual(
+            LLMCache(self.path).get("key"), {"content": "response"}
+        )
+
+    def test_replay_mode(self):
+        LLMCache(self.path).put("cached", "response")
+        cache = LLMCache(self.path, mode="replay")
+
+        self.assertEqual(cache.get("cached"), "response")
+        with self.assertRaises(CacheMissError):
+            cache.get_or_compute("missing", lambda: "response")
+        self.assertIsNone(LLMCache(self.path).get("missing"))
+
+    def test_off_mode(self):
+        cache = LLMCache(self.path, mode="off")
+        cache.put("key", "response")
+        self.assertIsNone(cache.get("key"))
+        self.assertEqual(os.listdir(self.path), [])
+
+    def test_least_recently_used_eviction(self):
+        cache = LLMCache(self.path, max_size=130)
+        for i, key in enumerate(["a", "b", "c"]):
+            cache.put(key, "x" * 20)
+            os.utime(cache._entry_path(key), (i, i))
+        # using "a" makes "b" the least recently used
+        cache.get("a")
+        cache.put("d", "x" * 20)
+
+        self.assertIsNone(cache.get("b"))
+        for key in ["a", "c", "d"]:
+            self.assertIsNotNone(cache.get(key))
+
+    def test_langchain_cache(self):
+        cache = LLMCache(self.path)
+        llm = _fake_chat_model(cache, "first", "second")
+        self.assertEqual(llm.invoke("hello").content, "first")
+        self.assertEqual(llm.invoke("hello").content, "first")
+        self.assertEqual(llm.invoke("bye").content, "second")
+        self.assertEqual(cache.hits, 1)
+
+        # replayed offline, without calling the model
+        replay = _fake_chat_model(LLMCache(self.path, mode="replay"))
+        self.assertEqual(replay.invoke("hello").content, "first")
+        self.assertEqual(replay.invoke("bye").content, "second")
+        with self.assertRaises(CacheMissError):
+            replay.invoke("new prompt")
+
+    def test_cached_none_is_a_hit(self):
+        cache = LLMCache(self.path)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(cache.get_or_compute("key", compute))
+        self.assertIsNone(cache.get_or_compute("key", compute))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.hits, 1)
+
+    def test_clear(self):
+        cache = LLMCache(self.path)
+        llm = _fake_chat_model(cache, "first", "second")
+        llm.invoke("hello")
+        langchain_cache(cache).clear()
+        self.assertEqual(list(cache._entries()), [])
+        self.assertEqual(llm.invoke("hello").content, "second")
+
+    def test_on_cache_miss(self):
+        cache = LLMCache(self.path)
+        llm = _fake_chat_model(cache, "first", "second")
+        misses = []
+
+        async def on_miss():
+            misses.append(1)
+
+        async def invoke(prompt: str) -> str:
+            with on_cache_miss(on_miss):
+                return (await llm.ainvoke(prompt)).content
+
+        self.assertEqual(asyncio.run(invoke("hello")), "first")
+        self.assertEqual(asyncio.run(invoke("hello")), "first")
+        self.assertEqual(asyncio.run(invoke("bye")), "second")
+        self.assertEqual(len(misses), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
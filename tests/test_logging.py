@@ -0,0 +1,190 @@
+import asyncio
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from src.utils.logging import (
+    JSON_LOG_FILE,
+    LOG_FILE,
+    RUN_LOG_DIR_ENV,
+    configure_logging,
+    get_logger,
+    log_context,
+    run_log_dir,
+    set_log_context,
+    stop_logging,
+)
+
+
+def _worker_run_log_dir() -> str:
+    return str(run_log_dir())
+
+
+def _log_from_worker(message: str) -> None:
+    set_log_context(worker="child")
+    get_logger("tests.logging.worker").info(message)
+
+
+class TestLogging(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.log_dir = Path(self.tmp_dir.name)
+        self.stdout = io.StringIO()
+
+    def tearDown(self):
+        set_log_context(worker=None)
+        configure_logging()
+        self.tmp_dir.cleanup()
+
+    def _configure(self, json_lines: bool) -> None:
+        with mock.patch("sys.stdout", self.stdout):
+            configure_logging(json_lines=json_lines, log_dir=self.log_dir)
+
+    def _records(self) -> list:
+        stop_logging()
+        lines = (self.log_dir / JSON_LOG_FILE).read_text().splitlines()
+        return [json.loads(line) for line in lines]
+
+    def test_get_logger_does_not_duplicate_handlers(self):
+        self._configure(json_lines=False)
+        for _ in range(3):
+            logger = get_logger("tests.logging.duplicates")
+        self.assertEqual(len(logger.handlers), 1)
+
+        logger.info("only once")
+        stop_logging()
+        log_lines = (self.log_dir / LOG_FILE).read_text().splitlines()
+        self.assertEqual(sum("only once" in line for line in log_lines), 1)
+        self.assertEqual(self.stdout.getvalue().count("only once"), 1)
+
+    def test_text_lines_carry_the_context(self):
+        self._configure(json_lines=False)
+        logger = get_logger("tests.logging.text")
+        with log_context(config="tass2020", stage="normalize"):
+            logger.info("Cleaning dataset")
+        logger.info("Done")
+        stop_logging()
+
+        lines = (self.log_dir / LOG_FILE).read_text().splitlines()
+        self.assertTrue(
+            lines[0].endswith(
+                "- INFO - [config=tass2020 stage=normalize] Cleaning dataset"
+            )
+        )
+        self.assertTrue(lines[1].endswith("- INFO - Done"))
+
+    def test_json_lines(self):
+        self._configure(json_lines=True)
+        logger = get_logger("tests.logging.json")
+        with log_context(config="tass2020"):
+            with log_context(stage="model_card"):
+                logger.warning("Failed to retrieve %s", "a URL")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+
+        first, second = self._records()
+        self.assertEqual(first["level"], "WARNING")
+        self.assertEqual(first["logger"], "tests.logging.json")
+        self.assertEqual(first["config"], "tass2020")
+        self.assertEqual(first["stage"], "model_card")
+        self.assertEqual(first["message"], "Failed to retrieve a URL")
+        self.assertNotIn("config", second)
+        self.assertEqual(second["message"], "Failed")
+        self.assertIn("ValueError: boom", second["exception"])
+
+    def test_text_lines_keep_the_traceback(self):
+        self._configure(json_lines=False)
+        logger = get_logger("tests.logging.traceback")
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.exception("Failed")
+        stop_logging()
+
+        text = (self.log_dir / LOG_FILE).read_text()
+        self.assertIn("- ERROR - Failed\nTraceback", text)
+        self.assertIn("ValueError: boom", text)
+
+    def test_context_follows_asyncio_tasks(self):
+        self._configure(json_lines=True)
+        logger = get_logger("tests.logging.tasks")
+
+        async def extract(config: str) -> None:
+            with log_context(config=config):
+                await asyncio.sleep(0)
+                logger.info(config)
+
+        async def run() -> None:
+            await asyncio.gather(*(extract(f"config_{i}") for i in range(4)))
+
+        asyncio.run(run())
+        records = self._records()
+        self.assertEqual(len(records), 4)
+        for record in records:
+            self.assertEqual(record["config"], record["message"])
+
+    def test_records_are_written_in_order_by_one_thread(self):
+        self._configure(json_lines=True)
+        logger = get_logger("tests.logging.order")
+        for i in range(1_000):
+            logger.info(str(i))
+        records = self._records()
+        self.assertEqual(
+            [record["message"] for record in records],
+            [str(i) for i in range(1_000)],
+        )
+
+    def test_forked_workers_write_their_records(self):
+        self._configure(json_lines=True)
+        with log_context(stage="normalize"):
+            process = multiprocessing.get_context("fork").Process(
+                target=_log_from_worker, args=("from the worker",)
+            )
+            process.start()
+            process.join()
+        self.assertEqual(process.exitcode, 0)
+
+        (record,) = self._records()
+        self.assertEqual(record["message"], "from the worker")
+        self.assertEqual(record["stage"], "normalize")
+        self.assertEqual(record["worker"], "child")
+        self.assertNotEqual(record["process"], "MainProcess")
+
+    def test_spawned_workers_share_the_run_log_dir(self):
+        run_dir = str(self.log_dir / "run")
+        context = multiprocessing.get_context("spawn")
+        with mock.patch.dict(os.environ, {RUN_LOG_DIR_ENV: run_dir}):
+            self.assertEqual(str(run_log_dir()), run_dir)
+            with context.Pool(1) as pool:
+                self.assertEqual(pool.apply(_worker_run_log_dir), run_dir)
+
+    def test_logging_does_not_wait_for_the_writes(self):
+        class SlowStream(io.StringIO):
+            def write(self, text):
+                time.sleep(0.001)
+                return super().write(text)
+
+        self.stdout = SlowStream()
+        self._configure(json_lines=False)
+        logger = get_logger("tests.logging.overhead")
+        start = time.perf_counter()
+        for i in range(200):
+            logger.info(str(i))
+        elapsed = time.perf_counter() - start
+        stop_logging()
+
+        # 200 writes of 1ms each are left to the background thread
+        self.assertLess(elapsed, 0.1)
+        self.assertEqual(len(self.stdout.getvalue().splitlines()), 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,224 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from src.ds_preprocessing.cleaning_fn.plan_norm import plan_normalizer
+from src.ds_preprocessing.cleaning_fn.vaxxstance_2020 import clean_vaxxstance
+from src.ds_preprocessing.plan import compile_plan
+from src.models.config import Config
+from src.utils.dataset_normalizer import DatasetNormalizer
+from src.utils.filehandler import FileHandler
+
+
+def _write_split(root: Path, split: str) -> str:
+    split_dir = root / split
+    split_dir.mkdir()
+    for suffix, texts in [("es", ["hola", "vacunas: sí"]), ("eu", ["kaixo"])]:
+        pd.DataFrame(
+            {
+                "Text": texts,
+                "Label": [" FAVOR", "none"][: len(texts)],
+            }
+        ).to_csv(split_dir / f"{split}_{suffix}.csv", index=False)
+    return str(split_dir)
+
+
+def _write_grouped_split(root: Path, split: str) -> str:
+    # one file per column and language variation, joined by ID
+    split_dir = root / f"{split}_grouped"
+    split_dir.mkdir()
+    for suffix, ids, texts, labels in [
+        ("es", [1, 2], ["hola", "adiós"], ["none", " FAVOR"]),
+        ("eu", [1], ["kaixo"], ["against"]),
+    ]:
+        pd.DataFrame({"ID": ids, "Text": texts}).to_csv(
+            split_dir / f"text_{suffix}.csv", index=False
+        )
+        pd.DataFrame({"ID": ids[::-1], "Label": labels[::-1]}).to_csv(
+            split_dir / f"label_{suffix}.csv", index=False
+        )
+    return str(split_dir)
+
+
+def _configs(root: Path, plan: list) -> dict:
+    return Config(
+        **{
+            "task": {
+                "workshop": "iberlef",
+                "shared_task": "vaxxstance",
+                "year": 2021,
+                "task_type": "stance_detection",
+                "language": "basque",
+                "url": [],
+            },
+            "dataset": {
+                "train_files": _write_split(root, "train"),
+                "test_files": _write_split(root, "test"),
+                "hf_repo_id": "",
+                "hf_subset": "",
+            },
+            "normalizer": {
+                "normalizer_fn": "plan",
+                "language_var": True,
+                "input_cols": ["text"],
+                "output_col": "label",
+                "keep_columns": ["text", "label", "language"],
+                "plan": plan,
+            },
+            "mapping": {
+                "language_variation": {"es": "spanish", "eu": "basque"},
+                "label": {"none": "0", "favor": "1", "against": "2"},
+            },
+        }
+    ).model_dump()
+
+
+VAXXSTANCE_PLAN = [
+    {"op": "read"},
+    {"op": "tag_variant"},
+    {"op": "clean"},
+    {"op": "map"},
+    {"op": "filter"},
+]
+
+
+class TestPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_plan_matches_handwritten_normalizer(self):
+        configs = _configs(self.root, VAXXSTANCE_PLAN)
+        expected = clean_vaxxstance(configs)
+        result = plan_normalizer(configs)
+
+        self.assertEqual(len(result), len(expected))
+        for split in ("train", "test"):
+            self.assertEqual(
+                result[0][split].to_list(), expected[0][split].to_list()
+            )
+        self.assertEqual(result[0]["train"]["label"], ["1"])
+        self.assertEqual(result[0]["train"]["language"], ["basque"])
+
+    def test_arrow_dtype_backend(self):
+        configs = _configs(self.root, VAXXSTANCE_PLAN)
+        expected = plan_normalizer(configs)
+        configs["normalizer"]["dtype_backend"] = "pyarrow"
+
+        train = compile_plan(configs).split_plans["train"]
+        for _, df in train.read():
+            self.assertIsInstance(df["Text"].dtype, pd.ArrowDtype)
+        frame = train.run()
+        for column in frame.columns:
+            self.assertIsInstance(frame[column].dtype, pd.ArrowDtype)
+
+        for result in (plan_normalizer(configs), clean_vaxxstance(configs)):
+            for split in ("train", "test"):
+                self.assertEqual(
+                    result[0][split].to_list(), expected[0][split].to_list()
+                )
+
+    def test_numpy_nullable_dtype_backend(self):
+        configs = _configs(self.root, VAXXSTANCE_PLAN[:-1])
+        configs["normalizer"]["keep_columns"].append("language_variation")
+        expected = compile_plan(configs).split_plans["train"].run()
+        configs["normalizer"]["dtype_backend"] = "numpy_nullable"
+
+        frame = compile_plan(configs).split_plans["train"].run()
+        # nullable strings, missing values are pd.NA
+        for column in frame.columns:
+            self.assertEqual(frame[column].dtype, pd.StringDtype())
+        self.assertEqual(frame.to_dict(), expected.to_dict())
+
+    def test_language_variation_column_backend(self):
+        configs = _configs(self.root, VAXXSTANCE_PLAN)
+        configs["normalizer"]["dtype_backend"] = "pyarrow"
+        normalizer = DatasetNormalizer(configs)
+        train_files = configs["dataset"]["train_files"]
+        dfs = list(FileHandler(train_files).process_files().values())
+
+        for df in normalizer.add_language_variation_column(dfs, train_files):
+            self.assertIsInstance(
+                df["language_variation"].dtype, pd.ArrowDtype
+            )
+
+    def test_unknown_dtype_backend(self):
+        configs = _configs(self.root, VAXXSTANCE_PLAN)
+        configs["normalizer"]["dtype_backend"] = "polars"
+        with self.assertRaises(ValueError):
+            compile_plan(configs)
+
+    def test_split_by(self):
+        plan = VAXXSTANCE_PLAN[:-1] + [{"op": "split_by"}]
+        configs = _configs(self.root, plan)
+        result = compile_plan(configs).run()
+
+        # split by basque and spanish, without the unrequested column
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["train"]["text"], ["kaixo"])
+        self.assertEqual(result[1]["train"].num_rows, 2)
+        self.assertEqual(
+            result[0]["train"].column_names, ["text", "label", "language"]
+        )
+
+        configs["normalizer"]["keep_columns"].append("language_variation")
+        result = compile_plan(configs).run()
+        self.assertEqual(result[0]["train"]["language_variation"], ["basque"])
+        self.assertEqual(
+            result[1]["train"]["language_variation"], ["spanish", "spanish"]
+        )
+
+    def test_group_and_merge(self):
+        plan = [
+            {"op": "read"},
+            {"op": "group"},
+            {"op": "merge"},
+            {"op": "clean"},
+            {"op": "map"},
+            {"op": "filter"},
+            {"op": "split_by"},
+        ]
+        configs = _configs(self.root, plan)
+        for split in ("train", "test"):
+            configs["dataset"][f"{split}_files"] = _write_grouped_split(
+                self.root, split
+            )
+        configs["normalizer"]["keep_columns"].append("language_variation")
+        result = plan_normalizer(configs)
+
+        # the merge tags each group, so the filter keeps only basque
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0]["train"]["text"], ["kaixo"])
+        self.assertEqual(result[0]["train"]["label"], ["2"])
+        self.assertEqual(result[0]["test"]["language_variation"], ["basque"])
+
+        # without the filter, a dataset per language variation
+        configs["normalizer"]["plan"] = plan[:-2] + plan[-1:]
+        result = plan_normalizer(configs)
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[1]["train"]["text"], ["hola", "adiós"])
+        self.assertEqual(result[1]["train"]["label"], ["0", "1"])
+
+    def test_invalid_plans(self):
+        invalid_plans = [
+            [{"op": "clean"}],
+            [{"op": "read"}, {"op": "map"}, {"op": "clean"}],
+            [{"op": "read"}, {"op": "group"}],
+            [{"op": "read"}, {"op": "split_by"}, {"op": "clean"}],
+            # nothing adds the language variation the filter selects by
+            [{"op": "read"}, {"op": "clean"}, {"op": "filter"}],
+        ]
+        for plan in invalid_plans:
+            configs = _configs(Path(tempfile.mkdtemp(dir=self.root)), plan)
+            with self.assertRaises(ValueError):
+                compile_plan(configs)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+import random
+import re
+import sys
+import timeit
+import unittest
+
+import pandas as pd
+import pyarrow as pa
+
+from src.utils.preprocessing import (
+    WHITESPACE,
+    clean_text,
+    clean_text_batch,
+    clean_url_text,
+    clean_url_text_batch,
+)
+
+
+def reference_clean_text(text: str) -> str:
+    # the previous implementation, chaining replacements
+    text = text.replace("\n", " ")
+    text = text.replace("\r", " ")
+    text = text.replace("\t", " ")
+    text = text.replace(":", " ")
+    text = " ".join(text.split())
+    return text
+
+
+def reference_clean_url_text(text: str) -> str:
+    # the previous implementation, chaining replacements
+    text = text.replace("\n", " ").replace("\r", " ").replace("\t", " ")
+    text = text.replace("\xa0", " ").replace("​", " ")
+    text = " ".join(text.split())
+    text = re.sub(r"http[s]?://\S+", "", text)
+    text = text.replace(":", " ")
+    text = re.sub(r"&[a-z]+;", " ", text)
+    text = re.sub(r"[<>]", "", text)
+    return text
+
+
+# pieces of texts exercising every step of the cleaners and their order
+PIECES = list(WHITESPACE) + [
+    "​",
+    ":",
+    "&amp;",
+    "&",
+    ";",
+    "<",
+    ">",
+    "http://",
+    "https://",
+    "ht",
+    "x.org/",
+    "a",
+    "ñ",
+]
+
+
+def random_texts(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 12)))
+        for _ in range(n)
+    ]
+
+
+PAGE = (
+    "Tweets were collected: see https://example.org/data?id=1 &amp; the "
+    "<b>test</b> set.\n\n\tNext\xa0line​ here "
+) * 20_000
+SHORT_TEXTS = ["El corpus: 1.000 tuits\n"] * 50_000
+
+
+def _seconds(function, *args) -> float:
+    return min(timeit.repeat(lambda: function(*args), number=1, repeat=5))
+
+
+class TestCleaners(unittest.TestCase):
+    def test_whitespace_is_what_split_splits_on(self):
+        self.assertEqual(
+            WHITESPACE,
+            "".join(
+                char
+                for char in map(chr, range(sys.maxunicode + 1))
+                if char.isspace()
+            ),
+        )
+
+    def test_identical_output(self):
+        for text in random_texts(20_000) + [PAGE]:
+            self.assertEqual(clean_text(text), reference_clean_text(text))
+            self.assertEqual(
+                clean_url_text(text), reference_clean_url_text(text)
+            )
+
+    def test_arrow_batch(self):
+        texts = random_texts(5_000, seed=1)
+        array = pa.array(texts + [None])
+        self.assertEqual(
+            clean_text_batch(array).to_pylist(),
+            [reference_clean_text(text) for text in texts] + [None],
+        )
+        self.assertEqual(
+            clean_url_text_batch(pa.chunked_array([array])).to_pylist(),
+            [reference_clean_url_text(text) for text in texts] + [None],
+        )
+
+    def test_pandas_batch(self):
+        texts = random_texts(1_000, seed=2)
+        for dtype in (object, "str", pd.ArrowDtype(pa.string())):
+            with self.subTest(dtype=str(dtype)):
+                series = pd.Series(
+                    texts + [None], index=range(10, 1011), name="text"
+                ).astype(dtype)
+                cleaned = clean_url_text_batch(series)
+                self.assertEqual(cleaned.name, "text")
+                self.assertTrue(cleaned.index.equals(series.index))
+                self.assertTrue(pd.isna(cleaned.iloc[-1]))
+                self.assertEqual(
+                    list(cleaned.iloc[:-1]),
+                    [reference_clean_url_text(text) for text in texts],
+                )
+        self.assertEqual(clean_text_batch(["a :b", None]), ["a b", None])
+
+
+class TestCleanersBenchmark(unittest.TestCase):
+    """
+    Micro-benchmarks of the cleaners against the previous implementations.
+    Bounds are loose, to stay stable on shared machines.
+    """
+
+    def test_page(self):
+        for clean, reference in (
+            (clean_text, reference_clean_text),
+            (clean_url_text, reference_clean_url_text),
+        ):
+            with self.subTest(clean.__name__):
+                self.assertLess(
+                    _seconds(clean, PAGE), 1.2 * _seconds(reference, PAGE)
+                )
+
+    def test_short_texts(self):
+        def clean_all(clean):
+            return [clean(text) for text in SHORT_TEXTS]
+
+        self.assertLess(
+            _seconds(clean_all, clean_url_text),
+            _seconds(clean_all, reference_clean_url_text) / 2,
+        )
+
+    def test_arrow_batch(self):
+        # Arrow columns are cleaned without materializing Python strings,
+        # on par with cleaning them one by one
+        array = pa.array(SHORT_TEXTS)
+        for batch, clean in (
+            (clean_text_batch, clean_text),
+            (clean_url_text_batch, clean_url_text),
+        ):
+            with self.subTest(batch.__name__):
+                self.assertLess(
+                    _seconds(batch, array),
+                    1.5
+                    * _seconds(
+                        lambda: pa.array(
+                            [clean(text) for text in array.to_pylist()]
+                        )
+                    ),
+                )
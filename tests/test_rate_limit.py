@@ -0,0 +1,107 @@
+import asyncio
+import random
+import unittest
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.models.model_card_config import DatasetCard
+from src.utils.model_card_utils import (
+    extract_chunks,
+    merge_extractions,
+    process_chunk,
+)
+from src.utils.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fake_llm():
+    """LLM stand-in answering, after a random delay, the fields of a chunk."""
+
+    def response(prompt) -> AIMessage:
+        text = prompt.to_string().split("TEXT:")[-1].strip()
+        field, value = text.split("=")
+        return AIMessage(
+            content="",
+            tool_calls=[
+                {"name": "DatasetCard", "args": {field: value}, "id": text}
+            ],
+        )
+
+    async def aresponse(prompt) -> AIMessage:
+        await asyncio.sleep(random.uniform(0, 0.01))
+        return response(prompt)
+
+    return RunnableLambda(response, afunc=aresponse)
+
+
+class TestTokenBucket(unittest.TestCase):
+
+    def test_wait_time(self):
+        clock = FakeClock()
+        bucket = TokenBucket(60, capacity=2, clock=clock)
+
+        self.assertEqual(bucket.wait_time(2), 0)
+        bucket.consume(2)
+        self.assertEqual(bucket.wait_time(1), 1)
+        clock.now = 0.5
+        self.assertEqual(bucket.wait_time(1), 0.5)
+        clock.now = 10
+        # refilled up to the capacity
+        self.assertEqual(bucket.wait_time(2), 0)
+        self.assertEqual(bucket.tokens, 2)
+        # amounts over the capacity wait for a full bucket
+        self.assertEqual(bucket.wait_time(5), 0)
+
+    def test_rate_limiter_waits(self):
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=600)
+
+        async def acquire_all():
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            await asyncio.gather(limiter.acquire(600), limiter.acquire(5))
+            return loop.time() - start
+
+        # 600 tokens of burst, then 5 more at 10 tokens per second
+        self.assertGreater(asyncio.run(acquire_all()), 0.45)
+
+
+class TestConcurrentExtraction(unittest.TestCase):
+
+    def test_merge_matches_sequential_processing(self):
+        chunks = [
+            "license=[More Information Needed]",
+            "license=MIT",
+            "creators=Alice",
+            "license=Apache 2.0",
+            "creators=Bob",
+        ]
+        fields = ["license", "creators"]
+        llm = _fake_llm()
+
+        sequential = DatasetCard()
+        for chunk in chunks:
+            process_chunk(chunk, llm, sequential, fields)
+
+        for _ in range(3):
+            extractions = asyncio.run(
+                extract_chunks(chunks, llm, RateLimiter(), max_concurrency=4)
+            )
+            concurrent = DatasetCard()
+            self.assertEqual(
+                merge_extractions(concurrent, extractions, fields), 2
+            )
+            self.assertEqual(concurrent, sequential)
+            self.assertEqual(concurrent.license, "MIT")
+            self.assertEqual(concurrent.creators, "Alice")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+
+from src.models.model_card_config import FIELD_GROUPS, DatasetCard
+from src.utils.model_card_utils import (
+    extract_fields_by_group,
+    missing_fields,
+    pack_passages,
+)
+from src.utils.rate_limit import RateLimiter
+from src.utils.retrieval import BM25, tokenize
+from tests.test_card_extraction import ALL_FIELDS, FakeLLM
+
+FILLER = [
+    f"Section {i}. We report the results of the baseline systems on the "
+    "task, comparing several pretrained models and their variants."
+    for i in range(40)
+]
+LICENSE = (
+    "The corpus is released under a Creative Commons CC BY-SA 4.0 license."
+)
+CITATION = "To cite this work use the BibTeX @inproceedings{iberlef2023}."
+
+
+class TestRetrieval(unittest.TestCase):
+    def test_tokenize(self):
+        self.assertEqual(
+            tokenize("Licencia CC-BY, año 2023."),
+            ["licencia", "cc", "by", "año", "2023"],
+        )
+
+    def test_ranks_relevant_passages_first(self):
+        passages = FILLER[:20] + [LICENSE] + FILLER[20:] + [CITATION]
+        index = BM25(passages)
+        self.assertEqual(index.top_k("license creative commons", 1), [20])
+        self.assertEqual(index.top_k("bibtex cite", 1), [len(passages) - 1])
+        self.assertEqual(len(index.top_k("license", 5)), 5)
+
+    def test_pack_passages_in_document_order(self):
+        passages = ["a b c", "d e f", "g h i"]
+        self.assertEqual(
+            pack_passages(passages, [2, 0], chunk_tokens=100),
+            ["a b c\n\ng h i"],
+        )
+        self.assertEqual(
+            pack_passages(passages, [2, 0], chunk_tokens=1),
+            ["a b c", "g h i"],
+        )
+
+    def test_one_request_per_field_group(self):
+        # each field is stated in one passage among many irrelevant ones
+        passages = FILLER + [
+            f"{field} {DatasetCard.model_fields[field].description}"
+            for field in ALL_FIELDS
+        ]
+        llm = FakeLLM()
+        dataset_card = DatasetCard()
+
+        updates = asyncio.run(
+            extract_fields_by_group(
+                dataset_card, passages, llm, RateLimiter(), top_k=8
+            )
+        )
+
+        self.assertEqual(updates, len(ALL_FIELDS))
+        self.assertEqual(missing_fields(dataset_card, ALL_FIELDS), [])
+        self.assertEqual(
+            sorted(map(tuple, llm.requests)),
+            sorted(FIELD_GROUPS.values()),
+        )
@@ -0,0 +1,95 @@
+import unittest
+
+from datasets import Dataset, DatasetDict
+from src.models.config import Config
+from src.utils.io import create_dataset_metadata, get_language_variety
+from src.utils.stats import dataset_statistics
+
+
+def _dataset() -> DatasetDict:
+    return DatasetDict(
+        {
+            "train": Dataset.from_dict(
+                {
+                    "text": ["hola", "adios amigo", None, "buenas"],
+                    "label": ["1", "0", "1", "1"],
+                    "language_variation": ["spanish"] * 4,
+                }
+            ),
+            "test": Dataset.from_dict(
+                {
+                    "text": ["que tal"],
+                    "label": ["0"],
+                    "language_variation": ["spanish"],
+                }
+            ),
+        }
+    )
+
+
+class TestStats(unittest.TestCase):
+
+    def test_split_statistics(self):
+        statistics = dataset_statistics(_dataset())
+
+        train = statistics["train"]
+        self.assertEqual(train["num_rows"], 4)
+        self.assertEqual(
+            train["null_counts"],
+            {"text": 1, "label": 0, "language_variation": 0},
+        )
+        self.assertEqual(train["label_distribution"], {"0": 1, "1": 3})
+        self.assertEqual(list(train["text_lengths"]), ["text"])
+        lengths = train["text_lengths"]["text"]
+        self.assertEqual((lengths["min"], lengths["max"]), (4, 11))
+        self.assertEqual(lengths["mean"], 7)
+        self.assertEqual(lengths["p50"], 6)
+        self.assertEqual(statistics["test"]["label_distribution"], {"0": 1})
+
+    def test_statistics_of_a_filtered_split(self):
+        dataset = _dataset()
+        dataset["train"] = dataset["train"].select([0, 1])
+        statistics = dataset_statistics(dataset, splits=["train"])
+        self.assertEqual(
+            statistics["train"]["label_distribution"], {"0": 1, "1": 1}
+        )
+
+    def test_dataset_metadata(self):
+        config = Config(
+            **{
+                "task": {
+                    "workshop": "iberlef",
+                    "shared_task": "task",
+                    "year": 2024,
+                    "task_type": "sentiment_analysis",
+                    "language": "spanish",
+                    "url": [],
+                },
+                "dataset": {
+                    "train_files": "",
+                    "test_files": "",
+                    "hf_repo_id": "",
+                    "hf_subset": "",
+                },
+                "normalizer": {
+                    "normalizer_fn": "classification",
+                    "language_var": False,
+                    "input_cols": ["text"],
+                    "output_col": "label",
+                    "keep_columns": ["text", "label"],
+                },
+                "mapping": {"label": {"neg": "0", "pos": "1"}},
+            }
+        )
+        dataset = _dataset()
+        metadata = create_dataset_metadata(config, dataset)
+
+        self.assertEqual(get_language_variety(dataset), "spanish")
+        self.assertEqual(metadata["language_variety"], "spanish")
+        self.assertEqual(metadata["labels"], ["neg"])
+        self.assertEqual(metadata["num_labels"], 1)
+        self.assertEqual(metadata["statistics"]["train"]["num_rows"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+
+from langchain_core.messages import AIMessage
+
+from src.utils.gpt_generate import GPTClient
+from src.utils.llm_cache import LLMCache, langchain_cache
+from src.utils.telemetry import LLMCall, Telemetry, set_telemetry
+
+
+class _ChatHandler(BaseHTTPRequestHandler):
+    """Chat completions endpoint failing the first attempt of each prompt."""
+
+    attempts = 0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).attempts += 1
+        if type(self).attempts % 2:
+            self.send_response(503)
+            self.send_header("retry-after-ms", "10")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps(
+            {
+                "id": "chatcmpl-0",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "hola"},
+                    }
+                ],
+                "usage": {
+                    "prompt_tokens": 1000,
+                    "completion_tokens": 100,
+                    "total_tokens": 1100,
+                },
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.telemetry = Telemetry()
+        set_telemetry(self.telemetry)
+        self.addCleanup(set_telemetry, None)
+
+    def test_report_per_scope(self):
+        with self.telemetry.scope("tass_2020"):
+            with self.telemetry.track("gpt-4o") as call:
+                call.record_usage(1_000_000, 0, cached=False)
+            with self.telemetry.track("gpt-4o") as call:
+                call.record_usage(10, 10, cached=True)
+        with self.assertRaises(ValueError):
+            with self.telemetry.track("gpt-4o-mini"):
+                raise ValueError()
+
+        report = self.telemetry.report()
+        self.assertEqual(set(report["scopes"]), {"tass_2020", "run"})
+        scope = report["scopes"]["tass_2020"]
+        self.assertEqual(scope["calls"], 2)
+        self.assertEqual(scope["cache_hits"], 1)
+        # cache hits are neither billed nor part of the latencies
+        self.assertEqual(scope["prompt_tokens"], 1_000_000)
+        self.assertEqual(scope["cost_usd"], 2.5)
+        self.assertEqual(sum(scope["latency_histogram"].values()), 1)
+        self.assertEqual(report["run"]["calls"], 3)
+        self.assertEqual(report["run"]["errors"], 1)
+
+        path = self.telemetry.write_report(Path(self.tmp_dir.name, "r.json"))
+        with open(path) as f:
+            self.assertEqual(json.load(f), json.loads(json.dumps(report)))
+
+    def test_cost_by_longest_model_prefix(self):
+        call = LLMCall("gpt-4o-mini-2024-07-18", "run", 1_000_000, 1_000_000)
+        self.assertAlmostEqual(call.cost, 0.75)
+        self.assertIsNone(LLMCall("unknown", "run", 1, 1).cost)
+
+    def test_langchain_cache_hits_are_flagged(self):
+        cache = langchain_cache(LLMCache(self.tmp_dir.name))
+        message = AIMessage(
+            content="",
+            usage_metadata={
+                "input_tokens": 5,
+                "output_tokens": 5,
+                "total_tokens": 10,
+            },
+        )
+        generation = mock.Mock(message=message)
+        cache.update("prompt", "llm", [generation])
+        (cached,) = cache.lookup("prompt", "llm")
+
+        with self.telemetry.track("gpt-4o") as call:
+            call.record_message(cached.message)
+        self.assertTrue(call.cached)
+        self.assertEqual(call.prompt_tokens, 0)
+
+    def test_gpt_client_records_usage_retries_and_hits(self):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _ChatHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.shutdown)
+        base_url = f"http://127.0.0.1:{server.server_port}/v1"
+
+        with mock.patch.dict(os.environ, {"OPENAI_BASE_URL": base_url}):
+            client = GPTClient(
+                "key",
+                model="gpt-4o-mini",
+                cache=LLMCache(self.tmp_dir.name),
+            )
+        with self.telemetry.scope("config"):
+            for _ in range(2):
+                self.assertEqual(
+                    client.complete("hi", model="gpt-4o-mini"), "hola"
+                )
+
+        sent, hit = self.telemetry.calls
+        self.assertEqual(
+            (sent.prompt_tokens, sent.completion_tokens, sent.retries),
+            (1000, 100, 1),
+        )
+        self.assertFalse(sent.cached)
+        self.assertTrue(hit.cached)
+        self.assertEqual(hit.scope, "config")
+
+    def test_failed_gpt_client_calls_are_not_hits(self):
+        client = GPTClient("key", cache=LLMCache(self.tmp_dir.name))
+        client.client = mock.Mock()
+        client.client.chat.completions.create.side_effect = RuntimeError
+        with self.assertRaises(RuntimeError):
+            client.complete("hi", model="gpt-4o-mini")
+
+        (call,) = self.telemetry.calls
+        self.assertFalse(call.cached)
+        self.assertEqual(call.error, "RuntimeError")
@@ -0,0 +1,32 @@
+import unittest
+
+from src.utils.model_card_utils import split_content_into_chunks
+from src.utils.tokens import count_tokens, truncate_to_tokens
+
+TEXT = "\n\n".join(
+    f"Paragraph {i}: the corpus is annotated by native speakers of Galician."
+    for i in range(200)
+)
+
+
+class TestTokens(unittest.TestCase):
+    def test_short_texts_are_not_truncated(self):
+        self.assertEqual(truncate_to_tokens("hola mundo", 100), "hola mundo")
+
+    def test_truncation_fits_the_budget(self):
+        truncated = truncate_to_tokens(TEXT, 50)
+        self.assertTrue(TEXT.startswith(truncated))
+        self.assertLessEqual(count_tokens(truncated), 50)
+        self.assertEqual(truncate_to_tokens(TEXT, 0), "")
+
+    def test_chunks_are_packed_up_to_the_budget(self):
+        chunks = split_content_into_chunks(
+            TEXT, chunk_size=300, chunk_overlap=0
+        )
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(count_tokens(chunk), 300)
+        # full chunks: adding the next paragraph would go over the budget
+        paragraph_tokens = count_tokens(TEXT.split("\n\n")[0])
+        self.assertGreater(count_tokens(chunks[0]), 300 - 2 * paragraph_tokens)
+        self.assertEqual("\n\n".join(chunks).split("\n\n"), TEXT.split("\n\n"))
@@ -0,0 +1,98 @@
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from src.utils.url_cache import URLCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    body = b"<html><body>first version</body></html>"
+    requests = []
+
+    def do_GET(self):
+        etag = f'"{hash(self.body)}"'
+        if_none_match = self.headers.get("If-None-Match")
+        type(self).requests.append((self.path, if_none_match))
+        if self.path == "/missing":
+            self.send_response(404)
+            self.end_headers()
+            return
+        if if_none_match == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestURLCache(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.url = f"http://127.0.0.1:{cls.server.server_port}/page"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        _Handler.requests = []
+        _Handler.body = b"<html><body>first version</body></html>"
+        self.extractions = []
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _extract(self, content: bytes, content_type: str) -> str:
+        self.extractions.append(content_type)
+        return content.decode().upper()
+
+    def test_fetched_and_extracted_once_per_run(self):
+        cache = URLCache(self.tmp_dir.name)
+        for _ in range(3):
+            text = cache.text(self.url, "upper", self._extract)
+
+        self.assertIn("FIRST VERSION", text)
+        self.assertEqual(len(_Handler.requests), 1)
+        self.assertEqual(self.extractions, ["text/html; charset=utf-8"])
+
+    def test_revalidated_across_runs(self):
+        URLCache(self.tmp_dir.name).text(self.url, "upper", self._extract)
+
+        # unchanged: a conditional request, and the cached text
+        text = URLCache(self.tmp_dir.name).text(
+            self.url, "upper", self._extract
+        )
+        self.assertIn("FIRST VERSION", text)
+        self.assertIsNotNone(_Handler.requests[-1][1])
+        self.assertEqual(len(self.extractions), 1)
+
+        # changed: fetched and extracted again
+        _Handler.body = b"<html><body>second version</body></html>"
+        text = URLCache(self.tmp_dir.name).text(
+            self.url, "upper", self._extract
+        )
+        self.assertIn("SECOND VERSION", text)
+        self.assertEqual(len(self.extractions), 2)
+
+    def test_errors(self):
+        cache = URLCache(self.tmp_dir.name)
+        with self.assertRaises(requests.HTTPError):
+            cache.fetch(self.url.replace("/page", "/missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()